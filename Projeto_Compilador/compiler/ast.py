@@ -2,21 +2,46 @@ from __future__ import annotations
 from functools import reduce
 from enum import Enum, auto
 from typing import Union
+import re
 import json
 from .lexer import TokenPos
 
 class NodePos:
     """
     Represents the location of this node on the source text.
+
+    Positions taken from tokens (see NodePos#setTokenPos) keep a reference to the originating TokenPos, so that rows and
+    columns are only resolved when first read. Positions are always copied by value, never by reference to another 
+    NodePos, so later changes to the node a position was taken from do not propagate.
     """
+    __slots__ = ("_startPos", "_startRef", "_startRow", "_startCol", "_endPos", "_endRef", "_endRow", "_endCol")
+
     def __init__(self, startPos, endPos, _rawStartPos = 0, _rawEndPos = 0):
         self._startPos = _rawStartPos
-        self.startRow = startPos[0]
-        self.startCol = startPos[1]
+        self._startRef = None
+        self._startRow = startPos[0]
+        self._startCol = startPos[1]
 
         self._endPos = _rawEndPos
-        self.endRow = endPos[0]
-        self.endCol = endPos[1]
+        self._endRef = None
+        self._endRow = endPos[0]
+        self._endCol = endPos[1]
+
+    def _getStartRow(self):
+        return self._startRow if self._startRef == None else self._startRef.startRow
+    startRow = property(_getStartRow)
+
+    def _getStartCol(self):
+        return self._startCol if self._startRef == None else self._startRef.startCol
+    startCol = property(_getStartCol)
+
+    def _getEndRow(self):
+        return self._endRow if self._endRef == None else self._endRef.endRow
+    endRow = property(_getEndRow)
+
+    def _getEndCol(self):
+        return self._endCol if self._endRef == None else self._endRef.endCol
+    endCol = property(_getEndCol)
 
     def getStart(self):
         return (self._startPos, self.startRow, self.startCol)
@@ -32,40 +57,46 @@ class NodePos:
 
     def setMonoPos(self, pos: (int, int, int)):
         self._startPos = pos[0]
-        self.startRow = pos[1]
-        self.startCol = pos[2]
+        self._startRef = None
+        self._startRow = pos[1]
+        self._startCol = pos[2]
 
         return self
 
     def setFullPos(self, start: (int, int, int), end: (int, int, int)):
         self._startPos = start[0]
-        self.startRow = start[1]
-        self.startCol = start[2]
+        self._startRef = None
+        self._startRow = start[1]
+        self._startCol = start[2]
 
         self._endPos = end[0]
-        self.endRow = end[1]
-        self.endCol = end[2]
+        self._endRef = None
+        self._endRow = end[1]
+        self._endCol = end[2]
 
         return self
     
-    def setTokenPos(self, pos: TokenPos):
-        self._startPos = pos._startPos
-        self.startRow = pos.startRow
-        self.startCol = pos.startCol
-
-        self._endPos = pos._endPos
-        self.endRow = pos.endRow
-        self.endCol = pos.endCol
+    def setTokenPos(self, pos: TokenPos | NodePos):
+        self.setStartTokenPos(pos)
+        self.setEndTokenPos(pos)
     
-    def setStartTokenPos(self, pos: TokenPos):
+    def setStartTokenPos(self, pos: TokenPos | NodePos):
         self._startPos = pos._startPos
-        self.startRow = pos.startRow
-        self.startCol = pos.startCol
+        if (isinstance(pos, NodePos)):
+            self._startRef = pos._startRef
+            self._startRow = pos._startRow
+            self._startCol = pos._startCol
+        else:
+            self._startRef = pos
     
-    def setEndTokenPos(self, pos: TokenPos):
+    def setEndTokenPos(self, pos: TokenPos | NodePos):
         self._endPos = pos._endPos
-        self.endRow = pos.endRow
-        self.endCol = pos.endCol
+        if (isinstance(pos, NodePos)):
+            self._endRef = pos._endRef
+            self._endRow = pos._endRow
+            self._endCol = pos._endCol
+        else:
+            self._endRef = pos
 
         return self
     
@@ -81,6 +112,70 @@ class NodePos:
         return f"{self.startRow}:{self.startCol} - {self.endRow}:{self.endCol}"
     fullString = property(_fullString)
 
+#region ============== JSON Streaming =============
+# While the JSON form of an AST is being written (see Node#writeJSON), each node is turned into JSON on it's own: it's 
+#   toJSON is called on a shallow copy of it, whose children are replaced by holes (see _JSONHole) that turn into 
+#   numbered placeholders. The JSON form of each child is then written in place of it's placeholder. A lone surrogate 
+#   can't be decoded from a source text, so no string on an AST holds one.
+JSON_WRITE_CHUNK = 1 << 16
+"""How many characters the JSON writer gathers before writing them. See Node#writeJSON."""
+
+_JSON_HOLE_MARK = "\ud800"
+_jsonHolePattern = re.compile('"' + _JSON_HOLE_MARK + '([0-9]+)"')
+
+class _JSONHole:
+    """
+    Stands in for a child node on the shallow copy of a node being written as JSON: it's JSON form is a placeholder, and
+    everything else (attributes, truthiness, comparisons) is forwarded to the child.
+    """
+    __slots__ = ("node", "index")
+
+    def __init__(self, node, index: int):
+        self.node = node
+        self.index = index
+
+    def toJSON(self):
+        return f"{_JSON_HOLE_MARK}{self.index}"
+
+    def __getattr__(self, name):
+        return getattr(self.node, name)
+
+    def __bool__(self):
+        return bool(self.node)
+
+    def __eq__(self, other):
+        return self.node == other
+
+    def __hash__(self):
+        return hash(self.node)
+
+def _hollow(v, holes: list):
+    if (isinstance(v, Node)):
+        holes.append(v)
+        return _JSONHole(v, len(holes) - 1)
+    elif (isinstance(v, list)): return [_hollow(e, holes) for e in v]
+    elif (isinstance(v, tuple)): return tuple(_hollow(e, holes) for e in v)
+    else: return v
+
+def _writeNodeJSON(node, write):
+    holes = []
+    shallow = type(node).__new__(type(node))
+    for attr in nodeAttributes(node): setattr(shallow, attr, _hollow(getattr(node, attr), holes))
+
+    # The pieces alternate between the JSON text and the index of the hole in between.
+    pieces = _jsonHolePattern.split(json.dumps(shallow.toJSON(), ensure_ascii=False))
+    indices = [int(i) for i in pieces[1::2]]
+    if (len(set(indices)) != len(indices) or any(i >= len(holes) for i in indices)):
+        # Should a string hold a placeholder after all, the node is written whole.
+        write(node.toJSONString())
+        return
+
+    write(pieces[0])
+    for i in range(1, len(pieces), 2):
+        _writeNodeJSON(holes[int(pieces[i])], write)
+        write(pieces[i + 1])
+#endregion ============== JSON Streaming =============
+
 class Node:
     """
     Represents an abstract Node in an Abstract Syntax Tree. All nodes must derive from this base class.
@@ -88,7 +183,15 @@ class Node:
 
     By default, printing the value of a node will not reveal it's position nor the names of the parameters. 
     To show those properties, set the static attribute Node.verbose to True.
+
+    The JSON form of a node is built by toJSON, which node classes override, and can either be built whole (see 
+    toJSONString) or written as it is built (see writeJSON).
+
+    Nodes are the bulk of the objects alive while compiling, so they hold no __dict__: each node class declares the 
+    attributes it adds to it's base class on __slots__ (an empty tuple if none). A node class that doesn't declare 
+    __slots__ gets a __dict__ back, as the built-in nodes do (see compiler.runtime.builtin).
     """
+    __slots__ = ("value", "pos")
     verbose = True
 
     def __init__(self, value = None, pos = ((0, 0), (0, 0))):
@@ -115,6 +218,26 @@ class Node:
     
     def toJSONString(self):
         return json.dumps(self.toJSON(), ensure_ascii=False)
+
+    def writeJSON(self, f):
+        """
+        Writes the JSON form of this node to a text file, exactly as toJSONString would return it, without ever holding
+        the JSON form of the whole AST: each node is only turned into JSON once it is reached, and the output is 
+        written in chunks (see JSON_WRITE_CHUNK).
+        """
+        chunks = []
+        size = 0
+        def write(chunk):
+            nonlocal chunks, size
+            chunks.append(chunk)
+            size += len(chunk)
+            if (size >= JSON_WRITE_CHUNK):
+                f.write("".join(chunks))
+                chunks = []
+                size = 0
+
+        _writeNodeJSON(self, write)
+        f.write("".join(chunks))
     
     def ist(self, kind: "Node") -> bool:
         """
@@ -142,11 +265,35 @@ class Node:
         self.pos.setEndTokenPos(tokenPos)
         return self
 
+_classAttributes = {}
+
+def nodeAttributes(node: Node) -> tuple:
+    """
+        Gets the names of the attributes of a node, in a stable order: the __slots__ of it's class and of it's base 
+        classes, from the base class down, leaving out those never set, and then the attributes on it's __dict__, if it
+        has one. Used to walk ASTs generically (see Node#writeJSON and compiler.astbin).
+    """
+    cls = type(node)
+    entry = _classAttributes.get(cls)
+    if (entry == None):
+        slots = []
+        for base in reversed(cls.__mro__):
+            for attr in base.__dict__.get("__slots__", ()):
+                if (attr not in ("__dict__", "__weakref__") and attr not in slots): slots.append(attr)
+        entry = (tuple(slots), cls.__dictoffset__ != 0)
+        _classAttributes[cls] = entry
+
+    (slots, hasDict) = entry
+    attrs = tuple(attr for attr in slots if hasattr(node, attr))
+    return attrs + tuple(vars(node)) if hasDict else attrs
+
 #region ============== Compound Primitives =============
 class SpecialSymbolKind(Enum):
     SS_NIL = auto()
 
 class SpecialSymbolNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: SpecialSymbolKind):
         super().__init__(value)
 
@@ -181,6 +328,8 @@ class SpecialSymbolNode(Node):
         }
 
 class StringNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__(None)
         self.value = value
@@ -192,6 +341,8 @@ class StringNode(Node):
         return hash(self.value)
 
 class IdentifierNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__(None)
         self.value = value
@@ -209,6 +360,8 @@ class NumberKind(Enum):
     SIGNED_INTEGER = auto()
 
 class NumberNode(Node):
+    __slots__ = ("kind",)
+
     def __init__(self, value: str, kind: NumberKind):
         super().__init__(None)
         self.kind = kind
@@ -256,6 +409,8 @@ class NumberNode(Node):
         else: return -1
 
 class UnsignedConstantNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: NumberNode | StringNode | IdentifierNode | SpecialSymbolNode):
         super().__init__(value)
         self.setTokenPos(value.pos)
@@ -303,6 +458,8 @@ class UnsignedConstantNode(Node):
         else: return -1
 
 class DirectiveNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__(None)
         self.value = value
@@ -312,6 +469,8 @@ ConstantNode = NumberNode | IdentifierNode | StringNode
 
 # Section 3.A
 class ProgramHeadingNode(Node):
+    __slots__ = ("name", "externals")
+
     def __init__(self, name, externals):
         super().__init__(None)
         self.name = name
@@ -342,6 +501,8 @@ class ProgramHeadingNode(Node):
 
 # Section 3.B
 class LabelDeclarationNode(Node):
+    __slots__ = ()
+
     def __init__(self, labels):
         super().__init__(None)
         self.value = labels
@@ -355,6 +516,8 @@ class LabelDeclarationNode(Node):
 
 #region ============== Section 3.C ==============
 class ConstantDefinitionNode(Node):
+    __slots__ = ("key",)
+
     def __init__(self, key, value):
         super().__init__(None)
         self.key = key
@@ -384,6 +547,8 @@ class ConstantDefinitionNode(Node):
         }
 
 class ConstantDefinitionPartNode(Node):
+    __slots__ = ()
+
     def __init__(self, constants: list[ConstantDefinitionNode]):
         super().__init__(None)
         self.value = constants
@@ -428,6 +593,8 @@ class TypeKind(Enum):
     TYPE_IDENTIFIER = auto()
 
 class TypeNode(Node):
+    __slots__ = ("kind",)
+
     def __init__(self):
         super().__init__()
         self.kind = TypeKind.TYPE_UNKNOWN
@@ -440,6 +607,8 @@ class TypeNode(Node):
         }
 
 class TypeIdentifierNode(TypeNode):
+    __slots__ = ()
+
     def __init__(self, value: IdentifierNode):
         super().__init__()
         self.kind = TypeKind.TYPE_IDENTIFIER
@@ -456,6 +625,8 @@ class TypeIdentifierNode(TypeNode):
 
 #region -------------- Simple Types --------------
 class SimpleTypeNode(TypeNode):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.kind = TypeKind.TYPE_SIMPLE
@@ -465,10 +636,14 @@ class OrdinalTypeNode(SimpleTypeNode):
     Used exclusively for categorization purposes. Doesn't do jack shit on it's own and doesn't even have concrete
     representation on the AST.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
 class EnumeratedTypeNode(OrdinalTypeNode):
+    __slots__ = ()
+
     def __init__(self, types: list[IdentifierNode]):
         super().__init__()
         self.value = types
@@ -505,6 +680,8 @@ class EnumeratedTypeNode(OrdinalTypeNode):
         # return base
 
 class SubrangeTypeNode(OrdinalTypeNode):
+    __slots__ = ("start", "end")
+
     def __init__(self, start: Node, end: Node):
         super().__init__()
         self.start = start
@@ -539,6 +716,8 @@ class SubrangeTypeNode(OrdinalTypeNode):
 
 #region -------------- Structured Types --------------
 class StructuredTypeNode(TypeNode):
+    __slots__ = ("packed",)
+
     def __init__(self, packed: bool = False):
         super().__init__()
         self.kind = TypeKind.TYPE_STRUCTURED
@@ -552,6 +731,8 @@ class StructuredTypeNode(TypeNode):
         }
 
 class ArrayTypeNode(StructuredTypeNode):
+    __slots__ = ("basetype",)
+
     def __init__(self, values: list[SimpleTypeNode], basetype: SimpleTypeNode):
         super().__init__()
         self.value = values
@@ -590,6 +771,8 @@ class ArrayTypeNode(StructuredTypeNode):
         }
 
 class RecordSectionNode(Node):
+    __slots__ = ("identifiers", "basetype")
+
     def __init__(self, identifiers: list[IdentifierNode], basetype: TypeNode):
         super().__init__()
         self.identifiers = identifiers
@@ -628,6 +811,8 @@ class RecordSectionNode(Node):
         }
 
 class RecordVariantCaseNode(Node):
+    __slots__ = ("consts", "fixedPart", "variantPart")
+
     def __init__(self, consts: list[Node], fixedPart: list[RecordSectionNode] = None, variantPart = None):
         super().__init__()
         self.consts = consts
@@ -686,6 +871,8 @@ class RecordVariantCaseNode(Node):
         }
 
 class RecordVariantNode(Node):
+    __slots__ = ("identifier", "basetype", "cases")
+
     def __init__(self, identifier: str | None, basetype: TypeNode, cases: list[RecordVariantCaseNode]):
         super().__init__()
         self.identifier = identifier
@@ -733,6 +920,8 @@ class RecordVariantNode(Node):
         }
 
 class RecordTypeNode(StructuredTypeNode):
+    __slots__ = ("fixedPart", "variantPart")
+
     def __init__(self, fixedPart: list[RecordSectionNode] = None, variantPart = None):
         super().__init__()
         self.fixedPart = fixedPart
@@ -782,6 +971,8 @@ class RecordTypeNode(StructuredTypeNode):
         }
 
 class SetTypeNode(StructuredTypeNode):
+    __slots__ = ("basetype",)
+
     def __init__(self, basetype: OrdinalTypeNode):
         super().__init__()
         self.basetype = basetype
@@ -811,6 +1002,8 @@ class SetTypeNode(StructuredTypeNode):
         }
 
 class FileTypeNode(StructuredTypeNode):
+    __slots__ = ("basetype",)
+
     def __init__(self, basetype: TypeNode):
         super().__init__()
         self.basetype = basetype
@@ -842,6 +1035,8 @@ class FileTypeNode(StructuredTypeNode):
 
 #region -------------- Pointer Types --------------
 class PointerTypeNode(TypeNode):
+    __slots__ = ("basetype",)
+
     def __init__(self, basetype: TypeNode):
         super().__init__()
         self.kind = TypeKind.TYPE_POINTER
@@ -873,6 +1068,8 @@ class PointerTypeNode(TypeNode):
 #endregion -------------- Pointer Types --------------
 
 class TypeDefinitionNode(Node):
+    __slots__ = ("key",)
+
     def __init__(self, key, value):
         super().__init__(None)
         self.key = key
@@ -912,6 +1109,8 @@ class TypeDefinitionNode(Node):
         }
 
 class TypeDefinitionPartNode(Node):
+    __slots__ = ()
+
     def __init__(self, types: list[TypeDefinitionNode]):
         super().__init__(None)
         self.value = types
@@ -950,6 +1149,8 @@ class TypeDefinitionPartNode(Node):
 #region ============== Section 3.E ==============
 
 class VariableDeclarationNode(Node):
+    __slots__ = ("keys",)
+
     def __init__(self, keys: list[IdentifierNode], value: TypeNode):
         super().__init__(None)
         self.keys = keys
@@ -992,6 +1193,8 @@ class VariableDeclarationNode(Node):
         }
 
 class VariableDeclarationPartNode(Node):
+    __slots__ = ()
+
     def __init__(self, variables: list[VariableDeclarationNode]):
         super().__init__(None)
         self.value = variables
@@ -1031,6 +1234,8 @@ class VariableDeclarationPartNode(Node):
 #region ============== Section 11 ==============
 #region -------------- Parameter Lists --------------
 class IndexTypeSpecificationNode(Node):
+    __slots__ = ("lb", "hb", "name")
+
     def __init__(self, lb, hb, name):
         super().__init__(None)
         self.lb = lb
@@ -1064,6 +1269,8 @@ class IndexTypeSpecificationNode(Node):
         }
 
 class PackedConformantArraySchemaNode(Node):
+    __slots__ = ("specification", "name")
+
     def __init__(self, specification: IndexTypeSpecificationNode, name: TypeIdentifierNode):
         super().__init__(None)
         self.specification = specification
@@ -1098,6 +1305,8 @@ class PackedConformantArraySchemaNode(Node):
         }
 
 class UnpackedConformantArraySchemaNode(Node):
+    __slots__ = ("specifications", "name")
+
     def __init__(self, specifications: list[IndexTypeSpecificationNode], name: TypeIdentifierNode):
         super().__init__(None)
         self.specifications = specifications
@@ -1139,6 +1348,8 @@ class UnpackedConformantArraySchemaNode(Node):
         }
 
 class ParameterSpecificationNode(Node):
+    __slots__ = ("identifiers", "basetype", "variable")
+
     def __init__(
         self, 
         identifiers: list[IdentifierNode], 
@@ -1191,6 +1402,8 @@ class ParameterSpecificationNode(Node):
         }
 
 class ActualParameterListNode(Node):
+    __slots__ = ()
+
     def __init__(self, params: list["ExpressionLikeNode"]):
         super().__init__(params)
 
@@ -1228,6 +1441,8 @@ class ActualParameterListNode(Node):
 
 #region -------------- Procedure --------------
 class ProcedureHeadingNode(Node):
+    __slots__ = ("name", "params")
+
     def __init__(self, name, params: list[ParameterSpecificationNode]):
         super().__init__(None)
         self.name = name
@@ -1272,6 +1487,8 @@ class ProcedureHeadingNode(Node):
         }
 
 class ProcedureDeclarationNode(Node):
+    __slots__ = ("heading", "body")
+
     def __init__(self, heading: ProcedureHeadingNode, body: "BlockNode" | DirectiveNode):
         super().__init__(None)
         self.heading = heading
@@ -1303,6 +1520,8 @@ class ProcedureDeclarationNode(Node):
 
 #region -------------- Function --------------
 class FunctionHeadingNode(Node):
+    __slots__ = ("name", "params", "rettype")
+
     def __init__(self, name, params: list[ParameterSpecificationNode], rettype: TypeIdentifierNode):
         super().__init__(None)
         self.name = name
@@ -1350,6 +1569,8 @@ class FunctionHeadingNode(Node):
         }
 
 class FunctionDeclarationNode(Node):
+    __slots__ = ("heading", "body")
+
     def __init__(self, heading: FunctionHeadingNode, body: "BlockNode" | DirectiveNode):
         super().__init__(None)
         self.heading = heading
@@ -1380,6 +1601,8 @@ class FunctionDeclarationNode(Node):
 #endregion -------------- Function --------------
 
 class ProcedureAndFunctionDeclarationPartNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: list[ProcedureDeclarationNode]):
         super().__init__(None)
         self.value = value
@@ -1431,6 +1654,8 @@ class VariableStaticType(Enum):
     VARIABLE_ST_POINTER = auto()
 
 class VariableNode(Node):
+    __slots__ = ("kind", "staticType")
+
     def __init__(self):
         super().__init__()
         self.kind = VariableKind.VARIABLE_UNKNOWN
@@ -1453,6 +1678,8 @@ class VariableNode(Node):
         }
 
 class EntireVariableNode(VariableNode):
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__()
         self.kind = VariableKind.VARIABLE_ENTIRE
@@ -1487,6 +1714,8 @@ class EntireVariableNode(VariableNode):
         }
 
 class IndexedVariableNode(VariableNode):
+    __slots__ = ("lbindex", "hbindex")
+
     def __init__(self, value: VariableNode, lbindex: "ExpressionNode", hbindex: "ExpressionNode" | None):
         super().__init__()
         self.kind = VariableKind.VARIABLE_COMPONENT
@@ -1534,6 +1763,8 @@ class IndexedVariableNode(VariableNode):
         }
 
 class FieldDesignatorNode(VariableNode):
+    __slots__ = ("key",)
+
     def __init__(self, key: VariableNode | IdentifierNode, value: IdentifierNode):
         super().__init__()
         self.kind = VariableKind.VARIABLE_COMPONENT
@@ -1580,6 +1811,8 @@ class FieldDesignatorNode(VariableNode):
         }
 
 class IdentifiedVariableNode(VariableNode):
+    __slots__ = ()
+
     def __init__(self, value: VariableNode):
         super().__init__()
         self.kind = VariableKind.VARIABLE_IDENTIFIED
@@ -1639,6 +1872,8 @@ class OpKind(Enum):
     OP_IN = auto()
 
 class OpNode(Node):
+    __slots__ = ()
+
     def __init__(self, op: OpKind):
         super().__init__(op)
 
@@ -1676,6 +1911,8 @@ class ExpressionStaticType(Enum):
     EXP_INTEGER = auto()
 
 class ExpressionLikeNode(Node):
+    __slots__ = ("kind", "staticType")
+
     def __init__(self, value: UnsignedConstantNode | VariableNode | IdentifierNode = None):
         super().__init__(value)
         self.kind = ExpressionKind.EXP_UNARY
@@ -1726,6 +1963,8 @@ class ExpressionLikeNode(Node):
         }
 
 class ExpressionNode(ExpressionLikeNode):
+    __slots__ = ("lhs", "op", "rhs")
+
     def __init__(self, lhs: ExpressionLikeNode, op: OpNode, rhs: ExpressionLikeNode):
         super().__init__()
         self.kind = ExpressionKind.EXP_BINARY
@@ -1779,6 +2018,8 @@ class ExpressionNode(ExpressionLikeNode):
         }
 
 class ElementDescriptionNode(Node):
+    __slots__ = ("start", "end")
+
     def __init__(self, start: ExpressionLikeNode, end: ExpressionLikeNode | None):
         super().__init__()
         self.start = start
@@ -1817,6 +2058,8 @@ class ElementDescriptionNode(Node):
         return base
 
 class SetConstructorNode(Node):
+    __slots__ = ()
+
     def __init__(self, value: list[ElementDescriptionNode]):
         super().__init__(None)
         self.value = value
@@ -1852,6 +2095,8 @@ class SetConstructorNode(Node):
         }
 
 class FunctionDesignatorNode(ExpressionLikeNode):
+    __slots__ = ("key", "params")
+
     def __init__(self, key: IdentifierNode, params: ActualParameterListNode | None):
         super().__init__()
         self.key = key
@@ -1892,6 +2137,8 @@ class FunctionDesignatorNode(ExpressionLikeNode):
 
 #region ============== Section R9 ==============
 class StatementNode(Node):
+    __slots__ = ("_label",)
+
     def __init__(self, value = None):
         super().__init__(value)
         self._label = None
@@ -1927,6 +2174,8 @@ class StatementNode(Node):
 #   - The type of the key and the resulting type of the expression value are compatible string types, that is, they both
 # are character arrays with equal length.
 class AssignmentStatementNode(StatementNode):
+    __slots__ = ("key",)
+
     def __init__(self, key: IdentifierNode | VariableNode, value: ExpressionNode):
         super().__init__(None)
         self.key = key
@@ -1963,6 +2212,8 @@ class AssignmentStatementNode(StatementNode):
 
 # Essentially, this is a function call.
 class ProcedureStatementNode(StatementNode):
+    __slots__ = ("key", "params")
+
     def __init__(self, key: IdentifierNode, params: ActualParameterListNode | None):
         super().__init__(None)
         self.key = key
@@ -2003,6 +2254,8 @@ class ProcedureStatementNode(StatementNode):
 #   - The statement must not attempt to jump to a label that does not exist in the current scope or attempt to jump to 
 # a label that was not declared on the current block (see Section 10.1).
 class GotoStatementNode(StatementNode):
+    __slots__ = ()
+
     def __init__(self, label: NumberNode):
         super().__init__(label)
 
@@ -2031,6 +2284,8 @@ class GotoStatementNode(StatementNode):
         }
 
 class CompoundStatementNode(StatementNode):
+    __slots__ = ()
+
     def __init__(self, statements: list[StatementNode]):
         super().__init__(None)
         self.value = statements
@@ -2071,6 +2326,8 @@ class CompoundStatementNode(StatementNode):
         }
 
 class ConditionalStatementNode(StatementNode):
+    __slots__ = ("cond", "ifStmt", "elseStmt")
+
     def __init__(self, cond: ExpressionNode, ifStmt: StatementNode, elseStmt: StatementNode | None):
         super().__init__(None)
         self.cond = cond
@@ -2121,6 +2378,8 @@ class ConditionalStatementNode(StatementNode):
         }
 
 class CaseStatementNode(StatementNode):
+    __slots__ = ("index", "cases")
+
     def __init__(self, index: ExpressionNode, cases: list[StatementNode]):
         super().__init__(None)
         self.index = index
@@ -2168,6 +2427,8 @@ class CaseStatementNode(StatementNode):
         }
 
 class CaseNode(Node):
+    __slots__ = ("heading", "body")
+
     def __init__(self, heading: list[Node], body: StatementNode):
         super().__init__(None)
         self.heading = heading
@@ -2211,6 +2472,8 @@ class CaseNode(Node):
         }
 
 class WhileStatementNode(StatementNode):
+    __slots__ = ("cond", "body")
+
     def __init__(self, cond: ExpressionNode, body: StatementNode):
         super().__init__(None)
         self.cond = cond
@@ -2249,6 +2512,8 @@ class WhileStatementNode(StatementNode):
         }
 
 class RepeatStatementNode(StatementNode):
+    __slots__ = ("cond", "body")
+
     def __init__(self, cond: ExpressionNode, body: list[StatementNode]):
         super().__init__(None)
         self.cond = cond
@@ -2320,6 +2585,8 @@ class ForTraversalMode(Enum):
 #
 # NOTE: Refer to section R9.2.3.3 for statement-equivalence examples for For Statements.
 class ForStatementNode(StatementNode):
+    __slots__ = ("controlVar", "initial", "traversalMode", "final", "body")
+
     def __init__(
         self, 
         controlVar: VariableNode, initial: ExpressionNode, 
@@ -2374,6 +2641,8 @@ class ForStatementNode(StatementNode):
         }
 
 class WithStatementNode(StatementNode):
+    __slots__ = ("recVars", "body")
+
     def __init__(self, recVars: list[VariableNode], body: StatementNode):
         super().__init__(None)
         self.recVars = recVars
@@ -2423,6 +2692,8 @@ class WithStatementNode(StatementNode):
 
 # Section 3
 class BlockNode(Node):
+    __slots__ = ("labels", "consts", "types", "variables", "subfuncs", "stmt")
+
     def __init__(
         self, 
         labels: LabelDeclarationNode, 
@@ -2481,6 +2752,8 @@ class BlockNode(Node):
         return obj
 
 class ProgramNode(Node):
+    __slots__ = ("heading", "body")
+
     def __init__(self, heading: ProgramHeadingNode, body: BlockNode):
         super().__init__(None)
         self.heading = heading
@@ -0,0 +1,270 @@
+import sys
+import struct
+from enum import Enum
+import compiler.ast as ast
+from compiler.ast import nodeAttributes
+
+#
+# Binary AST Serialization
+#
+#   This module serializes ASTs to a compact binary form, and back, as an alternative to Node#toJSON for when the AST
+# doesn't have to be human-readable: caching ASTs, or shipping them between processes. A deserialized AST is made of
+# the same node classes, with the same attributes, so it's JSON form is exactly the same as the original's.
+#   The layout of a serialized AST is:
+#     - The magic number (FORMAT_MAGIC) and the format version (FORMAT_VERSION).
+#     - The string table: every string in the AST (identifiers, string constants, ...), as well as the names of the node
+#   classes, their attributes and the enum members, each stored once. Strings are referred to by their index.
+#     - The node kinds: each distinct node class, along with the names of it's attributes. Nodes are referred to by the
+#   index of their kind (the node kind id), and their attributes are stored in the order of their kind.
+#     - The enum members, as pairs of their enum class (qualified by module) and their name.
+#     - The root value.
+#   Every value starts with a tag byte (see the TAG_* constants). Integers are stored as zigzag varints (positions
+# included, which are stored resolved, as rows and columns), and floats as doubles. Positions that were never set hold
+# whatever the node was created with (see Node), and are stored as tagged values instead (TAG_RAW_POS).
+#
+
+FORMAT_MAGIC = b"PAST"
+FORMAT_VERSION = 1
+
+#region ============== Constants ==============
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_LIST = 6
+TAG_TUPLE = 7
+TAG_DICT = 8
+TAG_NODE = 9
+TAG_POS = 10
+TAG_ENUM = 11
+TAG_RAW_POS = 12
+#endregion ============== Constants ==============
+
+_double = struct.Struct("<d")
+
+#region ============== Serialization ==============
+def _writeVarint(buf: bytearray, n: int):
+    while (n > 0x7F):
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def _writeInt(buf: bytearray, n: int):
+    _writeVarint(buf, n << 1 if n >= 0 else ((-n) << 1) - 1)
+
+class _Serializer:
+    def __init__(self):
+        self.body = bytearray()
+        self.strings = {}
+        self.kinds = {}
+        self.enums = {}
+
+    def string(self, s: str) -> int:
+        sid = self.strings.get(s)
+        if (sid == None):
+            sid = len(self.strings)
+            self.strings[s] = sid
+
+        return sid
+
+    def write(self, v):
+        buf = self.body
+        # The most frequent values are checked first.
+        if (v is None): buf.append(TAG_NONE)
+        elif (isinstance(v, ast.NodePos)):
+            fields = v.getStart() + v.getEnd()
+            if (all(type(f) is int for f in fields)):
+                buf.append(TAG_POS)
+                for f in fields: _writeInt(buf, f)
+            else:
+                buf.append(TAG_RAW_POS)
+                for f in fields: self.write(f)
+        elif (isinstance(v, ast.Node)):
+            attrs = nodeAttributes(v)
+            kindKey = (type(v), attrs)
+            kid = self.kinds.get(kindKey)
+            if (kid == None):
+                kid = len(self.kinds)
+                self.kinds[kindKey] = kid
+
+            buf.append(TAG_NODE)
+            _writeVarint(buf, kid)
+            for attr in attrs: self.write(getattr(v, attr))
+        elif (isinstance(v, str)):
+            buf.append(TAG_STR)
+            _writeVarint(buf, self.string(v))
+        elif (isinstance(v, Enum)):
+            enumKey = (type(v), v.name)
+            eid = self.enums.get(enumKey)
+            if (eid == None):
+                eid = len(self.enums)
+                self.enums[enumKey] = eid
+
+            buf.append(TAG_ENUM)
+            _writeVarint(buf, eid)
+        elif (isinstance(v, bool)): buf.append(TAG_TRUE if v else TAG_FALSE)
+        elif (isinstance(v, int)):
+            buf.append(TAG_INT)
+            _writeInt(buf, v)
+        elif (isinstance(v, float)):
+            buf.append(TAG_FLOAT)
+            buf += _double.pack(v)
+        elif (isinstance(v, (list, tuple))):
+            buf.append(TAG_LIST if isinstance(v, list) else TAG_TUPLE)
+            _writeVarint(buf, len(v))
+            for e in v: self.write(e)
+        elif (isinstance(v, dict)):
+            buf.append(TAG_DICT)
+            _writeVarint(buf, len(v))
+            for (k, e) in v.items():
+                self.write(k)
+                self.write(e)
+        else:
+            raise TypeError(f"Cannot serialize a value of type {type(v).__name__} in an AST.")
+
+    def header(self) -> bytearray:
+        # The names on the kinds and enums are added to the string table first, as it precedes them.
+        kinds = [
+            (self.string(cls.__name__), [self.string(attr) for attr in attrs]) for (cls, attrs) in self.kinds
+        ]
+        enums = [
+            (self.string(f"{cls.__module__}:{cls.__qualname__}"), self.string(name)) for (cls, name) in self.enums
+        ]
+
+        buf = bytearray(FORMAT_MAGIC)
+        buf.append(FORMAT_VERSION)
+
+        _writeVarint(buf, len(self.strings))
+        for s in self.strings:
+            data = s.encode("utf-8")
+            _writeVarint(buf, len(data))
+            buf += data
+
+        _writeVarint(buf, len(kinds))
+        for (nameId, attrIds) in kinds:
+            _writeVarint(buf, nameId)
+            _writeVarint(buf, len(attrIds))
+            for attrId in attrIds: _writeVarint(buf, attrId)
+
+        _writeVarint(buf, len(enums))
+        for (clsId, nameId) in enums:
+            _writeVarint(buf, clsId)
+            _writeVarint(buf, nameId)
+
+        return buf
+
+def serializeAST(root) -> bytes:
+    """
+        Serializes an AST (or any value made of nodes, lists, tuples, dicts and primitives) to it's binary form.
+    """
+    s = _Serializer()
+    s.write(root)
+
+    return bytes(s.header() + s.body)
+#endregion ============== Serialization ==============
+
+#region ============== Deserialization ==============
+class _Deserializer:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def varint(self) -> int:
+        data = self.data
+        pos = self.pos
+        b = data[pos]
+        pos += 1
+        if (b < 0x80):
+            self.pos = pos
+            return b
+
+        n = b & 0x7F
+        shift = 7
+        while (b & 0x80):
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            shift += 7
+
+        self.pos = pos
+        return n
+
+    def int(self) -> int:
+        n = self.varint()
+        return -((n + 1) >> 1) if n & 1 else n >> 1
+
+    def header(self):
+        if (self.data[:len(FORMAT_MAGIC)] != FORMAT_MAGIC): raise ValueError("Not a serialized AST.")
+        self.pos = len(FORMAT_MAGIC)
+        version = self.data[self.pos]
+        self.pos += 1
+        if (version != FORMAT_VERSION): raise ValueError(f"Unsupported serialized AST version: {version}.")
+
+        self.strings = []
+        for _ in range(self.varint()):
+            size = self.varint()
+            self.strings.append(self.data[self.pos:self.pos + size].decode("utf-8"))
+            self.pos += size
+
+        self.kinds = []
+        for _ in range(self.varint()):
+            cls = getattr(ast, self.strings[self.varint()])
+            attrs = tuple(self.strings[self.varint()] for _ in range(self.varint()))
+            self.kinds.append((cls, attrs))
+
+        self.enums = []
+        for _ in range(self.varint()):
+            (module, qualname) = self.strings[self.varint()].split(":")
+            cls = sys.modules[module]
+            for name in qualname.split("."): cls = getattr(cls, name)
+            self.enums.append(cls[self.strings[self.varint()]])
+
+    def read(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        # The most frequent values are checked first.
+        if (tag == TAG_NONE): return None
+        elif (tag == TAG_POS):
+            startPos = self.int()
+            start = (self.int(), self.int())
+            endPos = self.int()
+            return ast.NodePos(start, (self.int(), self.int()), startPos, endPos)
+        elif (tag == TAG_RAW_POS):
+            (startPos, startRow, startCol, endPos, endRow, endCol) = (self.read() for _ in range(6))
+            return ast.NodePos((startRow, startCol), (endRow, endCol), startPos, endPos)
+        elif (tag == TAG_NODE):
+            (cls, attrs) = self.kinds[self.varint()]
+            node = cls.__new__(cls)
+            for attr in attrs: setattr(node, attr, self.read())
+            return node
+        elif (tag == TAG_STR): return self.strings[self.varint()]
+        elif (tag == TAG_ENUM): return self.enums[self.varint()]
+        elif (tag == TAG_FALSE): return False
+        elif (tag == TAG_TRUE): return True
+        elif (tag == TAG_INT): return self.int()
+        elif (tag == TAG_FLOAT):
+            v = _double.unpack_from(self.data, self.pos)[0]
+            self.pos += _double.size
+            return v
+        elif (tag == TAG_LIST): return [self.read() for _ in range(self.varint())]
+        elif (tag == TAG_TUPLE): return tuple(self.read() for _ in range(self.varint()))
+        elif (tag == TAG_DICT):
+            d = {}
+            for _ in range(self.varint()):
+                k = self.read()
+                d[k] = self.read()
+            return d
+        else:
+            raise ValueError(f"Invalid tag on serialized AST: {tag} (at {self.pos - 1}).")
+
+def deserializeAST(data: bytes):
+    """
+        Deserializes an AST from it's binary form (see serializeAST).
+    """
+    d = _Deserializer(data)
+    d.header()
+
+    return d.read()
+#endregion ============== Deserialization ==============
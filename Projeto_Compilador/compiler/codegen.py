@@ -355,9 +355,10 @@ def emitExpression(bld: CodeTree, n: ast.ExpressionLikeNode):
         elif (n.lhs != None):
             emitExpression(bld, n.lhs)
         elif (n.rhs != None):
+            # A signed expression is emitted as it's operation over zero (e.g. -x as 0 - x).
             bld._inst(CodeID.PUSHI, [0])
-            bld._mono(_OP_MAP_INT[n.op.value]) # SHOULD only be the unary plus and unary minus operators.
             emitExpression(bld, n.rhs)
+            bld._mono(_OP_MAP_INT[n.op.value]) # SHOULD only be the unary plus and unary minus operators.
     elif (n.ist(ast.ElementDescriptionNode)):
         pass # TODO: Set initialization
     elif (n.ist(ast.SetConstructorNode)):
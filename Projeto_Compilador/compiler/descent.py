@@ -0,0 +1,930 @@
+import time
+from .lexer import newLexer, PascalLexer
+from .diag import DiagnosticSink, DiagnosticKind
+from . import synanaler
+import compiler.ast as ast
+
+#
+# Recursive Descent Syntatic Analyser
+#
+#   This module holds an alternative frontend to the Syntatic Analyser (synanaler.py): a hand-written recursive descent
+# parser, with Pratt-style expressions (see PascalDescentParser#_expression). It builds the exact same AST as the
+# grammar rules, down to the positions of every node, so the production functions on synanaler.py are the reference for
+# each method here. Where a rule builds something unexpected, the same is built here, so that both frontends can be
+# compared (see tests/test.py frontdiff).
+#   It avoids the cost of calling a production function for each reduction, most of them on the chains of unit
+# productions expressions go through (expression -> simpleExpression -> simpleExpressionBody -> term -> factor).
+#
+#  On Error Handling:
+#    There are no resynchronization rules: the first syntax error is reported (as p_error would) and the parse is
+# aborted, returning None. The grammar rules remain the reference for error recovery.
+#    The options of the error recovery budget are the same as PascalParser's, of which only the time limit (and 
+# maxErrors, if set to 0) can be exceeded, as no tokens are ever skipped.
+#
+#  On Lookahead:
+#    Tokens are only requested from the lexer when needed, and never more than two ahead, so that the lexer state the
+# rules rely on (lexer.peek on programHeading, lexer._lastSep on bt_GENERIC) is the same as when PLY reduces them.
+#
+
+#region ============== Constants ==============
+OPP_NUD = 0
+"""Index for Null Denotation for Pratt's Algorithm. See OPERATOR_PRECEDENCE."""
+OPP_LED = 1
+"""Index for Left Denotation for Pratt's Algorithm. See OPERATOR_PRECEDENCE."""
+OPP_RID = 2
+"""Index for Right Denotation for Pratt's Algorithm. See OPERATOR_PRECEDENCE."""
+OPP_KIND = 3
+"""Index for the operator kind of an operator token. See OPERATOR_PRECEDENCE."""
+
+# The binding powers follow the grammar (Section R8): relational operators bind the loosest and don't associate (a
+#   single one per expression), adding operators bind tighter and the multiplying operators the tightest, both
+#   associating to the left. Signs are only allowed at the start of a simple expression, and apply to the whole simple
+#   expression.
+# <token type>: (<nud>, <led>, <rid>, <kind>)
+OPERATOR_PRECEDENCE = {
+    "OP_EQ":    (-1, +1, +2, ast.OpKind.OP_EQ),
+    "OP_NEQ":   (-1, +1, +2, ast.OpKind.OP_NEQ),
+    "OP_LT":    (-1, +1, +2, ast.OpKind.OP_LT),
+    "OP_LTE":   (-1, +1, +2, ast.OpKind.OP_LTE),
+    "OP_GT":    (-1, +1, +2, ast.OpKind.OP_GT),
+    "OP_GTE":   (-1, +1, +2, ast.OpKind.OP_GTE),
+    "KW_IN":    (-1, +1, +2, ast.OpKind.OP_IN),
+    "OP_PLUS":  (+2, +2, +3, ast.OpKind.OP_ADD),
+    "OP_MINUS": (+2, +2, +3, ast.OpKind.OP_SUB),
+    "KW_OR":    (-1, +2, +3, ast.OpKind.OP_OR),
+    "OP_MULT":  (-1, +3, +4, ast.OpKind.OP_MUL),
+    "OP_DIV":   (-1, +3, +4, ast.OpKind.OP_DIV),
+    "KW_DIV":   (-1, +3, +4, ast.OpKind.OP_DIV),
+    "KW_MOD":   (-1, +3, +4, ast.OpKind.OP_MOD),
+    "KW_AND":   (-1, +3, +4, ast.OpKind.OP_AND)
+}
+
+RELATIONAL_LED = 1
+
+# The tokens after a variable that make an IDENTIFIER the start of an assignment, rather than of a procedure statement.
+ASSIGNMENT_HEAD_FOLLOW = frozenset(("OP_ASSIGN", "LSBRACKET", "DOT", "OP_UPARROW"))
+#endregion ============== Constants ==============
+
+class _DescentError(Exception):
+    def __init__(self, token):
+        self.token = token
+
+class PascalDescentParser:
+    """
+    A recursive descent parser for Standard Pascal, interchangeable with PascalParser (see synanaler.newParser): it has
+    the same per-parse state (diagnostics, _diagnosticTrace, backtracks and skippedTokens), sink, options and cache, 
+    and parseSource builds the same AST.
+    """
+    def __init__(self, l: PascalLexer = None, sink: DiagnosticSink = None):
+        self.lexer = l if l != None else newLexer()
+        self.sink = sink if sink != None else DiagnosticSink()
+        self.cache = None
+        self.options = {
+            "debug": False,
+            "maxErrors": 100,
+            "maxSkippedTokens": 1000,
+            "timeLimit": None
+        }
+        self.reset()
+
+    def reset(self):
+        self.diagnostics = []
+        self._diagnosticTrace = []
+        self.backtracks = {}
+        self.skippedTokens = 0
+        self._deadline = None
+        self._fetched = 0
+        self._tokenfunc = None
+        self._la = []
+
+    def parseSource(self, src, debug = False, tokenfunc = None):
+        """
+            Parses a source text, returning it's AST, or None on a syntax error. Once this returns (or raises), the
+            lexer holds the lexical diagnostics of the whole source text, and the parser holds the syntatic diagnostics.
+            As on PascalParser, a parse aborted by the recovery budget only lexes as far as it parsed.
+
+            A custom token function can be given (e.g. for tracing), which must obtain it's tokens from
+            lexer.getExtendedToken. The debug flag is only accepted for compatibility with PascalParser.
+        """
+        if (self.cache != None and not debug and tokenfunc == None):
+            return self.cache.parse(self, src, lambda: self._parseSource(src, None))
+
+        return self._parseSource(src, tokenfunc)
+
+    def _parseSource(self, src, tokenfunc):
+        self.reset()
+        self.lexer.reset()
+        self.lexer.input(src)
+        self._tokenfunc = tokenfunc or self.lexer.getExtendedToken
+        if (self.options["timeLimit"] != None): self._deadline = time.perf_counter() + self.options["timeLimit"]
+
+        prev = getattr(synanaler._current, "parser", None)
+        synanaler._current.parser = self
+        aborted = False
+        try:
+            try:
+                return self._program()
+            except _DescentError as e:
+                synanaler.p_error(e.token)
+                return None
+            except SyntaxError:
+                # Raised by the same checks the grammar rules make (e.g. a function call on a component variable).
+                synanaler.p_error(self._peekToken())
+                return None
+        except synanaler._BudgetExceeded as e:
+            aborted = True
+            synanaler.budgetExceeded(e)
+            return None
+        finally:
+            # See PascalParser#_parseSource.
+            if (aborted): self.lexer.abandon()
+            else: self.lexer.drain(self._deadline)
+            synanaler._current.parser = prev
+
+    def validateSource(self, src, debug = False, tokenfunc = None) -> bool:
+        """
+            Parses a source text, returning whether it is a syntatically valid program (see 
+            PascalParser#validateSource). Unlike PascalParser, the AST is still built, as it is built while parsing.
+        """
+        pout = self.parseSource(src, debug, tokenfunc)
+
+        return pout != None and len(self.diagnostics) == 0 \
+            and not any(diag.kind in (DiagnosticKind.ERROR, DiagnosticKind.CRITICAL) for diag in self.lexer.diagnostics)
+
+    #region ------- Token Utils -------
+    # Each lookahead entry holds the token and the last separator the lexer had seen when the token was requested.
+    def _fill(self, n):
+        while (len(self._la) < n):
+            self._fetched += 1
+            if (self._deadline != None and (self._fetched & 0xFF) == 0): synanaler.checkDeadline(self)
+            tok = self._tokenfunc()
+            self._la.append((tok, self.lexer._lastSep))
+
+    def _peekToken(self, k = 0):
+        if (len(self._la) <= k): self._fill(k + 1)
+        return self._la[k][0]
+
+    def _peekType(self, k = 0):
+        if (len(self._la) <= k): self._fill(k + 1)
+        tok = self._la[k][0]
+        return None if tok == None else tok.type
+
+    def _lastSep(self):
+        """
+            Gets the last separator seen by the lexer when the next token was requested, the same as bt_GENERIC.
+        """
+        if (len(self._la) == 0): self._fill(1)
+        return self._la[0][1]
+
+    def _next(self):
+        if (len(self._la) == 0): self._fill(1)
+        tok = self._la.pop(0)[0]
+        if (tok == None): raise _DescentError(None)
+        return tok
+
+    def _accept(self, type):
+        if (self._peekType() == type): return self._next()
+        return None
+
+    def _expect(self, type):
+        if (self._peekType() != type): raise _DescentError(self._peekToken())
+        return self._next()
+
+    def _fail(self):
+        raise _DescentError(self._peekToken())
+    #endregion ------- Token Utils -------
+
+    #region ============== Compound Primitives =============
+    def _number(self):
+        t = self._peekToken()
+        if (t == None or (t.type != "UNSIGNED_REAL" and t.type != "UNSIGNED_INTEGER")): self._fail()
+        self._next()
+
+        return ast.NumberNode(t.value, ast.NumberKind[t.type]).setTokenPos(t.pos)
+
+    def _constElem(self):
+        t = self._peekToken()
+        if (t == None): self._fail()
+
+        match (t.type):
+            case "UNSIGNED_REAL" | "UNSIGNED_INTEGER":
+                return self._number()
+            case "OP_PLUS" | "OP_MINUS":
+                self._next()
+                return self._number().sign(t.type).setStartTokenPos(t.pos)
+            case "STRING":
+                self._next()
+                return ast.StringNode(t.value).setTokenPos(t.pos)
+            case "IDENTIFIER":
+                self._next()
+                return ast.IdentifierNode(t.value).setTokenPos(t.pos)
+            case _:
+                self._fail()
+
+    def _identifierNodeList(self):
+        t = self._expect("IDENTIFIER")
+        ids = [ast.IdentifierNode(t.value).setTokenPos(t.pos)]
+        while (self._accept("COMMA")):
+            t = self._expect("IDENTIFIER")
+            ids.append(ast.IdentifierNode(t.value).setTokenPos(t.pos))
+
+        return ids
+    #endregion ============== Compound Primitives =============
+
+    #region ============== Section 3 ==============
+    def _program(self):
+        heading = self._programHeading()
+        self._expect("SEMICOLON")
+        body = self._block()
+        dot = self._expect("DOT")
+        if (self._peekToken() != None): self._fail()
+
+        return ast.ProgramNode(heading, body).setStartTokenPos(heading.pos).setEndTokenPos(dot.pos)
+
+    def _programHeading(self):
+        start = self._expect("KW_PROGRAM")
+        name = self._expect("IDENTIFIER").value
+
+        externals = None
+        if (self._accept("LPAREN")):
+            t = self._accept("IDENTIFIER")
+            externals = [t.value if t != None else None]
+            while (self._accept("COMMA")): externals.append(self._expect("IDENTIFIER").value)
+            self._expect("RPAREN")
+
+        node = ast.ProgramHeadingNode(name, externals).setStartTokenPos(start.pos)
+        if (externals != None): node.setEndTokenPos(self.lexer.peek().pos)
+
+        return node
+
+    def _block(self):
+        parts = (
+            self._labelDeclarationPart(),
+            self._constDefinitionPart(),
+            self._typeDefinitionPart(),
+            self._variableDeclarationPart(),
+            self._procedureAndFunctionDefinitionPart(),
+            self._compoundStatement()
+        )
+
+        node = ast.BlockNode(*parts)
+        for part in parts:
+            if (part != None):
+                node.setStartTokenPos(part.pos)
+                break
+
+        return node.setEndTokenPos(parts[5].pos)
+
+    #region ------- Label Declaration -------
+    def _labelDeclarationPart(self):
+        start = self._accept("KW_LABEL")
+        if (start == None): return None
+
+        t = self._expect("UNSIGNED_INTEGER")
+        labels = [ast.NumberNode(t.value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(t.pos)]
+        while (self._accept("COMMA")):
+            t = self._expect("UNSIGNED_INTEGER")
+            labels.append(ast.NumberNode(t.value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(t.pos))
+        end = self._expect("SEMICOLON")
+
+        return ast.LabelDeclarationNode(labels).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+    #endregion ------- Label Declaration -------
+
+    #region ------- Constants Definition -------
+    def _constDefinitionPart(self):
+        start = self._accept("KW_CONST")
+        if (start == None): return None
+
+        consts = [self._constDefinition()]
+        while (self._peekType() == "SEMICOLON" and self._peekType(1) == "IDENTIFIER"):
+            self._next()
+            consts.append(self._constDefinition())
+        end = self._expect("SEMICOLON")
+
+        return ast.ConstantDefinitionPartNode(consts).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _constDefinition(self):
+        t = self._expect("IDENTIFIER")
+        self._expect("OP_EQ")
+        value = self._constElem()
+
+        return ast.ConstantDefinitionNode(t.value, value).setStartTokenPos(t.pos).setEndTokenPos(value.pos)
+    #endregion ------- Constants Definition -------
+
+    #region ------- Type Definition -------
+    def _typeDefinitionPart(self):
+        start = self._accept("KW_TYPE")
+        if (start == None): return None
+
+        types = [self._typeDefinition()]
+        while (self._peekType() == "SEMICOLON" and self._peekType(1) == "IDENTIFIER"):
+            self._next()
+            types.append(self._typeDefinition())
+        end = self._expect("SEMICOLON")
+
+        return ast.TypeDefinitionPartNode(types).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _typeDefinition(self):
+        t = self._expect("IDENTIFIER")
+        self._expect("OP_EQ")
+        value = self._type()
+
+        return ast.TypeDefinitionNode(t.value, value).setStartTokenPos(t.pos).setEndTokenPos(value.pos)
+
+    def _type(self):
+        match (self._peekType()):
+            case "OP_UPARROW":
+                t = self._next()
+                base = self._type()
+                return ast.PointerTypeNode(base).setStartTokenPos(t.pos).setEndTokenPos(base.pos)
+            case "KW_PACKED":
+                t = self._next()
+                node = self._unpackedStructuredType()
+                node.packed = True
+                return node.setStartTokenPos(t.pos)
+            case "KW_ARRAY" | "KW_RECORD" | "KW_SET":
+                return self._unpackedStructuredType()
+            case _:
+                return self._ordinalType()
+
+    def _ordinalType(self):
+        match (self._peekType()):
+            case "LPAREN":
+                start = self._next()
+                ids = self._identifierNodeList()
+                end = self._expect("RPAREN")
+                return ast.EnumeratedTypeNode(ids).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+            case "IDENTIFIER" if self._peekType(1) != "OP_RANGE":
+                t = self._next()
+                return ast.TypeIdentifierNode(ast.IdentifierNode(t.value).setTokenPos(t.pos))
+            case _:
+                lb = self._constElem()
+                self._expect("OP_RANGE")
+                hb = self._constElem()
+                return ast.SubrangeTypeNode(lb, hb).setStartTokenPos(lb.pos).setEndTokenPos(hb.pos)
+
+    def _unpackedStructuredType(self):
+        match (self._peekType()):
+            case "KW_ARRAY": return self._arrayType()
+            case "KW_RECORD": return self._recordType()
+            case "KW_SET": return self._setType()
+            case _: self._fail()
+
+    def _arrayType(self):
+        start = self._expect("KW_ARRAY")
+        self._expect("LSBRACKET")
+        indexes = [self._ordinalType()]
+        while (self._accept("COMMA")): indexes.append(self._ordinalType())
+        self._expect("RSBRACKET")
+        self._expect("KW_OF")
+        base = self._type()
+
+        return ast.ArrayTypeNode(indexes, base).setStartTokenPos(start.pos).setEndTokenPos(base.pos)
+
+    def _recordType(self):
+        start = self._expect("KW_RECORD")
+        fieldList = self._fieldList()
+        end = self._expect("KW_END")
+
+        if (fieldList == None): return ast.RecordTypeNode().setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+        return ast.RecordTypeNode(fieldList[0], fieldList[1]).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _fieldList(self):
+        """
+            Parses a field list, returning it's fixed and variant parts, or None if it has no fixed part (as p_fieldList
+            does, even if there is a variant part).
+        """
+        if (self._peekType() == "KW_CASE"):
+            self._variantPart()
+            return None
+        elif (self._peekType() != "IDENTIFIER"):
+            return None
+
+        fixedPart = [self._recordSection()]
+        variantPart = None
+        while (self._accept("SEMICOLON")):
+            match (self._peekType()):
+                case "IDENTIFIER":
+                    fixedPart.append(self._recordSection())
+                case "KW_CASE":
+                    variantPart = self._variantPart()
+                    break
+                case _:
+                    break
+
+        return (fixedPart, variantPart)
+
+    def _recordSection(self):
+        ids = self._identifierNodeList()
+        self._expect("COLON")
+        base = self._type()
+
+        return ast.RecordSectionNode(ids, base).setStartTokenPos(ids[0].pos).setEndTokenPos(base.pos)
+
+    def _variantPart(self):
+        start = self._expect("KW_CASE")
+        t = self._expect("IDENTIFIER")
+        if (self._accept("COLON")): selector = (t.value, self._expect("IDENTIFIER").value)
+        else: selector = (None, t.value)
+        self._expect("KW_OF")
+
+        # As PLY shifts every SEMICOLON after a variant case, a variant part can't be followed by one.
+        cases = [self._variantCase()]
+        while (self._accept("SEMICOLON")): cases.append(self._variantCase())
+
+        node = ast.RecordVariantNode(
+            selector[0],
+            ast.TypeIdentifierNode(ast.IdentifierNode(selector[1]).setTokenPos(start.pos)),
+            cases
+        ).setStartTokenPos(start.pos)
+        return node.setEndTokenPos(cases[-1].pos)
+
+    def _variantCase(self):
+        consts = [self._constElem()]
+        while (self._accept("COMMA")): consts.append(self._constElem())
+        self._expect("COLON")
+        self._expect("LPAREN")
+        fieldList = self._fieldList()
+        end = self._expect("RPAREN")
+
+        if (fieldList == None):
+            return ast.RecordVariantCaseNode(consts).setStartTokenPos(consts[0].pos).setEndTokenPos(end.pos)
+        return ast.RecordVariantCaseNode(consts, fieldList[0], fieldList[1]) \
+            .setStartTokenPos(consts[0].pos).setEndTokenPos(end.pos)
+
+    def _setType(self):
+        start = self._expect("KW_SET")
+        self._expect("KW_OF")
+        base = self._ordinalType()
+
+        return ast.SetTypeNode(base).setStartTokenPos(start.pos).setEndTokenPos(base.pos)
+    #endregion ------- Type Definition -------
+
+    #region ------- Variable Declaration -------
+    def _variableDeclarationPart(self):
+        start = self._accept("KW_VAR")
+        if (start == None): return None
+
+        variables = [self._variableDeclaration()]
+        while (self._peekType() == "SEMICOLON" and self._peekType(1) == "IDENTIFIER"):
+            self._next()
+            variables.append(self._variableDeclaration())
+        end = self._expect("SEMICOLON")
+
+        return ast.VariableDeclarationPartNode(variables).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _variableDeclaration(self):
+        ids = self._identifierNodeList()
+        self._expect("COLON")
+        value = self._type()
+
+        return ast.VariableDeclarationNode(ids, value).setStartTokenPos(ids[0].pos).setEndTokenPos(value.pos)
+    #endregion ------- Variable Declaration -------
+    #endregion ============== Section 3 ==============
+
+    #region ============== Section 11 ==============
+    def _procedureAndFunctionDefinitionPart(self):
+        if (self._peekType() != "KW_PROCEDURE" and self._peekType() != "KW_FUNCTION"): return None
+
+        definitions = [self._procedureAndFunctionDefinition()]
+        end = self._expect("SEMICOLON")
+        while (self._peekType() == "KW_PROCEDURE" or self._peekType() == "KW_FUNCTION"):
+            definitions.append(self._procedureAndFunctionDefinition())
+            end = self._expect("SEMICOLON")
+
+        return ast.ProcedureAndFunctionDeclarationPartNode(definitions) \
+            .setStartTokenPos(definitions[0].pos).setEndTokenPos(end.pos)
+
+    def _procedureAndFunctionDefinition(self):
+        heading = self._procedureOrFunctionHeading()
+        self._expect("SEMICOLON")
+
+        if (self._peekType() == "IDENTIFIER"):
+            t = self._next()
+            body = ast.DirectiveNode(t.value).setTokenPos(t.pos)
+        else:
+            body = self._block()
+
+        if (heading.ist(ast.ProcedureHeadingNode)):
+            return ast.ProcedureDeclarationNode(heading, body).setStartTokenPos(heading.pos).setEndTokenPos(body.pos)
+        return ast.FunctionDeclarationNode(heading, body).setStartTokenPos(heading.pos).setEndTokenPos(body.pos)
+
+    def _procedureOrFunctionHeading(self):
+        if (self._peekType() == "KW_PROCEDURE"): return self._procedureHeading()
+        return self._functionHeading()
+
+    def _procedureHeading(self):
+        start = self._expect("KW_PROCEDURE")
+        t = self._expect("IDENTIFIER")
+        params = self._formalParameterList()
+
+        node = ast.ProcedureHeadingNode(t.value, params).setStartTokenPos(start.pos)
+        if (params != None): return node.setEndTokenPos(params[-1].pos)
+        return node.setEndTokenPos(t.pos)
+
+    def _functionHeading(self):
+        start = self._expect("KW_FUNCTION")
+        t = self._expect("IDENTIFIER")
+
+        params = None
+        rettype = None
+        if (self._peekType() == "LPAREN" or self._peekType() == "COLON"):
+            params = self._formalParameterList()
+            self._expect("COLON")
+            r = self._expect("IDENTIFIER")
+            rettype = ast.TypeIdentifierNode(ast.IdentifierNode(r.value).setTokenPos(r.pos))
+
+        # As on p_functionHeading, the end of a heading without a return type is taken from the return type (None).
+        return ast.FunctionHeadingNode(t.value, params, rettype).setStartTokenPos(start.pos).setEndTokenPos(rettype.pos)
+
+    #region ------- Section R11.3.1 -------
+    def _formalParameterList(self):
+        if (not self._accept("LPAREN")): return None
+
+        sections = [self._formalParameterSection()]
+        while (self._accept("SEMICOLON")): sections.append(self._formalParameterSection())
+        self._expect("RPAREN")
+
+        return sections
+
+    def _formalParameterSection(self):
+        match (self._peekType()):
+            case "KW_VAR":
+                # The backtrack is taken before the identifiers are requested, as PLY reduces bt_GENERIC right after
+                #   shifting KW_VAR.
+                sep = self._lastSep()
+                t = self._next()
+                spec = self._valueParameterSpecification(sep)
+                return spec.setVariable(True).setStartTokenPos(t.pos).setEndTokenPos(spec.pos)
+            case "KW_PROCEDURE" | "KW_FUNCTION":
+                return self._procedureOrFunctionHeading()
+            case _:
+                return self._valueParameterSpecification(self._lastSep())
+
+    def _valueParameterSpecification(self, sep):
+        self.backtracks["GENERIC"] = sep
+
+        ids = [self._expect("IDENTIFIER").value]
+        while (self._accept("COMMA")): ids.append(self._expect("IDENTIFIER").value)
+        self._expect("COLON")
+        body = self._formalParameterSpecificationBody()
+
+        return ast.ParameterSpecificationNode(ids, body).setStartTokenPos(sep.pos).setEndTokenPos(body.pos)
+
+    def _formalParameterSpecificationBody(self):
+        match (self._peekType()):
+            case "IDENTIFIER":
+                t = self._next()
+                return ast.TypeIdentifierNode(ast.IdentifierNode(t.value).setTokenPos(t.pos))
+            case "KW_PACKED":
+                # As on p_packedConformantArraySchema, which doesn't yield it's node.
+                start = self._next()
+                self._expect("KW_ARRAY")
+                self._expect("LSBRACKET")
+                spec = self._indexTypeSpecification()
+                self._expect("RSBRACKET")
+                self._expect("KW_OF")
+                t = self._expect("IDENTIFIER")
+                ast.PackedConformantArraySchemaNode(spec, t.value).setStartTokenPos(start.pos).setEndTokenPos(t.pos)
+                return None
+            case "KW_ARRAY":
+                start = self._next()
+                self._expect("LSBRACKET")
+                spec = self._indexTypeSpecification()
+                self._expect("RSBRACKET")
+                self._expect("KW_OF")
+                t = self._expect("IDENTIFIER")
+                return ast.UnpackedConformantArraySchemaNode(spec, t.value) \
+                    .setStartTokenPos(start.pos).setEndTokenPos(t.pos)
+            case _:
+                self._fail()
+
+    def _indexTypeSpecification(self):
+        lb = self._expect("IDENTIFIER")
+        self._expect("OP_RANGE")
+        hb = self._expect("IDENTIFIER")
+        self._expect("COLON")
+        name = self._expect("IDENTIFIER")
+
+        # As on p_indexTypeSpecification, the end is taken from the name (a string).
+        return ast.IndexTypeSpecificationNode(lb.value, hb.value, name.value) \
+            .setStartTokenPos(lb.pos).setEndTokenPos(name.value.pos)
+    #endregion ------- Section R11.3.1 -------
+
+    #region ------- Section R11.3.2 -------
+    def _actualParameterList(self):
+        start = self._expect("LPAREN")
+        params = [self._expression()]
+        while (self._accept("COMMA")): params.append(self._expression())
+        end = self._expect("RPAREN")
+
+        return ast.ActualParameterListNode(params).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+    #endregion ------- Section R11.3.2 -------
+    #endregion ============== Section 11 ==============
+
+    #region ============== Section R7 ==============
+    def _variable(self):
+        t = self._expect("IDENTIFIER")
+        var = ast.EntireVariableNode(t.value).setTokenPos(t.pos)
+
+        while (True):
+            match (self._peekType()):
+                case "LSBRACKET":
+                    self._next()
+                    var.setStaticType(ast.VariableStaticType.VARIABLE_ST_ARRAY)
+                    lbindex = self._expression().setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
+
+                    comma = self._accept("COMMA")
+                    if (comma != None):
+                        hbindex = self._expression().setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
+                        end = self._expect("RSBRACKET")
+                        hbindex.setStartTokenPos(comma.pos).setEndTokenPos(end.pos)
+                        var = ast.IndexedVariableNode(var, lbindex, hbindex) \
+                            .setStartTokenPos(var.pos).setEndTokenPos(hbindex.pos)
+                    else:
+                        end = self._expect("RSBRACKET")
+                        var = ast.IndexedVariableNode(var, lbindex, None).setStartTokenPos(var.pos).setEndTokenPos(end.pos)
+                case "DOT":
+                    self._next()
+                    t = self._expect("IDENTIFIER")
+                    var = ast.FieldDesignatorNode(var, ast.IdentifierNode(t.value).setTokenPos(t.pos)) \
+                        .setStartTokenPos(var.pos).setEndTokenPos(t.pos)
+                case "OP_UPARROW":
+                    t = self._next()
+                    var = ast.IdentifiedVariableNode(var).setStartTokenPos(var.pos).setEndTokenPos(t.pos)
+                case _:
+                    return var
+    #endregion ============== Section R7 ==============
+
+    #region ============== Section R8 ==============
+    def _expression(self, mbp = 0, signed = True):
+        """
+            Parses an expression through Pratt's algorithm, consuming operators that bind at least as tight as mbp. If
+            signed is not set, the expression can't start with a sign (e.g. the operand of a sign).
+        """
+        tok = self._peekToken()
+        if (tok == None): self._fail()
+
+        prec = OPERATOR_PRECEDENCE.get(tok.type)
+        if (prec != None):
+            # Signs (see OPERATOR_PRECEDENCE) are the only prefix operators.
+            if (not signed or prec[OPP_NUD] == -1 or mbp > prec[OPP_NUD]): self._fail()
+            self._next()
+
+            # As on p_simpleExpression, the sign wraps the whole simple expression body in an unary expression.
+            sign = ast.OpNode(prec[OPP_KIND]).setTokenPos(tok.pos)
+            body = self._expression(prec[OPP_NUD], False)
+            lhs = ast.ExpressionNode(None, sign, body).setKind(ast.ExpressionKind.EXP_UNARY) \
+                .setStartTokenPos(sign.pos).setEndTokenPos(body.pos)
+        else:
+            lhs = self._factor()
+
+        while (True):
+            tok = self._peekToken()
+            if (tok == None): break
+
+            prec = OPERATOR_PRECEDENCE.get(tok.type)
+            if (prec == None or prec[OPP_LED] < mbp): break
+            self._next()
+
+            op = ast.OpNode(prec[OPP_KIND]).setTokenPos(tok.pos)
+            rhs = self._expression(prec[OPP_RID])
+            lhs = ast.ExpressionNode(lhs, op, rhs).setStartTokenPos(lhs.pos).setEndTokenPos(rhs.pos)
+
+            # Relational operators don't associate.
+            if (prec[OPP_LED] == RELATIONAL_LED): mbp = RELATIONAL_LED + 1
+
+        return lhs
+
+    def _factor(self):
+        t = self._peekToken()
+        if (t == None): self._fail()
+
+        match (t.type):
+            case "UNSIGNED_REAL" | "UNSIGNED_INTEGER":
+                self._next()
+                return ast.ExpressionLikeNode(ast.UnsignedConstantNode(
+                    ast.NumberNode(t.value, ast.NumberKind[t.type]).setTokenPos(t.pos)
+                ))
+            case "STRING":
+                self._next()
+                return ast.ExpressionLikeNode(ast.UnsignedConstantNode(ast.StringNode(t.value).setTokenPos(t.pos)))
+            case "KW_NIL":
+                self._next()
+                return ast.ExpressionLikeNode(ast.UnsignedConstantNode(
+                    ast.SpecialSymbolNode(ast.SpecialSymbolKind.SS_NIL).setTokenPos(t.pos)
+                ))
+            case "LSBRACKET":
+                return self._setConstructor()
+            case "IDENTIFIER":
+                var = self._variable()
+                if (self._peekType() != "LPAREN"): return ast.ExpressionLikeNode(var).setTokenPos(var.pos)
+
+                if (not var.ist(ast.EntireVariableNode)): raise SyntaxError()
+                params = self._actualParameterList()
+                return ast.FunctionDesignatorNode(var.toIdentifierNode(), params) \
+                    .setStartTokenPos(var.pos).setEndTokenPos(params.pos)
+            case "KW_NOT":
+                # As on p_factor, the operator is dropped.
+                self._next()
+                return self._factor()
+            case "LPAREN":
+                self._next()
+                e = self._expression()
+                self._expect("RPAREN")
+                return e
+            case _:
+                self._fail()
+
+    #region ------- Set Constructor -------
+    def _setConstructor(self):
+        start = self._expect("LSBRACKET")
+
+        elements = None
+        if (self._peekType() != "RSBRACKET"):
+            elements = [self._elementDescription()]
+            while (self._accept("COMMA")): elements.append(self._elementDescription())
+        end = self._expect("RSBRACKET")
+
+        return ast.SetConstructorNode(elements).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _elementDescription(self):
+        lb = self._expression().setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
+        hb = self._expression() if self._accept("OP_RANGE") else None
+
+        node = ast.ElementDescriptionNode(lb, hb).setStartTokenPos(lb.pos)
+        if (hb != None): node.setEndTokenPos(hb.pos)
+
+        return node
+    #endregion ------- Set Constructor -------
+    #endregion ============== Section R8 ==============
+
+    #region ============== Section R9 ==============
+    def _compoundStatement(self):
+        start = self._expect("KW_BEGIN")
+        statements = self._statementSequence()
+        end = self._expect("KW_END")
+
+        # As on p_compoundStatement, only a trailing empty statement is removed.
+        if (statements[-1] == None): statements.pop()
+        return ast.CompoundStatementNode(statements).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _statementSequence(self):
+        statements = [self._statement()]
+        while (self._accept("SEMICOLON")): statements.append(self._statement())
+
+        return statements
+
+    def _statement(self):
+        label = None
+        if (self._peekType() == "UNSIGNED_INTEGER"):
+            label = self._next()
+            self._expect("COLON")
+
+        node = self._statementBody()
+        if (node != None and label != None):
+            node.setLabel(ast.NumberNode(label.value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(label.pos))
+
+        return node
+
+    def _nestedStatement(self):
+        # A statement nested in another one ends the node it is nested in, so it can't be missing, which the grammar 
+        #   rules reject on the token that follows it (or crash on, for the tokens that may follow an empty statement). 
+        node = self._statement()
+        if (node == None): self._fail()
+
+        return node
+
+    def _statementBody(self):
+        match (self._peekType()):
+            case "IDENTIFIER":
+                if (self._peekType(1) in ASSIGNMENT_HEAD_FOLLOW): return self._assignmentStatement()
+                return self._procedureStatement()
+            case "KW_GOTO": return self._gotoStatement()
+            case "KW_BEGIN": return self._compoundStatement()
+            case "KW_IF": return self._ifStatement()
+            case "KW_CASE": return self._caseStatement()
+            case "KW_WHILE": return self._whileStatement()
+            case "KW_REPEAT": return self._repeatStatement()
+            case "KW_FOR": return self._forStatement()
+            case "KW_WITH": return self._withStatement()
+            case _: return None
+
+    #region -------------- Section 9.1 --------------
+    def _assignmentStatement(self):
+        key = self._variable()
+        self._expect("OP_ASSIGN")
+        value = self._expression()
+
+        return ast.AssignmentStatementNode(key, value).setStartTokenPos(key.pos).setEndTokenPos(value.pos)
+
+    def _procedureStatement(self):
+        t = self._expect("IDENTIFIER")
+        params = self._actualParameterList() if self._peekType() == "LPAREN" else None
+
+        node = ast.ProcedureStatementNode(ast.IdentifierNode(t.value).setTokenPos(t.pos), params).setStartTokenPos(t.pos)
+        if (params != None): node.setEndTokenPos(params.pos)
+
+        return node
+
+    def _gotoStatement(self):
+        start = self._expect("KW_GOTO")
+        t = self._expect("UNSIGNED_INTEGER")
+
+        return ast.GotoStatementNode(ast.NumberNode(t.value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(t.pos)) \
+            .setStartTokenPos(start.pos).setEndTokenPos(t.pos)
+    #endregion -------------- Section 9.1 --------------
+
+    #region -------------- Section 9.2 --------------
+    def _ifStatement(self):
+        start = self._expect("KW_IF")
+        cond = self._expression().setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN)
+        self._expect("KW_THEN")
+        # The statement before an else may be empty, as the node then ends on the else statement.
+        ifStmt = self._statement() if self._peekType() != "KW_ELSE" else None
+
+        # The else is bound to the closest if, as the matched and unmatched statements of the grammar do.
+        if (self._accept("KW_ELSE")):
+            elseStmt = self._nestedStatement()
+            return ast.ConditionalStatementNode(cond, ifStmt, elseStmt) \
+                .setStartTokenPos(start.pos).setEndTokenPos(elseStmt.pos)
+
+        if (ifStmt == None): self._fail()
+        return ast.ConditionalStatementNode(cond, ifStmt, None).setStartTokenPos(start.pos).setEndTokenPos(ifStmt.pos)
+
+    def _caseStatement(self):
+        start = self._expect("KW_CASE")
+        index = self._expression().setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
+        self._expect("KW_OF")
+
+        cases = [self._case()]
+        while (self._peekType() == "SEMICOLON" and self._peekType(1) != "KW_END"):
+            self._next()
+            cases.append(self._case())
+        self._accept("SEMICOLON")
+        end = self._expect("KW_END")
+
+        return ast.CaseStatementNode(index, cases).setStartTokenPos(start.pos).setEndTokenPos(end.pos)
+
+    def _case(self):
+        heading = [self._constElem()]
+        while (self._accept("COMMA")): heading.append(self._constElem())
+        self._expect("COLON")
+        body = self._nestedStatement()
+
+        return ast.CaseNode(heading, body).setStartTokenPos(heading[0].pos).setEndTokenPos(body.pos)
+
+    def _whileStatement(self):
+        start = self._expect("KW_WHILE")
+        cond = self._expression().setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN)
+        self._expect("KW_DO")
+        body = self._nestedStatement()
+
+        return ast.WhileStatementNode(cond, body).setStartTokenPos(start.pos).setEndTokenPos(body.pos)
+
+    def _repeatStatement(self):
+        start = self._expect("KW_REPEAT")
+        statements = self._statementSequence()
+        self._expect("KW_UNTIL")
+        cond = self._expression().setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN)
+
+        if (statements[-1] == None): statements.pop()
+        return ast.RepeatStatementNode(cond, statements).setStartTokenPos(start.pos).setEndTokenPos(cond.pos)
+
+    def _forStatement(self):
+        start = self._expect("KW_FOR")
+        t = self._expect("IDENTIFIER")
+        self._expect("OP_ASSIGN")
+        initial = self._expression().setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
+
+        mode = self._peekToken()
+        if (mode == None or (mode.type != "KW_TO" and mode.type != "KW_DOWNTO")): self._fail()
+        self._next()
+
+        final = self._expression().setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
+        self._expect("KW_DO")
+        body = self._statement()
+
+        # As on p_forStatement, the end is taken from the traversal mode keyword.
+        return ast.ForStatementNode(
+            ast.IdentifierNode(t.value).setTokenPos(t.pos),
+            initial,
+            ast.ForTraversalMode.fromKeyword(mode.type),
+            final,
+            body
+        ).setStartTokenPos(start.pos).setEndTokenPos(mode.pos)
+
+    def _withStatement(self):
+        start = self._expect("KW_WITH")
+        recVars = [self._variable().setStaticType(ast.VariableStaticType.VARIABLE_ST_RECORD)]
+        while (self._accept("COMMA")):
+            recVars.append(self._variable().setStaticType(ast.VariableStaticType.VARIABLE_ST_RECORD))
+        self._expect("KW_DO")
+        body = self._nestedStatement()
+
+        return ast.WithStatementNode(recVars, body).setStartTokenPos(start.pos).setEndTokenPos(body.pos)
+    #endregion -------------- Section 9.2 --------------
+    #endregion ============== Section R9 ==============
+
+def newDescentParser(l: PascalLexer = None, sink: DiagnosticSink = None):
+    return PascalDescentParser(l, sink)
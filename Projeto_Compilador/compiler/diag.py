@@ -1,4 +1,14 @@
-from enum import Enum, auto
+import sys
+from enum import Enum, IntEnum, auto
+
+def callerLocation(depth = 1) -> str:
+    """
+        Gets the location ("file:line") of the caller of the function calling this one, or of a caller further up the
+        stack with a larger depth. Only meant for debug output, as it walks the frames directly instead of building 
+        the whole stack (and reading the source files) like inspect.stack does.
+    """
+    frame = sys._getframe(depth + 1)
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
 
 class DiagnosticSource(Enum):
     LEXER   = auto(),
@@ -30,6 +40,7 @@ class DiagnosticType(Enum):
     MALTERMINATED_TYPE = auto(),
     RECORD_NO_FIXED_PART = auto(),
     INVALID_VARIABLE = auto(),
+    RECOVERY_BUDGET_EXCEEDED = auto(),
     #endregion -------------- Syntatic Diagnostics --------------
 
     #region -------------- Semantic Diagnostics --------------
@@ -74,6 +85,7 @@ DIAGNOSTIC_MESSAGES = {
     DiagnosticType.MALTERMINATED_TYPE: "Type terminated with unknown separator. Expected '{expected}', got '{actual}'.",
     DiagnosticType.RECORD_NO_FIXED_PART: "Record must have a fixed part before a variant part.",
     DiagnosticType.INVALID_VARIABLE: "Invalid variable: {value}",
+    DiagnosticType.RECOVERY_BUDGET_EXCEEDED: "Error recovery budget exceeded ({budget} = {limit}). Parsing aborted.",
     #endregion -------------- Syntatic Diagnostics --------------
 
     #region -------------- Semantic Diagnostics --------------
@@ -169,4 +181,58 @@ class Diagnostic:
         if (doEmitPos): ret += f"[{self.startPos[1]}:{self.startPos[2]} - {self.endPos[1]}:{self.endPos[2]}] "
         ret += self.msgTemplate.format(**self.args)
 
-        return ret
\ No newline at end of file
+        return ret
+
+#region -------------- Diagnostic Sinks --------------
+class LogLevel(IntEnum):
+    SILENT = 0
+    ERROR = 1
+    WARN = 2
+    INFO = 3
+    TRACE = 4
+
+DIAGNOSTIC_LOG_LEVELS = {
+    DiagnosticKind.INFO: LogLevel.INFO,
+    DiagnosticKind.WARN: LogLevel.WARN,
+    DiagnosticKind.ERROR: LogLevel.ERROR,
+    DiagnosticKind.CRITICAL: LogLevel.ERROR
+}
+
+DIAGNOSTIC_COLORS = {
+    DiagnosticKind.INFO: "\x1b[34m",
+    DiagnosticKind.WARN: "\x1b[33m",
+    DiagnosticKind.ERROR: "\x1b[31m",
+    DiagnosticKind.CRITICAL: "\x1b[41;97m"
+}
+
+class DiagnosticSink:
+    """
+    Receives the output of a compiler stage (it's diagnostics as they are emitted, and it's internal traces), and writes
+    whatever is within it's log level to a stream (STDOUT by default). 
+    
+    Sinks are silent by default: the diagnostics are always kept by the stage that emitted them, so printing them is 
+    only useful while debugging, and formatting them costs as much as emitting them. Nothing is formatted unless it is
+    going to be written.
+    """
+    def __init__(self, level: LogLevel = LogLevel.SILENT, stream = None):
+        self.level = level
+        self.stream = stream
+
+    def enabled(self, level: LogLevel) -> bool:
+        return level <= self.level
+
+    def diagnostic(self, diag: Diagnostic, l, label: str):
+        """
+            Writes a diagnostic as "<label>: <message>", colored by it's kind. The lexer l is used to format it (see 
+            Diagnostic.toString).
+        """
+        if (DIAGNOSTIC_LOG_LEVELS[diag.kind] > self.level): return
+
+        print(
+            f"{DIAGNOSTIC_COLORS[diag.kind]}{label}:\x1b[0m {diag.toString(l, emitMark = False, emitPos = False)}",
+            file = self.stream or sys.stdout
+        )
+
+    def trace(self, *args):
+        if (self.level >= LogLevel.TRACE): print(*args, file = self.stream or sys.stdout)
+#endregion -------------- Diagnostic Sinks --------------
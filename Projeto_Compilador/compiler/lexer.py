@@ -1,48 +1,60 @@
+import os
+import re
+import sys
+import time
+import mmap
+import importlib.util
 from ply import lex
+from bisect import bisect_left, bisect_right
 from enum import Enum, auto
 from typing import Callable
-from util.classUtil import externalinstancemethod
+from concurrent.futures import ProcessPoolExecutor
 from .diag import Diagnostic, DiagnosticType, DiagnosticKind, DiagnosticSource
+from . import tablecache
 
 # Section 1.B 
 #region ------- Keywords -------
-# reserved = {
-#     "and": "KW_AND",
-#     "array": "KW_ARRAY",
-#     "begin": "KW_BEGIN",
-#     "case": "KW_CASE",
-#     "const": "KW_CONST",
-#     "div": "KW_DIV",
-#     "do": "KW_DO",
-#     "downto": "KW_DOWNTO",
-#     "else": "KW_ELSE",
-#     "end": "KW_END",
-#     "file": "KW_FILE",
-#     "for": "KW_FOR",
-#     "function": "KW_FUNCTION",
-#     "goto": "KW_GOTO",
-#     "if": "KW_IF",
-#     "in": "KW_IN",
-#     "label": "KW_LABEL",
-#     "mod": "KW_MOD",
-#     "nil": "KW_NIL",
-#     "not": "KW_NOT",
-#     "of": "KW_OF",
-#     "or": "KW_OR",
-#     "packed": "KW_PACKED",
-#     "procedure": "KW_PROCEDURE",
-#     "program": "KW_PROGRAM",
-#     "record": "KW_RECORD",
-#     "repeat": "KW_REPEAT",
-#     "set": "KW_SET",
-#     "then": "KW_THEN",
-#     "to": "KW_TO",
-#     "type": "KW_TYPE",
-#     "until": "KW_UNTIL",
-#     "var": "KW_VAR",
-#     "while": "KW_WHILE",
-#     "with": "KW_WITH",
-# }
+# Reserved words are not matched by their own rules. Instead, they are captured by the IDENTIFIER rule and classified
+#   through this table, which avoids trying every keyword pattern before every identifier.
+# Keys MUST be lowercase, as Pascal keywords are case-insensitive (Section 1.B) and lookups are done on the lowercased 
+#   identifier.
+reserved = {
+    "and": "KW_AND",
+    "array": "KW_ARRAY",
+    "begin": "KW_BEGIN",
+    "case": "KW_CASE",
+    "const": "KW_CONST",
+    "div": "KW_DIV",
+    "do": "KW_DO",
+    "downto": "KW_DOWNTO",
+    "else": "KW_ELSE",
+    "end": "KW_END",
+    "file": "KW_FILE",
+    "for": "KW_FOR",
+    "function": "KW_FUNCTION",
+    "goto": "KW_GOTO",
+    "if": "KW_IF",
+    "in": "KW_IN",
+    "label": "KW_LABEL",
+    "mod": "KW_MOD",
+    "nil": "KW_NIL",
+    "not": "KW_NOT",
+    "of": "KW_OF",
+    "or": "KW_OR",
+    "packed": "KW_PACKED",
+    "procedure": "KW_PROCEDURE",
+    "program": "KW_PROGRAM",
+    "record": "KW_RECORD",
+    "repeat": "KW_REPEAT",
+    "set": "KW_SET",
+    "then": "KW_THEN",
+    "to": "KW_TO",
+    "type": "KW_TYPE",
+    "until": "KW_UNTIL",
+    "var": "KW_VAR",
+    "while": "KW_WHILE",
+    "with": "KW_WITH",
+}
 #endregion ------- Keywords -------
 
 tokens = [
@@ -122,7 +134,7 @@ tokens = [
     # "SIGNED_REAL",
     # "SIGNED_INTEGER",
     
-    "IDENTIFIER", # Section 1.C; Shadows Directive and possibly Label
+    "IDENTIFIER", # Section 1.C; Shadows Directive and possibly Label; Captures keywords, see reserved
     "STRING", # Section 1.E
 
     #  Section 1.A
@@ -135,7 +147,6 @@ tokens = [
     "COMMENT_BODY",
     #endregion ------- Comment State -------
 ]
-#  + list(reserved.values())
 
 states = (
     ("comment", "exclusive"),
@@ -184,119 +195,11 @@ def t_UNSIGNED_INTEGER(t):
 #     r"[+-]?\d+"
 #     return t
 
-#region ------- Section 1.B -------
-# Reserved Keywords MUST be defined before IDENTIFIER, otherwise the later will capture all input before the former 
-# have a chance to process the input.
-def t_KW_AND(t):
-    r"and\b"
-    return t
-def t_KW_ARRAY(t):
-    r"array\b"
-    return t
-def t_KW_BEGIN(t):
-    r"begin\b"
-    return t
-def t_KW_CASE(t):
-    r"case\b"
-    return t
-def t_KW_CONST(t):
-    r"const\b"
-    return t
-def t_KW_DIV(t):
-    r"div\b"
-    return t
-def t_KW_DO(t):
-    r"do\b"
-    return t
-def t_KW_DOWNTO(t):
-    r"downto\b"
-    return t
-def t_KW_ELSE(t):
-    r"else\b"
-    return t
-def t_KW_END(t):
-    r"end\b"
-    return t
-def t_KW_FILE(t):
-    r"file\b"
-    return t
-def t_KW_FOR(t):
-    r"for\b"
-    return t
-def t_KW_FUNCTION(t):
-    r"function\b"
-    return t
-def t_KW_GOTO(t):
-    r"goto\b"
-    return t
-def t_KW_IF(t):
-    r"if\b"
-    return t
-def t_KW_IN(t):
-    r"in\b"
-    return t
-def t_KW_LABEL(t):
-    r"label\b"
-    return t
-def t_KW_MOD(t):
-    r"mod\b"
-    return t
-def t_KW_NIL(t):
-    r"nil\b"
-    return t
-def t_KW_NOT(t):
-    r"not\b"
-    return t
-def t_KW_OF(t):
-    r"of\b"
-    return t
-def t_KW_OR(t):
-    r"or\b"
-    return t
-def t_KW_PACKED(t):
-    r"packed\b"
-    return t
-def t_KW_PROCEDURE(t):
-    r"procedure\b"
-    return t
-def t_KW_PROGRAM(t):
-    r"program\b"
-    return t
-def t_KW_RECORD(t):
-    r"record\b"
-    return t
-def t_KW_REPEAT(t):
-    r"repeat\b"
-    return t
-def t_KW_SET(t):
-    r"set\b"
-    return t
-def t_KW_THEN(t):
-    r"then\b"
-    return t
-def t_KW_TO(t):
-    r"to\b"
-    return t
-def t_KW_TYPE(t):
-    r"type\b"
-    return t
-def t_KW_UNTIL(t):
-    r"until\b"
-    return t
-def t_KW_VAR(t):
-    r"var\b"
-    return t
-def t_KW_WHILE(t):
-    r"while\b"
-    return t
-def t_KW_WITH(t):
-    r"with\b"
-    return t
-#region ------- Section 1.B -------
-
 def t_IDENTIFIER(t): # Section 1.C
     r"[a-zA-Z0-9]+"
-    # t.type = reserved.get(t.value, "IDENTIFIER")
+    t.type = reserved.get(t.value.lower(), "IDENTIFIER")
+    # Identifiers are interned, as the same few names are repeated throughout the source text (and the AST).
+    if (t.type == "IDENTIFIER"): t.value = sys.intern(t.value)
     return t
 
 # Section 1.E
@@ -318,16 +221,15 @@ def t_SEP(t):
     #   Contiguous separators are collapsed under a single token. If there is a need to process which separators were
     #     captured, one should look at the value of the token.
 
-    # for c in t.value:
+    # Only the newlines are of interest here, so jump straight to them instead of walking every separator character.
     tvlen = len(t.value)
-    for i in range(0, tvlen):
-        c = t.value[i]
-        if (c == "\n"):
-            offset = t.lexer.lexpos - (tvlen - i)
-            # print("NEWLINE", t.lexer.lineno, t.lexer.lexpos, offset, t.lexer._lastLineLexPos)
-            t.lexer.lineno += 1
-            t.lexer.lineLens.append(offset - t.lexer._lastLineLexPos)
-            t.lexer._lastLineLexPos = offset
+    i = t.value.find("\n")
+    while (i != -1):
+        offset = t.lexer.abspos - (tvlen - i)
+        t.lexer.lineno += 1
+        pushLineLen(t.lexer, offset - t.lexer._lastLineLexPos)
+        t.lexer._lastLineLexPos = offset
+        i = t.value.find("\n", i + 1)
 
     return t
 
@@ -349,21 +251,66 @@ class CommentBraceKind(Enum):
 
 # This rule stores metadata required during comment processing, which is cleaned up after the comment is closed:
 #   - _braceKind: Indicates which Comment Brace Kind initiated the comment. Used only for diagnostics.
-#   - _commentPos: Indicates the position at which the comment started. Used to retroactively recalculate the 
+#   - _commentPos: Indicates the position at which the comment body starts. Used to retroactively recalculate the 
 # line positions on the lexer (see lexer.lineLens).
+#   - _commentEnd: Indicates the position (on lexer.lexdata) at which the comment body ends, which is either the first
+# closing delimiter or the end of the input.
+# The comment body is never matched by a rule. Instead, this rule jumps straight to the first closing delimiter of 
+#   either kind (see Section 4) and leaves it to be matched by t_comment_RBRACE, so large comments cost no more than a 
+#   search for it's delimiters.
 # This rule changes the lexer state to "comment".
 def t_LBRACE(t):
     r"\{|(?:\(\*)"
     t.lexer._braceKind = CommentBraceKind.getKind(t.value)
-    t.lexer._commentPos = t.lexer.lexpos
+    t.lexer._commentPos = t.lexer.abspos
+    t.lexer._commentEnd = findCommentEnd(t.lexer, t.lexer.lexpos)
+    t.lexer.lexpos = t.lexer._commentEnd
     t.lexer.begin("comment")
     # return t
 
-# The comment body is kept purely for internal usage, to calculate the line metadata retroactively. 
-# It is not possible to access the comment body data beyond lextime.
-def t_comment_COMMENT_BODY(t): # Section 1.A
-    r"(?!(?:\*\))|})[\s\S]+?(?=\*\)|}|$)"
-    t.lexer._commentBody = t.value
+def findCommentEnd(l, start):
+    """
+        Finds the first closing comment delimiter on the input at or after start, or the end of the input if there is
+        none. 
+        The position found for each delimiter is cached on the lexer until the input changes, as it remains the first 
+        one for every comment started before it. This keeps inputs with many comments of a single kind from being 
+        searched to the end for the other kind on every comment.
+    """
+    end = len(l.lexdata)
+    for delim in ("}", "*)"):
+        pos = l._delimCache.get(delim)
+        if (pos == None or (pos != -1 and pos < start)):
+            pos = l.lexdata.find(delim, start)
+            l._delimCache[delim] = pos
+
+        if (pos != -1 and pos < end): end = pos
+
+    return end
+
+def commentLineEnds(l):
+    """
+        Gets the global positions of the newlines within the comment body.
+    """
+    start = l._commentPos - l.lexbase
+    if (l.lexdata.count("\n", start, l._commentEnd) == 0): return []
+
+    ends = []
+    i = l.lexdata.find("\n", start, l._commentEnd)
+    while (i != -1):
+        ends.append(l.lexbase + i)
+        i = l.lexdata.find("\n", i + 1, l._commentEnd)
+
+    return ends
+
+def pushCommentLines(l, ends):
+    """
+        Records the lines ending at each of the given global positions, all within a single comment.
+    """
+    # The first line probably started before the comment. Handle it.
+    lengths = [ends[0] + 1 - l._lastLineLexPos]
+    lengths.extend(ends[i] - ends[i - 1] for i in range(1, len(ends)))
+    extendLineLens(l, lengths)
+    l._lastLineLexPos = ends[-1] + 1
 
 # This rule closes the comment and retroactively calculates the lengths of the lines within the comment body.
 # Additionally, a diagnostic for mismatched comment delimiters is also evaluated here.
@@ -371,25 +318,12 @@ def t_comment_COMMENT_BODY(t): # Section 1.A
 def t_comment_RBRACE(t):
     r"\}|(?:\*\))"
 
-    cbLines = t.lexer._commentBody.split("\n")
-
-    # If comment spans multiple lines, process them. Otherwise just advance the character counter.
-    if (len(cbLines) != 1):
-        for i in range(0, len(cbLines)):
-            if (i == 0): # Comment probably started not at the beginning of the line. Handle it.
-                t.lexer.lineLens.append(len(cbLines[i]) + (t.lexer._commentPos - t.lexer._lastLineLexPos) + 1)
-                t.lexer._lastLineLexPos = t.lexer._commentPos + len(cbLines[i]) + 1
-            elif (i == len(cbLines) - 1):
-                # Early break. Let the t_ANY_NEWLINE rule handle the line.
-                break
-            else:
-                t.lexer.lineLens.append(len(cbLines[i]) + 1)
-                t.lexer._lastLineLexPos = t.lexer._lastLineLexPos + len(cbLines[i]) + 1
-            
-        t.lexer.lineno += len(cbLines) - 1
+    # If comment spans multiple lines, process them. The line the comment ends on is left for the next newline.
+    ends = commentLineEnds(t.lexer)
+    if (len(ends) != 0):
+        pushCommentLines(t.lexer, ends)
+        t.lexer.lineno += len(ends)
         t.lexer._lastLineLexPos += len(t.value) - 1
-    else:
-        t.lexer._lastLineLexPos = t.lexer._lastLineLexPos
 
     # According to Section 4, the definition of a comment defines that a comment is valid, even if it's delimiters
     #  are mismatched. For diagnostic purposes, mismatches are caught and reported, but do not halt.
@@ -402,7 +336,7 @@ def t_comment_RBRACE(t):
 
     t.lexer._braceKind = None
     t.lexer._commentPos = None
-    t.lexer._commentBody = None
+    t.lexer._commentEnd = None
     t.lexer.begin("INITIAL")
 
 # This rule triggers if a comment was opened, but never closed. When it is triggered, it will retroactively calculate
@@ -411,18 +345,13 @@ def t_comment_RBRACE(t):
 # While this rule will emit an ERROR diagnostic, it is not a fatal error and the next phase can still attempt to process
 #   the token stream without prejudice, as there might be a valid program before the comment.
 def t_comment_eof(t):
-    # Process caught lines for diagnostic
-    cbLines = t.lexer._commentBody.split("\n")
-    for i in range(0, len(cbLines)):
-        if (i == 0): # Comment probably started not at the beginning of the line. Handle it.
-            t.lexer.lineLens.append(len(cbLines[i]) + (t.lexer._commentPos - t.lexer._lastLineLexPos) + 1)
-            t.lexer._lastLineLexPos = t.lexer._commentPos + len(cbLines[i]) + 1
-        else:
-            t.lexer.lineLens.append(len(cbLines[i]) + 1)
-            t.lexer._lastLineLexPos = t.lexer._lastLineLexPos + len(cbLines[i]) + 1
+    # Process caught lines for diagnostic. The last line of the body is processed as if it ended on a newline.
+    ends = commentLineEnds(t.lexer)
+    ends.append(t.lexer.lexbase + t.lexer._commentEnd)
+    pushCommentLines(t.lexer, ends)
 
-    t.lexer.lineLens[-1] = t.lexer.lineLens[-1] + len(t.value)
-    t.lexer.lineno += len(cbLines)
+    growLastLineLen(t.lexer, len(t.value))
+    t.lexer.lineno += len(ends)
     t.lexer._lastLineLexPos += len(t.value)
     comment_error(t.lexer, DiagnosticType.NONTERMINATED_COMMENT, {})
 
@@ -432,7 +361,7 @@ def t_comment_error(t):
     if (t.lexer.options["printDiags"]): 
     # if True:
         print(
-            f"\x1b[31mLEXICAL ERROR #comment @{t.lexer.lexpos}:\x1b[0m " \
+            f"\x1b[31mLEXICAL ERROR #comment @{t.lexer.abspos}:\x1b[0m " \
             f"{diag.toString(t.lexer, emitMark = False, emitPos = False)}"
         )
     t.lexer.skip(1)
@@ -444,7 +373,7 @@ def comment_warn(l, dType, dArgs = {}):
             DiagnosticKind.WARN, 
             dArgs,
             l._commentPos,
-            l.lexpos
+            l.abspos
     )
     if (l.options["printDiags"]): 
     # if True:
@@ -457,7 +386,7 @@ def comment_error(l, dType, dArgs = {}):
             DiagnosticKind.ERROR, 
             dArgs,
             l._commentPos,
-            l.lexpos
+            l.abspos
     )
     if (l.options["printDiags"]): 
     # if True:
@@ -469,7 +398,7 @@ def t_error(t):
     diag = emitDiagnostic(t.lexer, DiagnosticType.UNEXPECTED_CHARACTER, DiagnosticKind.ERROR, { "character": repr(t.value[0]) })
     if (t.lexer.options["printDiags"]): 
         print(
-            f"\x1b[31mLEXICAL ERROR @{t.lexer.lexpos}:\x1b[0m {diag.toString(t.lexer, emitMark = False, emitPos = False)}"
+            f"\x1b[31mLEXICAL ERROR @{t.lexer.abspos}:\x1b[0m {diag.toString(t.lexer, emitMark = False, emitPos = False)}"
         )
     t.lexer.skip(1)
 
@@ -483,8 +412,8 @@ def emitDiagnostic(
     dStartPos: int = None, 
     dEndPos: int = None
 ):
-    tStartPos = dStartPos if (dStartPos != None) else l.lexpos
-    tEndPos = dEndPos if (dEndPos != None) else l.lexpos
+    tStartPos = dStartPos if (dStartPos != None) else l.abspos
+    tEndPos = dEndPos if (dEndPos != None) else l.abspos
     rcStartPos = posToRowCol(l, tStartPos)
     rcEndPos = posToRowCol(l, tEndPos)
 
@@ -495,18 +424,182 @@ def emitDiagnostic(
 #endregion ------- Diagnostics -------
 
 #region ------- Lexer Utils -------
+class LineIndex:
+    """
+    Prefix-sum index over the line lengths recorded on lexer.lineLens, used to resolve a global position offset to 
+    it's line in O(log n) instead of walking every line from the start of the source text.
+
+    Line lengths are not guaranteed to be positive (the final line pushed by lexer.finish after a non-terminated 
+    comment is negative), so the prefix sums are not necessarily sorted. The search is therefore done over the running 
+    maximum of the prefix sums, which yields the same line as a linear scan for the first prefix sum >= pos.
+    """
+    def __init__(self):
+        self.ends = []    # ends[i] = sum(lineLens[0..i])
+        self._bounds = [] # _bounds[i] = max(ends[0..i])
+
+    def push(self, length):
+        end = (self.ends[-1] if len(self.ends) != 0 else 0) + length
+        self.ends.append(end)
+        self._bounds.append(end if len(self._bounds) == 0 else max(self._bounds[-1], end))
+
+    def extend(self, lengths):
+        end = self.ends[-1] if len(self.ends) != 0 else 0
+        bound = self._bounds[-1] if len(self._bounds) != 0 else None
+        for length in lengths:
+            end += length
+            bound = end if bound == None else max(bound, end)
+            self.ends.append(end)
+            self._bounds.append(bound)
+
+    def growLast(self, delta):
+        self.ends[-1] += delta
+        self._bounds[-1] = self.ends[-1] if len(self._bounds) == 1 else max(self._bounds[-2], self.ends[-1])
+
+    def truncate(self, lineCount):
+        del self.ends[lineCount:]
+        del self._bounds[lineCount:]
+
+    def find(self, pos, lineCount = None):
+        """
+            Returns a tuple (i, acc), where i is the 0-indexed line containing pos and acc is the global offset at which 
+            that line starts, or None if pos lies beyond every recorded line.
+            If lineCount is given, only the first lineCount recorded lines are considered.
+        """
+        hi = len(self._bounds) if lineCount == None else lineCount
+        i = bisect_left(self._bounds, pos, 0, hi)
+        if (i == hi): return None
+        return (i, self.ends[i - 1] if i != 0 else 0)
+
+    def toRowCol(self, pos, lineCount, lineno, lastLineLexPos):
+        """
+            Converts a global position offset on the source text to a (row, column) tuple, as seen by a lexer which had 
+            recorded lineCount lines and was on line lineno, starting at lastLineLexPos.
+        """
+        found = self.find(pos, lineCount)
+
+        # If position is not on any of the previously recorded lines, it is on the current line. The line length hasn't
+        #   been pushed to the lineLens list yet, so manually set it and get the position offset.
+        if (found == None):
+            return (lineno, pos - lastLineLexPos)
+        else:
+            (i, acc) = found
+            return (i + 1, pos - acc)
+
+class PascalToken:
+    """
+    Compact token, as handed to the parser by PascalLexer#getExtendedToken. Unlike PLY's LexToken, it has a fixed set 
+    of attributes (including it's position, see TokenPos), so it carries no per-instance dictionary.
+    The lexer attribute is kept for PLY, which sets it on the tokens it reports errors on.
+    """
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer", "pos")
+
+    def __init__(self, type, value, lineno, lexpos, lexer = None, pos = None):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.lexer = lexer
+        self.pos = pos
+
+    # Same as LexToken, so that traces don't depend on which of them is printed.
+    def __str__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    def __repr__(self):
+        return str(self)
+
 class TokenPos:
+    """
+    Represents the location of a token on the source text.
+
+    Unless lexer.options["lazyPos"] is False, the rows and columns are only resolved when first accessed, as most 
+    positions are never read outside of diagnostics and AST serialization. The lexer line state at construction time is 
+    captured so that the resolution yields the same result regardless of how far the lexer has advanced (or whether it
+    has been reset) in the meantime.
+    """
+    __slots__ = (
+        "_startPos", "_endPos", "_lineIndex", "_lineCount", "_lineno", "_lastLineLexPos", "_startRowCol", "_endRowCol"
+    )
+
     def __init__(self, l, startPos = 0, endPos = 0):
         self._startPos = startPos
         self._endPos = endPos
-        
-        (sr, sc) = posToRowCol(l, startPos)
-        self.startRow = sr
-        self.startCol = sc
-        
-        (er, ec) = posToRowCol(l, endPos)
-        self.endRow = er
-        self.endCol = ec
+
+        self._lineIndex = l.lineIndex
+        self._lineCount = len(l.lineIndex.ends)
+        self._lineno = l.lineno
+        self._lastLineLexPos = l._lastLineLexPos
+        self._startRowCol = None
+        self._endRowCol = None
+
+        if (not l.options["lazyPos"]): self.resolve()
+
+    @classmethod
+    def fromState(cls, l, startPos, endPos, lineCount, lineno, lastLineLexPos):
+        """
+            Creates a position as seen by the given lexer, had it been on the given line state (see lexParallel).
+        """
+        pos = cls.__new__(cls)
+        pos._startPos = startPos
+        pos._endPos = endPos
+        pos._lineIndex = l.lineIndex
+        pos._lineCount = lineCount
+        pos._lineno = lineno
+        pos._lastLineLexPos = lastLineLexPos
+        pos._startRowCol = None
+        pos._endRowCol = None
+
+        if (not l.options["lazyPos"]): pos.resolve()
+        return pos
+
+    def _resolveStart(self):
+        if (self._startRowCol == None): 
+            self._startRowCol = self._lineIndex.toRowCol(
+                self._startPos, self._lineCount, self._lineno, self._lastLineLexPos
+            )
+        return self._startRowCol
+
+    def _resolveEnd(self):
+        if (self._endRowCol == None): 
+            self._endRowCol = self._lineIndex.toRowCol(self._endPos, self._lineCount, self._lineno, self._lastLineLexPos)
+        return self._endRowCol
+
+    def shift(self, delta, lineDelta):
+        """
+            Moves this position by delta characters and lineDelta lines, as done to the text after an edit of the source 
+            text (see TokenStream#edit).
+        """
+        self._startPos += delta
+        self._endPos += delta
+        self._lineCount += lineDelta
+        self._lineno += lineDelta
+        self._lastLineLexPos += delta
+        self._startRowCol = None
+        self._endRowCol = None
+
+    def resolve(self):
+        """
+            Forces the resolution of the rows and columns of this position.
+        """
+        self._resolveStart()
+        self._resolveEnd()
+        return self
+
+    def _getStartRow(self):
+        return self._resolveStart()[0]
+    startRow = property(_getStartRow)
+
+    def _getStartCol(self):
+        return self._resolveStart()[1]
+    startCol = property(_getStartCol)
+
+    def _getEndRow(self):
+        return self._resolveEnd()[0]
+    endRow = property(_getEndRow)
+
+    def _getEndCol(self):
+        return self._resolveEnd()[1]
+    endCol = property(_getEndCol)
 
     def _getstart(self):
         return (self._startPos, self.startRow, self.startCol)
@@ -523,85 +616,608 @@ def getCurLineLen(l):
     """
         Gets the length of the current line on the source text.
     """
-    return l.lexpos - l._lastLineLexPos
+    return l.abspos - l._lastLineLexPos
+
+def pushLineLen(l, length):
+    """
+        Records the length of a finished line on the lexer, keeping the line index (see lexer.lineIndex) in sync with
+        lexer.lineLens.
+    """
+    l.lineLens.append(length)
+    l.lineIndex.push(length)
+
+def extendLineLens(l, lengths):
+    """
+        Records the lengths of several finished lines at once (see pushLineLen).
+    """
+    l.lineLens.extend(lengths)
+    l.lineIndex.extend(lengths)
+
+def growLastLineLen(l, delta):
+    """
+        Adds delta to the length of the last recorded line, keeping the line index in sync with lexer.lineLens.
+    """
+    l.lineLens[-1] += delta
+    l.lineIndex.growLast(delta)
 
 def posToRowCol(l, pos):
     """
         Converts a global position offset on the source text to a (row, column) tuple.
         The row is 1-indexed, and the column is 0-indexed
     """
-    acc = 0
-    i = 0
-    found = False
-    for i in range(0, len(l.lineLens)):
-        if (acc + l.lineLens[i] >= pos): 
-            found = True
-            break
-        acc += l.lineLens[i]
-
-    # If position is not on any of the previously recorded lines, it is on the current line. The line length hasn't
-    #   been pushed to the lineLens list yet, so manually set it and get the position offset.
-    if (not found):
-        return (l.lineno, pos - l._lastLineLexPos)
-    else:
-        return (i + 1, pos - acc)
+    return l.lineIndex.toRowCol(pos, len(l.lineIndex.ends), l.lineno, l._lastLineLexPos)
 #endregion ------- Lexer Utils -------
 
 #region ------- Lexer Build -------
-lexer = lex.lex()
-lexer._lastLineLexPos = 0
-lexer.lineLens = []
-lexer.diagnostics = []
-lexer.options = {
-    "printDiags": False
-}
-lexer._peek = None
-lexer._cur = None
-lexer._lastSep = None
-
-# This function is attached to the lexer instance, and is used to finalize the lexical analysis phase.
-# It adds the last buffered line length to the lineLens property and moves the character pointer to EOF.
-# As of the time of writing this documentation, this results of this function are purely for diagnostic purposes.
-@externalinstancemethod(lexer, "finish")
-def _finish(self):
-    self.lineLens.append(self.lexpos - self._lastLineLexPos)
-    self._lastLineLexPos = self.lexpos
-
-@externalinstancemethod(lexer, "getExtendedToken")
-def _getExtendedToken(self):
-    if (self._peek): 
-        token = self._peek
+# Building the master regular expressions from the rule docstrings is the bulk of the lexer start up cost, so the built
+#   tables are cached as an optimized lextab module (see Section 4.20 of https://www.dabeaz.com/ply/ply.html and
+#   compiler.tablecache), signed with the source of this module.
+def _lextabSignature():
+    with open(os.path.realpath(__file__), "rb") as f:
+        src = f.read()
+
+    return tablecache.signature(src, lex.__tabversion__)
+
+def _loadLextab(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    tab = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(tab)
+    return tab
+
+def buildBaseLexer() -> lex.Lexer:
+    """
+        Builds the base lexer, loading it's tables from the table cache if an up-to-date table exists, or building and 
+        writing them otherwise. If the tables cannot be cached, the lexer is built from the rules every time.
+    """
+    try:
+        sig = _lextabSignature()
+    except OSError:
+        return lex.lex()
+    if (not tablecache.ensureDir()): return lex.lex()
+
+    path = tablecache.tablePath("lextab", sig, ".py")
+    if (os.path.isfile(path)):
+        try:
+            return lex.lex(optimize = 1, lextab = _loadLextab(tablecache.tableName("lextab", sig), path))
+        except Exception:
+            pass # Unreadable table (e.g. partially written). Rebuild it below.
+
+    tmpName = tablecache.tempTableName("lextab", sig)
+    tmpPath = os.path.join(tablecache.TABLES_DIR, f"{tmpName}.py")
+    base = lex.lex(optimize = 1, lextab = tmpName, outputdir = tablecache.TABLES_DIR)
+    if (os.path.isfile(tmpPath)): tablecache.commitTable(tmpPath, "lextab", sig, ".py")
+
+    return base
+
+# The base lexer holds the master regular expressions built from the rules above. It is never used to lex directly,
+#   instead, every PascalLexer instance is a clone of it, sharing the (read-only) tables but owning it's own input and
+#   state. The module-level "lexer" instance below is kept for the single-compilation drivers.
+_baseLexer = buildBaseLexer()
+
+class PascalLexer(lex.Lexer):
+    """
+    A Standard Pascal lexer. Each instance is a clone of the base PLY lexer and owns all of the state required by the 
+    rules (line metadata, diagnostics, lookahead), so separate instances can be used concurrently (e.g. one per thread).
+
+    Instances are cheap to create. Use newLexer (or PascalLexer#clone) instead of calling lex.lex() again.
+    """
+    def __init__(self, base: lex.Lexer = None):
+        # lex.Lexer#clone is a shallow copy. Everything that is mutated while lexing is re-created below, the regex 
+        #   tables are shared.
+        self.__dict__.update(lex.Lexer.clone(_baseLexer if base == None else base).__dict__)
+        self.lexstatestack = []
+        self.options = {
+            "printDiags": False,
+            "lazyPos": True
+        }
+        self.reset()
+
+    def _getAbsPos(self):
+        return self.lexbase + self.lexpos
+    abspos = property(_getAbsPos, doc = "The current position on the whole source text (see lexbase).")
+
+    def token(self):
+        # When lexing a window of the source text (see iterTokens), token positions are made global here, so that 
+        #   everything past the lexer only ever sees positions on the whole source text.
+        tok = lex.Lexer.token(self)
+        if (tok != None and self.lexbase != 0): tok.lexpos += self.lexbase
+        return tok
+
+    def clone(self, object = None):
+        """
+            Creates a new lexer sharing the tables of this one, with it's own fresh state and a copy of it's options.
+        """
+        c = PascalLexer(lex.Lexer.clone(self, object))
+        c.options = { **self.options }
+        return c
+
+    # This function is used to finalize the lexical analysis phase.
+    # It adds the last buffered line length to the lineLens property and moves the character pointer to EOF.
+    # As of the time of writing this documentation, this results of this function are purely for diagnostic purposes.
+    def finish(self):
+        pushLineLen(self, self.abspos - self._lastLineLexPos)
+        self._lastLineLexPos = self.abspos
+
+    def drain(self, deadline: float = None):
+        """
+            Lexes whatever is left of the input and finishes the lexer, so that every lexical diagnostic is collected even
+            if the consumer of the tokens stopped early (e.g. the parser aborted). Past the given deadline (on the 
+            time.perf_counter clock), the rest of the input is abandoned instead (see PascalLexer#abandon).
+        """
+        count = 0
+        while (self.getExtendedToken() != None):
+            count += 1
+            if (deadline != None and (count & 0xFF) == 0 and time.perf_counter() > deadline):
+                self.abandon()
+                return
+        self.finish()
+
+    def abandon(self):
+        """
+            Finishes the lexer without lexing whatever is left of the input, for when the consumer of the tokens gave up
+            on it (e.g. the parser ran out of it's recovery budget) and draining it would be just as costly. The lexical 
+            diagnostics past the current position are not collected, which is recorded on truncated.
+        """
+        self.truncated = self._peek != None or self.lexpos < self.lexlen
+        self.finish()
+
+    def getExtendedToken(self):
+        if (self._peek): 
+            token = self._peek
+            self._peek = None
+        else:
+            token = self.token() 
+
+        while (True):
+            if (token == None): break
+            if (token.type == "SEP"): 
+                token.pos = TokenPos(self, token.lexpos, token.lexpos + len(token.value))
+                self._lastSep = token
+                token = self.token()
+                continue
+
+            token = PascalToken(
+                token.type, 
+                token.value, 
+                token.lineno, 
+                token.lexpos, 
+                self,
+                TokenPos(self, token.lexpos, token.lexpos + len(token.value))
+            )
+            break
+
+        # print("GET FINAL:", token)
+        self._cur = token
+        return token
+
+    def peek(self):
+        if (self._peek == None): self._peek = self.token()
+        self._peek.pos = TokenPos(self, self._peek.lexpos, self._peek.lexpos + len(self._peek.value))
+        return self._peek
+
+    def input(self, s):
+        lex.Lexer.input(self, s)
+        self._delimCache = {}
+
+    def reset(self):
+        self.lineno = 1
+        self.lexpos = 0
+        self.lexbase = 0
+        self._lastLineLexPos = 0
+        self.lineLens = []
+        self.lineIndex = LineIndex()
+        self.diagnostics = []
+        self.truncated = False
         self._peek = None
+        self._cur = None
+        self._lastSep = None
+        self._delimCache = {}
+        self.begin("INITIAL")
+
+    def checkpoint(self):
+        """
+            Captures the line metadata, diagnostics and state of this lexer, which can be restored through 
+            PascalLexer#rollback. The input and position are not captured.
+        """
+        return (self.lineno, self._lastLineLexPos, len(self.lineLens), len(self.diagnostics), self.lexstate)
+
+    def rollback(self, cp):
+        """
+            Restores a checkpoint taken by PascalLexer#checkpoint, discarding every line and diagnostic recorded since.
+        """
+        (self.lineno, self._lastLineLexPos, lineCount, diagCount, state) = cp
+        del self.lineLens[lineCount:]
+        self.lineIndex.truncate(lineCount)
+        del self.diagnostics[diagCount:]
+        self.begin(state)
+
+def newLexer() -> PascalLexer:
+    """
+        Creates a new, independent lexer instance.
+    """
+    return PascalLexer()
+
+lexer = newLexer()
+#endregion ------- Lexer Build -------
+
+#region ------- Token Streaming -------
+# Source files can be lexed in windows, in order to avoid holding the whole file in memory as a string. Each window
+#   starts at a global offset (lexer.lexbase) and ends right after a newline that is followed by a non-whitespace
+#   character, so that no separator can span two windows.
+#   Comments and strings can, however, span windows. The window is then lexed again, larger, as it's tokens would differ
+#   from lexing the whole file. This is detected through the following, which can only happen on that case (or on 
+#   malformed input, where the window keeps growing until the end of the file):
+#     - The lexer is left on the comment state (i.e. the comment was closed by the end of the window).
+#     - A quote was rejected as an unexpected character (i.e. the closing quote of the string is past the window).
+#     - A string was closed by a quote followed by another quote. The STRING rule is greedy over escaped quotes, so 
+#       this only happens when it backtracked from the end of the window.
+WINDOW_SIZE = 1 << 20
+
+def tokenEnd(tok):
+    """
+        Gets the global position at which a token ends on the source text, which, unlike it's TokenPos, accounts for the
+        enclosing quotes of strings. The value of a string keeps it's escaped quotes, so it's length only lacks those.
+    """
+    return tok.lexpos + len(tok.value) + (2 if tok.type == "STRING" else 0)
+
+def _nextWindowEnd(data, start, size):
+    """
+        Finds the end of a window of at least size bytes starting at start, or the length of the data if there is none.
+    """
+    end = data.find(b"\n", start + size)
+    while (end != -1):
+        if (end + 1 >= len(data)): break
+        if (data[end + 1:end + 2] not in (b" ", b"\t", b"\n", b"\r")): return end + 1
+        end = data.find(b"\n", end + 1)
+
+    return len(data)
+
+def _windowIsExact(l, text, tokens, cp):
+    if (l.lexstate != "INITIAL"): return False
+
+    for diag in l.diagnostics[cp[3]:]:
+        if (diag.args.get("character") == repr("'")): return False
+
+    for tok in tokens:
+        if (tok.type == "STRING"):
+            end = tokenEnd(tok) - l.lexbase
+            if (text[end:end + 1] == "'"): return False
+
+    return True
+
+def _iterWindows(l, data, size):
+    start = 0
+    charBase = 0
+    while (start < len(data)):
+        end = _nextWindowEnd(data, start, size)
+
+        while (True):
+            text = str(data[start:end], "utf-8")
+            cp = l.checkpoint()
+            l.lexbase = charBase
+            l.input(text)
+
+            tokens = []
+            while ((tok := l.getExtendedToken()) != None): tokens.append(tok)
+
+            if (end == len(data) or _windowIsExact(l, text, tokens, cp)): break
+
+            l.rollback(cp)
+            end = _nextWindowEnd(data, start, (end - start) * 2)
+
+        yield from tokens
+        start = end
+        charBase += len(text)
+
+def iterTokens(source, l: PascalLexer = None, mapped = False, windowSize = WINDOW_SIZE):
+    """
+        Yields the tokens of a source text, with their positions set, as the parser receives them (see 
+        PascalLexer#getExtendedToken). Separators are not yielded.
+
+        If mapped is set, source is the path to an UTF-8 encoded source file, which is memory-mapped and lexed in 
+        windows of about windowSize bytes, so that the file is never held in memory as a whole.
+
+        The lexer used (a new one, if l is not given) is reset before lexing, and holds the lexical diagnostics and the 
+        line metadata of the source once the generator is exhausted.
+    """
+    if (l == None): l = newLexer()
+    l.reset()
+
+    # Empty files can't be mapped, so they are lexed as an empty source text, leaving the same line metadata as unmapped.
+    if (mapped and os.path.getsize(source) == 0): (source, mapped) = ("", False)
+
+    if (not mapped):
+        l.input(source)
+        while ((tok := l.getExtendedToken()) != None): yield tok
     else:
-        token = self.token() 
-
-    while (True):
-        if (token == None): break
-        if (token.type == "SEP"): 
-            token.pos = TokenPos(self, token.lexpos, token.lexpos + len(token.value))
-            lexer._lastSep = token
-            token = self.token()
+        with open(source, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                yield from _iterWindows(l, data, windowSize)
+
+    l.finish()
+#endregion ------- Token Streaming -------
+
+#region ------- Incremental Lexing -------
+# How many characters past the end of a token the lexer may have looked at when matching it (e.g. "1" in "1.e+5").
+RELEX_MARGIN = 4
+
+class TokenStream:
+    """
+    The tokens of a source text, as yielded by iterTokens, along with the lexer that produced them (which holds the line
+    metadata and the lexical diagnostics of the source text).
+
+    The stream can be updated for an edit of the source text through TokenStream#edit, which only re-lexes the source
+    text from the last token unaffected by the edit, until the tokens converge with the previous ones again. The tokens,
+    line metadata and diagnostics past that point are kept, moved to their new positions.
+    """
+    def __init__(self, source, l: PascalLexer = None):
+        self.source = source
+        self.lexer = l if l != None else newLexer()
+        self.tokens = []
+        self._diagCounts = [] # _diagCounts[i] = Number of diagnostics emitted up to the end of tokens[i]
+
+        self.lexer.reset()
+        self.lexer.input(source)
+        self._relex()
+
+    def _restartIndex(self, offset):
+        """
+            Gets the index of the first token to be re-lexed for an edit at offset.
+        """
+        k = bisect_right(self.tokens, offset - RELEX_MARGIN, key = tokenEnd)
+
+        # A quote rejected as an unexpected character may start a string closed by a quote within the edit, so the 
+        #   source text is re-lexed from before it. It may also have been the closing quote of the string before it, 
+        #   had the string been closed (see _windowIsExact).
+        for (i, diag) in enumerate(self.lexer.diagnostics):
+            if (diag.args.get("character") == repr("'")):
+                k = min(k, bisect_right(self._diagCounts, i))
+                while (k != 0 and self.tokens[k - 1].type == "STRING"):
+                    end = tokenEnd(self.tokens[k - 1])
+                    if (self.source[end:end + 1] != "'"): break
+                    k -= 1
+                break
+
+        return k
+
+    def _checkpoint(self, k):
+        """
+            Gets the checkpoint (see PascalLexer#checkpoint) of the lexer at the end of the token before tokens[k]. Tokens 
+            always end on the INITIAL state.
+        """
+        if (k == 0): return (1, 0, 0, 0, "INITIAL")
+
+        pos = self.tokens[k - 1].pos
+        return (pos._lineno, pos._lastLineLexPos, pos._lineCount, self._diagCounts[k - 1], "INITIAL")
+
+    def edit(self, offset, removedLen, insertedText):
+        """
+            Replaces removedLen characters at offset on the source text with insertedText, updating the tokens, line 
+            metadata and diagnostics. Returns how many tokens were lexed.
+        """
+        l = self.lexer
+        delta = len(insertedText) - removedLen
+        k = self._restartIndex(offset)
+        self.source = self.source[:offset] + insertedText + self.source[offset + removedLen:]
+
+        cp = self._checkpoint(k)
+        (lineCount, diagCount) = (cp[2], cp[3])
+
+        # Keep whatever follows the restart point, as it may be moved back in place.
+        old = {
+            "tokens": self.tokens[k:],
+            "diagCounts": self._diagCounts[k:],
+            "lineCount": lineCount,
+            "lineLens": l.lineLens[lineCount:],
+            "lineEnds": l.lineIndex.ends[lineCount:],
+            "diagCount": diagCount,
+            "diagnostics": l.diagnostics[diagCount:],
+            "lineno": l.lineno,
+            "lastLineLexPos": l._lastLineLexPos,
+            "editEnd": offset + removedLen,
+            "delta": delta
+        }
+        del self.tokens[k:]
+        del self._diagCounts[k:]
+
+        l.rollback(cp)
+        l.input(self.source)
+        l.lexpos = tokenEnd(self.tokens[-1]) if (k != 0) else 0
+        l._peek = None
+
+        return self._relex(old)
+
+    def _relex(self, old = None):
+        l = self.lexer
+        oldTokens = old["tokens"] if (old != None) else []
+        count = 0
+        i = 0
+        while ((tok := l.getExtendedToken()) != None):
+            # Old tokens before this one can no longer converge.
+            while (i < len(oldTokens) and oldTokens[i].lexpos + old["delta"] < tok.lexpos): i += 1
+
+            if (i < len(oldTokens) and self._converges(old, oldTokens[i], tok)):
+                self._splice(old, i, tok)
+                return count
+
+            self.tokens.append(tok)
+            self._diagCounts.append(len(l.diagnostics))
+            count += 1
+
+        l.finish()
+        return count
+
+    def _lineDrift(self, pos, ends, firstLine):
+        """
+            Gets how far the recorded line lengths add up from the start of the current line, at pos. The line lengths 
+            don't necessarily add up to it (see t_comment_RBRACE), and the columns on every line past pos depend on the 
+            difference between both. The ends of the lines from firstLine on are taken from ends.
+        """
+        if (pos._lineCount == 0): return -pos._lastLineLexPos
+        if (pos._lineCount > firstLine): return ends[pos._lineCount - firstLine - 1] - pos._lastLineLexPos
+        return self.lexer.lineIndex.ends[pos._lineCount - 1] - pos._lastLineLexPos
+
+    def _converges(self, old, oldTok, tok):
+        """
+            Checks whether lexing from the end of tok on yields the same as lexing from the end of oldTok did, before the 
+            edit. That is the case if both are the same token, after the edit, and the lexer is on the same line state.
+        """
+        delta = old["delta"]
+        if (oldTok.lexpos < old["editEnd"] or oldTok.lexpos + delta != tok.lexpos): return False
+        if (oldTok.type != tok.type or oldTok.value != tok.value): return False
+
+        # Lines are counted on both lexer.lineno and lexer.lineLens, which only diverge on strings spanning lines. The
+        #   positions past this point can only be moved if both are moved by the same amount.
+        (oldPos, pos) = (oldTok.pos, tok.pos)
+        if (pos._lastLineLexPos != oldPos._lastLineLexPos + delta): return False
+        if (pos._lineno - oldPos._lineno != pos._lineCount - oldPos._lineCount): return False
+
+        return (
+            self._lineDrift(pos, self.lexer.lineIndex.ends, 0) 
+            == self._lineDrift(oldPos, old["lineEnds"], old["lineCount"])
+        )
+
+    def _splice(self, old, i, tok):
+        """
+            Moves the tokens, line metadata and diagnostics kept from before the edit, from the old token i (which 
+            converged with tok) on, after the re-lexed ones.
+        """
+        l = self.lexer
+        oldTokens = old["tokens"]
+        delta = old["delta"]
+        lineDelta = tok.pos._lineCount - oldTokens[i].pos._lineCount
+        diagDelta = len(l.diagnostics) - old["diagCounts"][i]
+
+        extendLineLens(l, old["lineLens"][oldTokens[i].pos._lineCount - old["lineCount"]:])
+        for diag in old["diagnostics"][old["diagCounts"][i] - old["diagCount"]:]:
+            diag.startPos = (diag.startPos[0] + lineDelta, diag.startPos[1])
+            diag.endPos = (diag.endPos[0] + lineDelta, diag.endPos[1])
+            l.diagnostics.append(diag)
+
+        for j in range(i, len(oldTokens)):
+            oldTok = oldTokens[j]
+            oldTok.lexpos += delta
+            oldTok.lineno += lineDelta
+            oldTok.pos.shift(delta, lineDelta)
+            self.tokens.append(oldTok)
+            self._diagCounts.append(old["diagCounts"][j] + diagDelta)
+
+        l.lineno = old["lineno"] + lineDelta
+        l._lastLineLexPos = old["lastLineLexPos"] + delta
+        l.lexpos = len(self.source)
+#endregion ------- Incremental Lexing -------
+
+#region ------- Parallel Lexing -------
+# Large source texts can be split in chunks, lexed in parallel by separate processes. Chunks start right after a newline
+#   outside of any comment or string (see findSplitPoints), where the lexer is known to be on the INITIAL state, with the
+#   current line starting at the newline (see t_SEP). Each chunk is lexed from that state, with line numbers relative to
+#   the chunk, which are moved once the chunks are stitched back together.
+#   Lexical diagnostics hold rows and columns resolved as they are emitted, which can't be moved in the same way (see 
+#   t_comment_RBRACE). Chunks with diagnostics are therefore lexed again, sequentially, as they're stitched.
+CHUNK_SIZE = 1 << 20
+_stringPattern = re.compile(t_STRING.__doc__)
+_openerPattern = re.compile(r"\{|\(\*|'")
+
+def findSplitPoints(source, chunkSize = CHUNK_SIZE):
+    """
+        Finds positions, about chunkSize characters apart, right after a newline that lies outside of any comment or 
+        string, at which the source text can be split. Comments and strings are skipped the same way the lexer does.
+    """
+    points = []
+    target = chunkSize
+    i = 0
+    while (target < len(source)):
+        m = _openerPattern.search(source, i)
+        codeEnd = m.start() if (m != None) else len(source)
+
+        # The code up to the next comment or string can be split on any newline.
+        while (target < codeEnd):
+            nl = source.find("\n", max(i, target), codeEnd)
+            if (nl == -1 or nl + 1 >= len(source)): break
+            points.append(nl + 1)
+            target = nl + 1 + chunkSize
+
+        if (m == None): break
+        if (m.group() == "'"):
+            sm = _stringPattern.match(source, m.start())
+            i = sm.end() if (sm != None) else m.end() # A stray quote is skipped (see t_error).
+        else:
+            ends = [e for e in (source.find("}", m.end()), source.find("*)", m.end())) if e != -1]
+            if (len(ends) == 0): break
+            i = min(ends) + (1 if source[min(ends)] == "}" else 2)
+
+    return points
+
+def _lexChunk(text, base):
+    """
+        Lexes a chunk of a source text starting at base (see lexParallel). Returns None if the chunk has any lexical 
+        diagnostic, otherwise a tuple with the tokens, the line lengths and the final line state of the lexer.
+    """
+    l = newLexer()
+    l.lexbase = base
+    if (base != 0): l._lastLineLexPos = base - 1
+    l.input(text)
+
+    tokens = []
+    while ((tok := l.getExtendedToken()) != None):
+        pos = tok.pos
+        tokens.append((tok.type, tok.value, tok.lineno, tok.lexpos, pos._endPos, pos._lineCount, pos._lineno, pos._lastLineLexPos))
+
+    if (len(l.diagnostics) != 0): return None
+    return (tokens, l.lineLens, l.lineno, l._lastLineLexPos)
+
+def _stitchChunk(l, result, tokens):
+    """
+        Appends the tokens and line lengths of a chunk lexed by _lexChunk, moving their lines after the ones of the
+        previous chunks (which the given lexer holds).
+    """
+    (chunkTokens, lineLens, lineno, lastLineLexPos) = result
+    lineDelta = l.lineno - 1
+    lineCountDelta = len(l.lineLens)
+
+    for (type, value, tokLineno, lexpos, endPos, lineCount, posLineno, posLastLineLexPos) in chunkTokens:
+        pos = TokenPos.fromState(
+            l, lexpos, endPos, lineCount + lineCountDelta, posLineno + lineDelta, posLastLineLexPos
+        )
+        tokens.append(PascalToken(type, value, tokLineno + lineDelta, lexpos, l, pos))
+
+    extendLineLens(l, lineLens)
+    l.lineno = lineno + lineDelta
+    l._lastLineLexPos = lastLineLexPos
+
+def lexParallel(source, l: PascalLexer = None, workers = None, chunkSize = CHUNK_SIZE):
+    """
+        Lexes a source text in chunks of about chunkSize characters, in parallel, returning the same tokens as iterTokens
+        would yield. As with iterTokens, the lexer used is reset first, and holds the lexical diagnostics and the line 
+        metadata of the source text once this returns.
+    """
+    if (l == None): l = newLexer()
+    points = findSplitPoints(source, chunkSize)
+    if (len(points) == 0): return list(iterTokens(source, l))
+
+    bounds = [0] + points + [len(source)]
+    chunks = [(source[bounds[i]:bounds[i + 1]], bounds[i]) for i in range(0, len(bounds) - 1)]
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        results = list(executor.map(_lexChunk, *zip(*chunks)))
+
+    l.reset()
+    tokens = []
+    for ((text, base), result) in zip(chunks, results):
+        if (result != None):
+            _stitchChunk(l, result, tokens)
             continue
 
-        token.pos = TokenPos(self, token.lexpos, token.lexpos + len(token.value))
-        # token.lexpos = self.lexpos
-        break
-
-    # print("GET FINAL:", token)
-    self._cur = token
-    return token
-
-@externalinstancemethod(lexer, "peek")
-def _peek(self):
-    if (self._peek == None): self._peek = self.token()
-    self._peek.pos = TokenPos(self, self._peek.lexpos, self._peek.lexpos + len(self._peek.value))
-    return self._peek
-
-@externalinstancemethod(lexer, "reset")
-def _reset(self):
-    self.lineno = 1
-    self.lexpos = 0
-    self._lastLineLexPos = 0
-    self.lineLens = []
-    self.diagnostics = []
-#endregion ------- Lexer Build -------
+        l.lexbase = base
+        l.input(text)
+        while ((tok := l.getExtendedToken()) != None): tokens.append(tok)
+
+    # Unless the last chunk was lexed here, move the lexer past the end of the source text, as lexing it would.
+    if (results[-1] != None):
+        l.lexbase = len(source)
+        l.input("")
+        l.getExtendedToken()
+
+    l.finish()
+
+    return tokens
+#endregion ------- Parallel Lexing -------
@@ -0,0 +1,202 @@
+import os
+import gc
+import pickle
+import contextlib
+import threading
+from . import tablecache
+from .diag import DiagnosticType
+from .astbin import serializeAST, deserializeAST
+
+#
+# Parse Cache
+#
+#   This module manages an optional on-disk cache of parse results, for when the same source texts are compiled over and
+# over (e.g. when regrading submissions). Each entry holds what parsing a source text leaves behind: the AST (or None),
+# the lexical diagnostics (and whether lexing was cut short) and the syntatic diagnostics. The AST is stored in it's 
+# binary form (see compiler.astbin), which is several times smaller than it's pickled form, and the rest is pickled.
+#   Entries are keyed by a signature of the source text, the parser it was parsed with (and it's options that change the
+# result) and the compiler itself: every module of the compiler package, so that any change to the lexer, the grammar or
+# the AST invalidates every entry.
+#   The cache is bounded both in entries and in bytes, evicting the least recently used entries (by modification time,
+# which is refreshed on every hit) whenever an entry is stored. As with the table cache, entries are written under a
+# temporary name and then moved in place, so that concurrent compiler processes never load a partially written entry.
+#
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "parsecache")
+ENTRY_EXT = ".pickle"
+
+# The parser options that change the result of a parse. The time limit is left out, as a parse aborted by it is never
+#   stored.
+KEY_OPTIONS = ("maxErrors", "maxSkippedTokens")
+
+_compilerSignature = None
+
+@contextlib.contextmanager
+def gcPaused():
+    """
+        Pauses the garbage collector. (De)serializing an AST allocates (or traverses) a large number of objects at once, 
+        which would otherwise trigger several full collections, each slower than the last.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if (enabled): gc.enable()
+
+def compilerSignature() -> str:
+    """
+        Computes a signature over the sources of every module of the compiler package, once per process.
+    """
+    global _compilerSignature
+    if (_compilerSignature == None):
+        root = os.path.dirname(os.path.realpath(__file__))
+        parts = []
+        for f in sorted(os.listdir(root)):
+            if (not f.endswith(".py")): continue
+
+            with open(os.path.join(root, f), "rb") as sf:
+                parts += [f, sf.read()]
+        _compilerSignature = tablecache.signature(*parts)
+
+    return _compilerSignature
+
+class ParseCache:
+    """
+    An on-disk cache of parse results, bounded to maxEntries entries and maxBytes bytes. Parsers consult it on
+    parseSource when set as their cache (see PascalParser).
+
+    The hits and misses are counted on the cache instance.
+    """
+    def __init__(self, path: str = CACHE_DIR, maxEntries: int = 256, maxBytes: int = 64 << 20):
+        self.path = path
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, p, src: str) -> str:
+        options = [p.options.get(option) for option in KEY_OPTIONS]
+        return tablecache.signature(compilerSignature(), type(p).__name__, *options, src.encode("utf-8"))
+
+    def entryPath(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}{ENTRY_EXT}")
+
+    def load(self, key: str):
+        """
+            Loads the entry of the given key, refreshing it's modification time, or returns None if there is none (or
+            it can't be read).
+        """
+        path = self.entryPath(key)
+        try:
+            with open(path, "rb") as f, gcPaused():
+                entry = pickle.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A corrupted entry is removed, in order to be replaced.
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def store(self, key: str, entry):
+        """
+            Stores an entry under the given key, and evicts the least recently used entries past the bounds. Entries
+            that can't be written are not cached.
+        """
+        try:
+            os.makedirs(self.path, exist_ok = True)
+            with gcPaused():
+                data = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        except (OSError, RecursionError, pickle.PicklingError):
+            return
+
+        tmpPath = os.path.join(self.path, f"{key}_{os.getpid()}_{threading.get_ident()}.tmp")
+        try:
+            with open(tmpPath, "wb") as f:
+                f.write(data)
+            os.replace(tmpPath, self.entryPath(key))
+        except OSError:
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+            Removes the least recently used entries until the cache is within it's bounds.
+        """
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for e in it:
+                    if (not e.name.endswith(ENTRY_EXT)): continue
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            return
+
+        count = len(entries)
+        size = sum(e[1] for e in entries)
+        for (_, esize, epath) in sorted(entries):
+            if (count <= self.maxEntries and size <= self.maxBytes): break
+
+            try:
+                os.remove(epath)
+            except OSError:
+                pass
+            count -= 1
+            size -= esize
+
+    def clear(self):
+        """
+            Removes every entry of the cache.
+        """
+        try:
+            with os.scandir(self.path) as it:
+                for e in it:
+                    if (e.name.endswith(ENTRY_EXT)): os.remove(e.path)
+        except OSError:
+            pass
+
+    def parse(self, p, src: str, parseFunc):
+        """
+            Gets the AST of a source text from the cache, leaving the lexer and the parser with the same diagnostics
+            parsing it would, and writing the syntax errors to the parser's sink. On a miss, the source text is parsed
+            with parseFunc, and the result stored.
+        """
+        key = self.key(p, src)
+        entry = self.load(key)
+        if (entry != None):
+            self.hits += 1
+            p.reset()
+            p.lexer.reset()
+            (astData, p.lexer.diagnostics, p.lexer.truncated, p.diagnostics, p._diagnosticTrace) = entry
+            with gcPaused():
+                pout = None if astData == None else deserializeAST(astData)
+            # Every syntax error is written as it is emitted, including the ones removed by resynchronization rules.
+            for diag in p._diagnosticTrace:
+                p.sink.diagnostic(diag, p.lexer, f"SYNTAX ERROR @{diag.startPos[0]}")
+
+            return pout
+
+        self.misses += 1
+        pout = parseFunc()
+        timedOut = any(
+            diag.type == DiagnosticType.RECOVERY_BUDGET_EXCEEDED and diag.args["budget"] == "timeLimit"
+            for diag in p.diagnostics
+        )
+        if (not timedOut):
+            # ASTs too deep to be serialized are not cached.
+            try:
+                with gcPaused():
+                    astData = None if pout == None else serializeAST(pout)
+            except (RecursionError, TypeError):
+                return pout
+
+            self.store(key, (astData, p.lexer.diagnostics, p.lexer.truncated, p.diagnostics, p._diagnosticTrace))
+
+        return pout
@@ -3,10 +3,8 @@
 # / Symbol Table requires it, and they had to be extracted into their own module because the builtin symbols are defined
 # on their own module.
 #
-from inspect import getframeinfo, stack
-
 import compiler.ast as ast
-from compiler.diag import Diagnostic, DiagnosticType, DiagnosticKind, DiagnosticSource
+from compiler.diag import Diagnostic, DiagnosticType, DiagnosticKind, DiagnosticSource, callerLocation
 
 SA_STATE = {
     "diagnostics": [],
@@ -38,8 +36,6 @@ class SemanticError(Exception):
         return cls(n, dType, dArgs, False)
 
 def sem_error(n: ast.Node, dType: DiagnosticType, dArgs, emit = True):
-    caller = getframeinfo(stack()[1][0])
-
     diag = emitDiagnostic(
         n, 
         dType, 
@@ -49,7 +45,7 @@ def sem_error(n: ast.Node, dType: DiagnosticType, dArgs, emit = True):
     )
 
     if (emit):
-        header = f"[{caller.filename}:{caller.lineno}] " if SA_STATE["debug"] else ""
+        header = f"[{callerLocation()}] " if SA_STATE["debug"] else ""
         print(
             f"\x1b[31m{header}SEMANTIC ERROR {n.pos.fullString}:\x1b[0m" \
             f" {diag.toString(None, emitMark = False, emitPos = False)}"
@@ -58,8 +54,6 @@ def sem_error(n: ast.Node, dType: DiagnosticType, dArgs, emit = True):
     return diag
 
 def sem_warn(n: ast.Node, dType: DiagnosticType, dArgs, emit = True):
-    caller = getframeinfo(stack()[1][0])
-
     diag = emitDiagnostic(
         n, 
         dType, 
@@ -69,7 +63,7 @@ def sem_warn(n: ast.Node, dType: DiagnosticType, dArgs, emit = True):
     )
 
     if (emit):
-        header = f"[{caller.filename}:{caller.lineno}] " if SA_STATE["debug"] else ""
+        header = f"[{callerLocation()}] " if SA_STATE["debug"] else ""
         print(
             f"\x1b[33m{header}SEMANTIC WARNING {n.pos.fullString}:\x1b[0m" \
             f" {diag.toString(None, emitMark = False, emitPos = False)}"
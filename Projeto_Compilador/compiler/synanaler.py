@@ -1,19 +1,26 @@
+import os
+import copy
+import time
+import threading
 from ply import yacc
-from inspect import getframeinfo, stack
-from .lexer import tokens, TokenPos, posToRowCol, lexer
-from .diag import Diagnostic, DiagnosticType, DiagnosticKind, DiagnosticSource
+from .lexer import tokens, TokenPos, posToRowCol, lexer, newLexer, PascalLexer
+from .diag import Diagnostic, DiagnosticType, DiagnosticKind, DiagnosticSource, DiagnosticSink, LogLevel, callerLocation
 import compiler.ast as ast
+from . import tablecache
 
 #
 # Syntatic Analyser
 # 
 #   This module performs syntatic analysis on a token stream obtained through the lexing of a given source text.
-#   In order for diagnostics to be properly processed, the lexer should be called to iterate on the whole source text
-# before passing control over to the syntatic analyser in order to extract lexical diagnostics, followed by a call to
-# lexer.reset().
-#   When calling parser.parse, the lexer should be passed explicitly as an argument, along with it's custom token
-# mock, lexer.getExtendedToken, in order for the tokens passed to have their location metadata correctly mapped to the
-# source text.
+#   The source text is lexed a single time, as the parser requests tokens, and the lexical diagnostics are collected on
+# the lexer during that same pass. PascalParser#parseSource should be preferred, as it resets the parser and it's lexer 
+# before parsing and lexes whatever the parser did not consume afterwards, so that the lexical diagnostics are complete 
+# once it returns.
+#   When calling parser.parse directly, the lexer should be passed explicitly as an argument, along with it's custom 
+# token mock, lexer.getExtendedToken, in order for the tokens passed to have their location metadata correctly mapped to
+# the source text.
+#   Each thread should hold it's own parser (see newParser), with it's own lexer. The module-level parser and lexer are
+# the default ones.
 #
 #  On Error Handling:
 #    Error handling should be preferrably done through resynchronization rules (see Section 6.8.1 of 
@@ -22,6 +29,20 @@ import compiler.ast as ast
 # instantly reduced. During testing, it might APPEAR to work fine for one singular error on the same rule, but further 
 # testing will reveal the non-intuitive behavior. This is a built-in functionality of PLY.yacc and cannot feasibly be 
 # worked around.
+#    On garbage input, the error recovery can go on for as long as there are tokens, emitting a diagnostic every few 
+# tokens. Each parse has an error recovery budget (see PascalParser), and is aborted with a critical diagnostic once it
+# exceeds it.
+#
+#  On Unit Productions:
+#    Every reduction costs a call to it's production function, so productions that would only forward a child (e.g. 
+# type : simpleType, or a single operator token) are avoided: the alternatives of the child are inlined on the 
+# productions that use it, which then build whatever the child would. Likewise, the productions that only set the static
+# type of an expression (e.g. booleanExpression) are replaced by an expression, whose static type is set by the 
+# production that uses it. The reductions of a parse can be counted through the countReductions option of the parser.
+#
+#  On List Productions:
+#    Lists are left-recursive, so that the parser stack doesn't grow with their length, and each reduction appends to
+# the list of the inner production in place (see appended), so that building a list takes linear time.
 #
 
 start = "program"
@@ -49,17 +70,42 @@ def p_bt_KW_OF(p):
     """
     bt_KW_OF : KW_OF
     """
-    p.parser.backtracks["KW_OF"] = lexer._cur
+    p.parser.backtracks["KW_OF"] = p.lexer._cur
     p[0] = p[1]
 
 def p_bt_GENERIC(p):
     """
     bt_GENERIC : empty
     """
-    p.parser.backtracks["GENERIC"] = lexer._lastSep
+    p.parser.backtracks["GENERIC"] = p.lexer._lastSep
 #endregion ============== Backtracks =============
 
 #region ============== Compound Primitives =============
+# The operator each operator token stands for, for the productions that build operators from tokens.
+OPERATOR_KINDS = {
+    "OP_EQ":    ast.OpKind.OP_EQ,
+    "OP_NEQ":   ast.OpKind.OP_NEQ,
+    "OP_LT":    ast.OpKind.OP_LT,
+    "OP_LTE":   ast.OpKind.OP_LTE,
+    "OP_GT":    ast.OpKind.OP_GT,
+    "OP_GTE":   ast.OpKind.OP_GTE,
+    "KW_IN":    ast.OpKind.OP_IN,
+    "OP_PLUS":  ast.OpKind.OP_ADD,
+    "OP_MINUS": ast.OpKind.OP_SUB,
+    "KW_OR":    ast.OpKind.OP_OR,
+    "OP_MULT":  ast.OpKind.OP_MUL,
+    "OP_DIV":   ast.OpKind.OP_DIV,
+    "KW_DIV":   ast.OpKind.OP_DIV,
+    "KW_MOD":   ast.OpKind.OP_MOD,
+    "KW_AND":   ast.OpKind.OP_AND
+}
+
+def operatorNode(t):
+    """
+        Builds the operator node for an operator token.
+    """
+    return ast.OpNode(OPERATOR_KINDS[t.type]).setTokenPos(t.pos)
+
 def p_number(p):
     """
     number : UNSIGNED_REAL 
@@ -73,22 +119,6 @@ def p_number(p):
     t = p.slice[1]
     p[0] = ast.NumberNode(t.value, ast.NumberKind[t.type]).setTokenPos(t.pos)
 
-def p_unsignedConstant(p):
-    """
-    unsignedConstant : UNSIGNED_REAL 
-                     | UNSIGNED_INTEGER 
-                     | STRING
-                     | KW_NIL
-    """
-                    #  | IDENTIFIER
-    t = p.slice[1]
-    match(t.type):
-        case "UNSIGNED_REAL" | "UNSIGNED_INTEGER": 
-            p[0] = ast.UnsignedConstantNode(ast.NumberNode(t.value, ast.NumberKind[t.type]).setTokenPos(t.pos))
-        case "STRING": p[0] = ast.UnsignedConstantNode(ast.StringNode(p[1]).setTokenPos(t.pos))
-        case "IDENTIFIER": p[0] = ast.UnsignedConstantNode(ast.IdentifierNode(p[1]).setTokenPos(t.pos))
-        case "KW_NIL": p[0] = ast.UnsignedConstantNode(ast.SpecialSymbolNode(ast.SpecialSymbolKind.SS_NIL).setTokenPos(t.pos))
-
 def p_directive(p):
     """
     directive : IDENTIFIER
@@ -133,7 +163,7 @@ def p_programExternalsBody(p):
                          | IDENTIFIER
                          | empty
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 #endregion -------------- Program Heading --------------
@@ -142,7 +172,7 @@ def p_programExternalsBody(p):
 #region -------------- Block --------------
 def p_block(p):
     """
-    block : labelDeclarationPart constDefinitionPart typeDefinitionPart variableDeclarationPart procedureAndFunctionDefinitionPart statementPart
+    block : labelDeclarationPart constDefinitionPart typeDefinitionPart variableDeclarationPart procedureAndFunctionDefinitionPart compoundStatement
     """
     p[0] = ast.BlockNode(p[1], p[2], p[3], p[4], p[5], p[6])#.setStartTokenPos(p[1].pos).setEndTokenPos(p[5].pos)
     for i in range(1, 7):
@@ -176,7 +206,7 @@ def p_labelDeclarationPartBody(p):
                              | UNSIGNED_INTEGER
                              | empty
     """
-    if (len(p) == 4): p[0] = p[1] + [ast.NumberNode(p[3], ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(p.slice[3].pos)]
+    if (len(p) == 4): p[0] = appended(p[1], ast.NumberNode(p[3], ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(p.slice[3].pos))
     else: p[0] = [ast.NumberNode(p[1], ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(p.slice[1].pos)]
 #endregion ------- Label Declaration -------
 
@@ -208,7 +238,7 @@ def p_constDefinitionPartBody(p):
     constDefinitionPartBody : constDefinitionPartBody SEMICOLON constDefinition
                             | constDefinition
     """
-    if (len(p) > 2): p[0] = p[1] + [p[3]]
+    if (len(p) > 2): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_constDefinition(p):
@@ -228,17 +258,19 @@ def p_constDefinition(p):
 #     else: p[0] = ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)
 def p_constElem(p):
     """
-    constElem : number 
+    constElem : UNSIGNED_REAL 
+              | UNSIGNED_INTEGER 
               | OP_PLUS number
               | OP_MINUS number
               | IDENTIFIER 
               | STRING
     """
-    if (isinstance(p[1], ast.Node)): p[0] = p[1]
-    elif (p.slice[1].type == "OP_PLUS" or p.slice[1].type == "OP_MINUS"): 
-        p[0] = p[2].sign(p.slice[1].type).setStartTokenPos(p.slice[1].pos)
-    elif (p.slice[1].type == "STRING"): p[0] = ast.StringNode(p[1]).setTokenPos(p.slice[1].pos)
-    else: p[0] = ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)
+    t = p.slice[1]
+    match (t.type):
+        case "UNSIGNED_REAL" | "UNSIGNED_INTEGER": p[0] = ast.NumberNode(t.value, ast.NumberKind[t.type]).setTokenPos(t.pos)
+        case "OP_PLUS" | "OP_MINUS": p[0] = p[2].sign(t.type).setStartTokenPos(t.pos)
+        case "STRING": p[0] = ast.StringNode(p[1]).setTokenPos(t.pos)
+        case _: p[0] = ast.IdentifierNode(p[1]).setTokenPos(t.pos)
 #endregion ------- Constants Definition -------
 
 # Section 3.D
@@ -258,8 +290,8 @@ def p_typeDefinitionPartBody(p):
     """
     if (len(p) == 4): 
         if (p[1] == None or p[3] == None): p[0] = None
-        else: p[0] = p[1] + [p[3]]
-    else: p[0] = [p[1]]
+        else: p[0] = appended(p[1], p[3])
+    else: p[0] = [p[1]] if p[1] != None else None
 def p_typeDefinitionPartBody_error(p):
     """
     typeDefinitionPartBody : typeDefinitionPartBody error
@@ -280,26 +312,35 @@ def p_typeDefinition(p):
     """
     typeDefinition : IDENTIFIER OP_EQ type
     """
-    p[0] = ast.TypeDefinitionNode(p[1], p[3]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[3].pos)
+    # An invalid type was already reported by it's error production.
+    if (p[3] == None): p[0] = None
+    else: p[0] = ast.TypeDefinitionNode(p[1], p[3]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[3].pos)
 
+# The simple (ordinal) types, structured types and pointer types are inlined here.
 def p_type(p):
     """
-    type : simpleType 
-         | structuredType 
+    type : enumeratedType
+         | subrangeType
+         | IDENTIFIER
+         | KW_PACKED arrayType
+         | KW_PACKED recordType
+         | KW_PACKED setType
+         | arrayType
+         | recordType
+         | setType
          | pointerType
     """
-    p[0] = p[1]
-
-#region ---- Section R6.1 ----
-def p_simpleType(p):
-    """
-    simpleType : ordinalType
-    """
-            #    | IDENTIFIER
-    if (isinstance(p[1], ast.Node)): p[0] = p[1]
+                        #    | fileType
+    if (len(p) > 2):
+        if (p[2] == None): return None
+        else:
+            p[2].packed = True
+            p[0] = p[2].setStartTokenPos(p.slice[1].pos)
+    elif (isinstance(p[1], ast.Node)): p[0] = p[1]
     elif (p[1] == None): p[0] = p[1] # Error occured
-    # else: p[0] = ast.TypeIdentifierNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos))
+    else: p[0] = ast.TypeIdentifierNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos))
 
+#region ---- Section R6.1 ----
 def p_ordinalType(p):
     """
     ordinalType : enumeratedType
@@ -335,7 +376,7 @@ def p_enumeratedTypeList(p):
     enumeratedTypeList : enumeratedTypeList COMMA IDENTIFIER
                        | IDENTIFIER
     """
-    if (len(p) == 4): p[0] = p[1] + [ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos)]
+    if (len(p) == 4): p[0] = appended(p[1], ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos))
     else: p[0] = [ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)]
 def p_enumeratedTypeList_error(p):
     """
@@ -356,31 +397,6 @@ def p_subrangeType(p):
 #endregion ---- Section R6.1 ----
 
 #region ---- Section R6.2 ----
-def p_structuredType(p):
-    """
-    structuredType : KW_PACKED unpackedStructuredType
-                   | unpackedStructuredType
-    """
-                #    | IDENTIFIER
-    if (len(p) > 2):
-        if (p[2] == None): return None
-        else:
-            p[2].packed = True
-            p[0] = p[2].setStartTokenPos(p.slice[1].pos)
-    else:
-        if (p[1] == None): p[0] = None
-        elif (p[1].ist(ast.Node)): p[0] = p[1]
-        else: p[0] = ast.TypeIdentifierNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos))
-
-def p_unpackedStructuredType(p):
-    """
-    unpackedStructuredType : arrayType
-                           | recordType
-                           | setType
-    """
-                        #    | fileType
-    p[0] = p[1]
-
 #region - Section R6.2.1 -
 def p_arrayType(p):
     """
@@ -407,7 +423,7 @@ def p_indexTypeList(p):
     indexTypeList : indexTypeList COMMA ordinalType
                   | ordinalType
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 #endregion - Section R6.2.1 -
 
@@ -443,10 +459,10 @@ def p_recordType_error(p):
 def p_fieldList(p):
     """
     fieldList : fixedPart fieldListTail
-              | fieldListDirectTail
+              | variantPart fieldListTerminator
               | empty
     """
-    if (len(p) > 2): p[0] = (p[1], p[2])
+    if (len(p) > 2 and p.slice[1].type == "fixedPart"): p[0] = (p[1], p[2])
 #     else: p[0] = (None, p[1])
 # def p_fieldList_error(p):
 #     """
@@ -460,12 +476,6 @@ def p_fieldList(p):
 #     #     syn_error(t, DiagnosticType.RECORD_NO_FIXED_PART, {})
 #     #     advanceUntil(lambda t: t.type == 'KW_END')
 
-def p_fieldListDirectTail(p):
-    """
-    fieldListDirectTail : variantPart fieldListTerminator
-    """
-    p[0] = p[1]
-
 def p_fieldListTail(p):
     """
     fieldListTail : SEMICOLON variantPart fieldListTerminator
@@ -487,7 +497,7 @@ def p_fixedPart(p):
     fixedPart : fixedPart SEMICOLON recordSection
               | recordSection
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_recordSection(p):
@@ -507,7 +517,7 @@ def p_recordSectionHead(p):
     recordSectionHead : recordSectionHead COMMA IDENTIFIER
                       | IDENTIFIER
     """
-    if (len(p) == 4): p[0] = p[1] + [ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos)]
+    if (len(p) == 4): p[0] = appended(p[1], ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos))
     else: p[0] = [ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)]
 # def p_recordSectionHead_error(p):
 #     """
@@ -569,7 +579,7 @@ def p_variantPartBody(p):
     variantPartBody : variantPartBody SEMICOLON variantCase
                     | variantCase
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_variantCase(p):
@@ -594,7 +604,7 @@ def p_variantCaseConsts(p):
     variantCaseConsts : variantCaseConsts COMMA constElem
                       | constElem
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 #endregion - Section 7.B - 
@@ -647,7 +657,7 @@ def p_variableDeclarationPartBody(p):
     """
     if (len(p) == 4): 
         if (p[1] == None or p[3] == None): p[0] = None
-        else: p[0] = p[1] + [p[3]]
+        else: p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 def p_variableDeclarationPartBody_error(p):
     """
@@ -674,7 +684,7 @@ def p_variableDeclarationHead(p):
     variableDeclarationHead : variableDeclarationHead COMMA IDENTIFIER
                             | IDENTIFIER
     """
-    if (len(p) == 4): p[0] = p[1] + [ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos)]
+    if (len(p) == 4): p[0] = appended(p[1], ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos))
     else: p[0] = [ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)]
 #endregion ------- Variable Declaration -------
 #endregion -------------- Block --------------
@@ -694,47 +704,29 @@ def p_procedureAndFunctionDefinitionPartList(p):
     procedureAndFunctionDefinitionPartList : procedureAndFunctionDefinitionPartList SEMICOLON procedureAndFunctionDefinition
                                            | procedureAndFunctionDefinition
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_procedureAndFunctionDefinition(p):
     """
-    procedureAndFunctionDefinition : procedureOrFunctionHeading SEMICOLON procedureOrFunctionBody
+    procedureAndFunctionDefinition : procedureHeading SEMICOLON block
+                                   | procedureHeading SEMICOLON directive
+                                   | functionHeading SEMICOLON block
+                                   | functionHeading SEMICOLON directive
     """
     if (p[1].ist(ast.ProcedureHeadingNode)): p[0] = ast.ProcedureDeclarationNode(p[1], p[3]) \
         .setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
     else: p[0] = ast.FunctionDeclarationNode(p[1], p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
 
-def p_procedureOrFunctionHeading(p):
-    """
-    procedureOrFunctionHeading : procedureHeading
-                               | functionHeading
-    """
-    p[0] = p[1]
-
-def p_procedureOrFunctionBody(p):
-    """
-    procedureOrFunctionBody : block
-                            | directive
-    """
-    p[0] = p[1]
-
 # Section 11.A
 #region -------------- Procedure --------------
 def p_procedureHeading(p):
     """
-    procedureHeading : KW_PROCEDURE IDENTIFIER procedureHeadingParams
+    procedureHeading : KW_PROCEDURE IDENTIFIER formalParameterList
     """
     p[0] = ast.ProcedureHeadingNode(p[2], p[3]).setStartTokenPos(p.slice[1].pos)
     if (p[3] != None): p[0].setEndTokenPos(p[3][-1].pos)
     else: p[0].setEndTokenPos(p.slice[2].pos)
-
-def p_procedureHeadingParams(p):
-    """
-    procedureHeadingParams : formalParameterList
-    """
-                        #    | empty
-    p[0] = p[1] 
 #endregion  -------------- Procedure --------------
 
 #region -------------- Function --------------
@@ -747,16 +739,9 @@ def p_functionHeading(p):
     if (p[3] != None): p[0].setEndTokenPos(p[3][-1].pos)
     else: p[0].setEndTokenPos(p.slice[2].pos)
 
-def p_functionHeadingParams(p):
-    """
-    functionHeadingParams : formalParameterList
-    """
-                        #   | empty
-    p[0] = p[1]
-
 def p_functionHeadingTail(p):
     """
-    functionHeadingTail : functionHeadingParams COLON IDENTIFIER
+    functionHeadingTail : formalParameterList COLON IDENTIFIER
                         | empty
     """
     if (len(p) == 4): p[0] = (p[1], ast.TypeIdentifierNode(ast.IdentifierNode(p[3]).setTokenPos(p.slice[3].pos)))
@@ -782,20 +767,19 @@ def p_formalParameterList_error(p):
 
 def p_formalParameterListBody(p):
     """
-    formalParameterListBody : formalParameterListBody SEMICOLON formalParameterSection
-                            | formalParameterSection
-    """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    formalParameterListBody : formalParameterListBody SEMICOLON variableParameterSpecification
+                            | formalParameterListBody SEMICOLON valueParameterSpecification
+                            | formalParameterListBody SEMICOLON procedureHeading
+                            | formalParameterListBody SEMICOLON functionHeading
+                            | variableParameterSpecification
+                            | valueParameterSpecification
+                            | procedureHeading
+                            | functionHeading
+    """
+    # The formal parameter sections are inlined here.
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
-def p_formalParameterSection(p):
-    """
-    formalParameterSection : variableParameterSpecification
-                           | valueParameterSpecification
-                           | procedureOrFunctionHeading
-    """
-    p[0] = p[1]
-
 def p_variableParameterSpecification(p):
     """
     variableParameterSpecification : KW_VAR valueParameterSpecification
@@ -815,24 +799,18 @@ def p_identifierList(p):
     identifierList : identifierList COMMA IDENTIFIER
                    | IDENTIFIER
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_formalParameterSpecificationBody(p):
     """
     formalParameterSpecificationBody : IDENTIFIER
-                                     | conformantArraySchema
+                                     | packedConformantArraySchema
+                                     | unpackedConformantArraySchema
     """
     if (isinstance(p[1], ast.Node)): p[0] = p[1]
     else: p[0] = ast.TypeIdentifierNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos))
 
-def p_conformantArraySchema(p):
-    """
-    conformantArraySchema : packedConformantArraySchema
-                          | unpackedConformantArraySchema
-    """
-    p[0] = p[1]
-
 def p_packedConformantArraySchema(p):
     """
     packedConformantArraySchema : KW_PACKED KW_ARRAY LSBRACKET indexTypeSpecification RSBRACKET KW_OF IDENTIFIER
@@ -851,7 +829,7 @@ def p_indexTypeSpecificationList(p):
     indexTypeSpecificationList : indexTypeSpecificationList SEMICOLON indexTypeSpecification
                                | indexTypeSpecification
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_indexTypeSpecification(p):
@@ -870,80 +848,54 @@ def p_actualParameterList(p):
 
 def p_actualParameterListBody(p):
     """
-    actualParameterListBody : actualParameterListBody COMMA actualParameter
-                            | actualParameter
+    actualParameterListBody : actualParameterListBody COMMA expression
+                            | expression
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    # Here, all would be fine if PLY WASN'T A FUCKING MORON AND JUST FOLLOWED THE FUCKING DEFINITION ORDER, WHICH IS THE 
+    # PATH OF LEAST COST, YET THIS MOTHERFUCKER DECIDES TO GO TO HELL AND BACK TO REDUCE THE EXPRESSION AND THE 
+    # VARIABLE INSTEAD OF THE IDENTIFIER THAT IS *RIGHT FUCKING THERE*. As such, every actual parameter is an expression.
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
-
-# Here, all would be fine if PLY WASN'T A FUCKING MORON AND JUST FOLLOWED THE FUCKING DEFINITION ORDER, WHICH IS THE 
-# PATH OF LEAST COST, YET THIS MOTHERFUCKER DECIDES TO GO TO HELL AND BACK TO REDUCE THE EXPRESSION AND THE VARIABLE
-# INSTEAD OF THE IDENTIFIER THAT IS *RIGHT FUCKING THERE*.
-def p_actualParameter(p):
-    # """
-    # actualParameter : IDENTIFIER
-    #                 | variable
-    #                 | expression
-    # """
-    """
-    actualParameter : expression
-    """
-                    # | variable
-    if (isinstance(p[1], ast.Node)): p[0] = p[1]
-    else: p[0] = ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)
 #endregion ------- Section R11.3.2 -------
 #endregion ============== Section 11 ==============
 
 #region ============== Section R7 ==============
-def p_variable(p):
-    """
-    variable : entireVariable
-             | componentVariable
-             | identifiedVariable
-    """
-            #  | bufferVariable
-    p[0] = p[1]
-
+# The entire, component (indexed variables and field designators) and identified variables are all variables, so each
+# of them is a production of variable.
 def p_entireVariable(p):
     """
-    entireVariable : IDENTIFIER
+    variable : IDENTIFIER
     """
+            #  | bufferVariable
     p[0] = ast.EntireVariableNode(p[1]).setTokenPos(p.slice[1].pos)
 
 #region ------- Section 7.2 -------
-def p_arrayVariable(p):
-    """
-    arrayVariable : variable
-    """
-    p[0] = p[1].setStaticType(ast.VariableStaticType.VARIABLE_ST_ARRAY)
-
-def p_componentVariable(p):
-    """
-    componentVariable : indexedVariable
-                      | fieldDesignator
-    """
-    p[0] = p[1]
-
 def p_indexedVariable(p):
     """
-    indexedVariable : arrayVariable LSBRACKET ordinalExpression indexedVariableTail
+    variable : variable LSBRACKET expression indexedVariableTail
     """
-    p[0] = ast.IndexedVariableNode(p[1], p[3], p[4] if isinstance(p[4], ast.Node) else None) \
-        .setStartTokenPos(p[1].pos).setEndTokenPos(p[4].pos)
+    arrayVariable = p[1].setStaticType(ast.VariableStaticType.VARIABLE_ST_ARRAY)
+    p[0] = ast.IndexedVariableNode(
+        arrayVariable, 
+        p[3].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL), 
+        p[4] if isinstance(p[4], ast.Node) else None
+    ).setStartTokenPos(p[1].pos).setEndTokenPos(p[4].pos)
 
 def p_indexedVariableTail(p):
     """
-    indexedVariableTail : COMMA ordinalExpression RSBRACKET
+    indexedVariableTail : COMMA expression RSBRACKET
                         | RSBRACKET
     """
-    if (len(p) == 4): p[0] = p[2].setStartTokenPos(p.slice[1].pos).setEndTokenPos(p.slice[3].pos)
+    if (len(p) == 4): 
+        p[0] = p[2].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL) \
+            .setStartTokenPos(p.slice[1].pos).setEndTokenPos(p.slice[3].pos)
     else: p[0] = p.slice[1]
 
 # PLY won't reach IDENTIFIER here no matter the fuckery I do, so I gave up. Diverges from spec in terms that 
 # "variable DOT" is no longer optional. Use IdentifiedVariable if needed.
 def p_fieldDesignator(p):
     """
-    fieldDesignator : variable DOT IDENTIFIER
+    variable : variable DOT IDENTIFIER
     """
                     # | IDENTIFIER
     if (len(p) == 4): 
@@ -957,7 +909,7 @@ def p_fieldDesignator(p):
 #region ------- Section 7.3 -------
 def p_identifiedVariable(p):
     """
-    identifiedVariable : variable OP_UPARROW
+    variable : variable OP_UPARROW
     """
     p[0] = ast.IdentifiedVariableNode(p[1]).setStartTokenPos(p[1].pos).setEndTokenPos(p.slice[2].pos)
 #endregion ------- Section 7.3 -------
@@ -992,114 +944,68 @@ def p_identifiedVariable(p):
 
 def p_expression(p):
     """
-    expression : simpleExpression expressionTail
+    expression : simpleExpression
+               | simpleExpression OP_EQ simpleExpression
+               | simpleExpression OP_NEQ simpleExpression
+               | simpleExpression OP_LT simpleExpression
+               | simpleExpression OP_LTE simpleExpression
+               | simpleExpression OP_GT simpleExpression
+               | simpleExpression OP_GTE simpleExpression
+               | simpleExpression KW_IN simpleExpression
     """
-    tail = p[2]
-    if (tail == None): p[0] = p[1]
-    else: p[0] = ast.ExpressionNode(p[1], tail[0], tail[1]).setStartTokenPos(p[1].pos).setEndTokenPos(tail[1].pos)
-
-def p_expressionTail(p):
-    """
-    expressionTail : relationalOperator simpleExpression
-                   | empty
-    """
-    if (p[1] == None): p[0] = None
-    else: p[0] = (p[1], p[2])
-
-def p_sign(p):
-    """
-    sign : OP_PLUS 
-         | OP_MINUS
-    """
-    match (p.slice[1].type):
-        case "OP_PLUS":  p[0] = ast.OpNode(ast.OpKind.OP_ADD).setTokenPos(p.slice[1].pos)
-        case "OP_MINUS": p[0] = ast.OpNode(ast.OpKind.OP_SUB).setTokenPos(p.slice[1].pos)
-
-def p_addingOperator(p):
-    """
-    addingOperator : OP_PLUS
-                   | OP_MINUS
-                   | KW_OR
-    """
-    match (p.slice[1].type):
-        case "OP_PLUS":  p[0] = ast.OpNode(ast.OpKind.OP_ADD).setTokenPos(p.slice[1].pos)
-        case "OP_MINUS": p[0] = ast.OpNode(ast.OpKind.OP_SUB).setTokenPos(p.slice[1].pos)
-        case "KW_OR":    p[0] = ast.OpNode(ast.OpKind.OP_OR).setTokenPos(p.slice[1].pos)
-
-def p_multiplyingOperator(p):
-    """
-    multiplyingOperator : OP_MULT
-                        | OP_DIV
-                        | KW_DIV
-                        | KW_MOD
-                        | KW_AND
-    """
-    match (p.slice[1].type):
-        case "OP_MULT": p[0] = ast.OpNode(ast.OpKind.OP_MUL).setTokenPos(p.slice[1].pos)
-        case "OP_DIV":  p[0] = ast.OpNode(ast.OpKind.OP_DIV).setTokenPos(p.slice[1].pos)
-        case "KW_DIV":  p[0] = ast.OpNode(ast.OpKind.OP_DIV).setTokenPos(p.slice[1].pos)
-        case "KW_MOD":  p[0] = ast.OpNode(ast.OpKind.OP_MOD).setTokenPos(p.slice[1].pos)
-        case "KW_AND":  p[0] = ast.OpNode(ast.OpKind.OP_AND).setTokenPos(p.slice[1].pos)
-
-def p_relationalOperator(p):
-    """
-    relationalOperator : OP_EQ
-                       | OP_NEQ
-                       | OP_LT
-                       | OP_LTE
-                       | OP_GT
-                       | OP_GTE
-                       | KW_IN
-    """
-    match (p.slice[1].type):
-        case "OP_EQ":  p[0] = ast.OpNode(ast.OpKind.OP_EQ).setTokenPos(p.slice[1].pos)
-        case "OP_NEQ": p[0] = ast.OpNode(ast.OpKind.OP_NEQ).setTokenPos(p.slice[1].pos)
-        case "OP_LT":  p[0] = ast.OpNode(ast.OpKind.OP_LT).setTokenPos(p.slice[1].pos)
-        case "OP_LTE": p[0] = ast.OpNode(ast.OpKind.OP_LTE).setTokenPos(p.slice[1].pos)
-        case "OP_GT":  p[0] = ast.OpNode(ast.OpKind.OP_GT).setTokenPos(p.slice[1].pos)
-        case "OP_GTE": p[0] = ast.OpNode(ast.OpKind.OP_GTE).setTokenPos(p.slice[1].pos)
-        case "KW_IN":  p[0] = ast.OpNode(ast.OpKind.OP_IN).setTokenPos(p.slice[1].pos)
+    # The relational operators are inlined here.
+    if (len(p) == 2): p[0] = p[1]
+    else: p[0] = ast.ExpressionNode(p[1], operatorNode(p.slice[2]), p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
 
 def p_simpleExpression(p):
     """
     simpleExpression : simpleExpressionBody
-                     | sign simpleExpressionBody
+                     | OP_PLUS simpleExpressionBody
+                     | OP_MINUS simpleExpressionBody
     """
-    if (p[1].ist(ast.OpKind)):
-        p[0] = ast.ExpressionNode(None, p[1], p[2]).setKind(ast.ExpressionKind.EXP_UNARY) \
-            .setStartTokenPos(p[1].pos).setEndTokenPos(p[2].pos)
-    else: p[0] = p[1]
+    # The signs are inlined here.
+    if (len(p) == 2): p[0] = p[1]
+    else:
+        sign = operatorNode(p.slice[1])
+        p[0] = ast.ExpressionNode(None, sign, p[2]).setKind(ast.ExpressionKind.EXP_UNARY) \
+            .setStartTokenPos(sign.pos).setEndTokenPos(p[2].pos)
 
 def p_simpleExpressionBody(p):
     """
-    simpleExpressionBody : simpleExpressionBody addingOperator term
+    simpleExpressionBody : simpleExpressionBody OP_PLUS term
+                         | simpleExpressionBody OP_MINUS term
+                         | simpleExpressionBody KW_OR term
                          | term
     """
-    if (len(p) == 4): p[0] = ast.ExpressionNode(p[1], p[2], p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
+    # The adding operators are inlined here.
+    if (len(p) == 4): 
+        p[0] = ast.ExpressionNode(p[1], operatorNode(p.slice[2]), p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
     else: p[0] = p[1]
 
 def p_term(p):
     """
-    term : term multiplyingOperator factor
+    term : term OP_MULT factor
+         | term OP_DIV factor
+         | term KW_DIV factor
+         | term KW_MOD factor
+         | term KW_AND factor
          | factor
     """
-    if (len(p) == 4): p[0] = ast.ExpressionNode(p[1], p[2], p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
+    # The multiplying operators are inlined here.
+    if (len(p) == 4): 
+        p[0] = ast.ExpressionNode(p[1], operatorNode(p.slice[2]), p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
     else: p[0] = p[1]
 
 def p_factor(p):
     """
-    factor : unsignedConstant
-           | setConstructor
-           | factorVariableFunctionDesignator
+    factor : setConstructor
            | KW_NOT factor
            | LPAREN expression RPAREN
     """
         #    | variable
         #    | functionDesignator
         #    | IDENTIFIER
-    if (isinstance(p[1], ast.Node)): 
-        if (p[1].ist(ast.UnsignedConstantNode)): p[0] = ast.ExpressionLikeNode(p[1])
-        else: p[0] = p[1]
+    if (isinstance(p[1], ast.Node)): p[0] = p[1]
     else:
         t = p.slice[1]
         match (t.type):
@@ -1107,42 +1013,48 @@ def p_factor(p):
             case "KW_NOT": p[0] = p[2]
             case "LPAREN": p[0] = p[2]
 
-#region ------- Set Constructor -------
-def p_setConstructor(p):
+def p_unsignedConstant(p):
     """
-    setConstructor : LSBRACKET setConstructorBody RSBRACKET
+    factor : UNSIGNED_REAL 
+           | UNSIGNED_INTEGER 
+           | STRING
+           | KW_NIL
     """
-    p[0] = ast.SetConstructorNode(p[2]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p.slice[3].pos)
+    # The unsigned constants are inlined here.
+    t = p.slice[1]
+    match(t.type):
+        case "UNSIGNED_REAL" | "UNSIGNED_INTEGER": 
+            const = ast.UnsignedConstantNode(ast.NumberNode(t.value, ast.NumberKind[t.type]).setTokenPos(t.pos))
+        case "STRING": const = ast.UnsignedConstantNode(ast.StringNode(p[1]).setTokenPos(t.pos))
+        case "KW_NIL": const = ast.UnsignedConstantNode(ast.SpecialSymbolNode(ast.SpecialSymbolKind.SS_NIL).setTokenPos(t.pos))
+    p[0] = ast.ExpressionLikeNode(const)
 
-def p_setConstructorBody(p):
+#region ------- Set Constructor -------
+def p_setConstructor(p):
     """
-    setConstructorBody : setConstructorBodyList
-                       | empty
+    setConstructor : LSBRACKET setConstructorBodyList RSBRACKET
+                   | LSBRACKET RSBRACKET
     """
-    p[0] = p[1]
+    body = p[2] if len(p) == 4 else None
+    p[0] = ast.SetConstructorNode(body).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p.slice[-1].pos)
 
 def p_setConstructorBodyList(p):
     """
     setConstructorBodyList : setConstructorBodyList COMMA elementDescription
                            | elementDescription
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_elementDescription(p):
     """
-    elementDescription : ordinalExpression elementDescriptionTail
-    """
-    p[0] = ast.ElementDescriptionNode(p[1], p[2]).setStartTokenPos(p[1].pos)
-    if (p[2] != None): p[0].setEndTokenPos(p[2].pos)
-
-def p_elementDescriptionTail(p):
+    elementDescription : expression
+                       | expression OP_RANGE expression
     """
-    elementDescriptionTail : OP_RANGE expression
-                           | empty
-    """
-    if (p[1] == None): p[0] = p[1]
-    else: p[0] = p[2]
+    tail = p[3] if len(p) == 4 else None
+    p[0] = ast.ElementDescriptionNode(p[1].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL), tail) \
+        .setStartTokenPos(p[1].pos)
+    if (tail != None): p[0].setEndTokenPos(tail.pos)
 #endregion ------- Set Constructor -------
 
 # def p_functionDesignator(p):
@@ -1155,9 +1067,10 @@ def p_elementDescriptionTail(p):
 # This rule is required because PLY.YACC is a fucking moron and, once again, doesn't respect the defined order.
 def p_factorVariableFunctionDesignator(p):
     """
-    factorVariableFunctionDesignator : variable functionDesignatorTail
+    factor : variable
+           | variable actualParameterList
     """
-    if (p[2] != None):
+    if (len(p) == 3):
         if (not p[1].ist(ast.EntireVariableNode)): raise SyntaxError()
         else: p[0] = ast.FunctionDesignatorNode(p[1].toIdentifierNode(), p[2]) \
             .setStartTokenPos(p[1].pos).setEndTokenPos(p[2].pos)
@@ -1165,40 +1078,9 @@ def p_factorVariableFunctionDesignator(p):
         p[0] = ast.ExpressionLikeNode(p[1]).setTokenPos(p[1].pos)
     # p[0] = ast.FunctionDesignatorNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos), p[2]) \
     #     .setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[2].pos)
-
-def p_functionDesignatorTail(p):
-    """
-    functionDesignatorTail : actualParameterList
-                           | empty
-    """
-    p[0] = p[1]
-
-def p_ordinalExpression(p):
-    """
-    ordinalExpression : expression
-    """
-    p[0] = p[1].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL)
-
-def p_booleanExpression(p):
-    """
-    booleanExpression : expression
-    """
-    p[0] = p[1].setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN)
-
-def p_integerExpression(p):
-    """
-    integerExpression : expression
-    """
-    p[0] = p[1].setStaticType(ast.ExpressionStaticType.EXP_INTEGER)
 #endregion ============== Section R8 ==============
 
 #region ============== Section R9 ==============
-def p_statementPart(p):
-    """
-    statementPart : compoundStatement
-    """
-    p[0] = p[1]
-
 def p_compoundStatement(p):
     """
     compoundStatement : KW_BEGIN statementSequence KW_END
@@ -1220,7 +1102,7 @@ def p_statementSequence(p):
     statementSequence : statementSequence SEMICOLON statement
                       | statement
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     # elif (p[1] == None): p[0] = [None]
     else: p[0] = [p[1]]
 
@@ -1253,50 +1135,54 @@ def p_statement(p):
     """
     p[0] = p[1]
 
+# The statement labels are inlined on both matched and unmatched statements.
 def p_matchedStatement(p):
     """
-    matchedStatement : statementLabel matchedStatementBody
+    matchedStatement : UNSIGNED_INTEGER COLON matchedStatementBody
+                     | matchedStatementBody
     """
-    if (p[2] != None): 
-        p[2].setTokenPos(p[2].pos)
-        if (p[1] != None): p[2].setLabel(
-            ast.NumberNode(p[1].value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(p[1].pos)
+    label = p.slice[1] if len(p) == 4 else None
+    stmt = p[len(p) - 1]
+    if (stmt != None): 
+        stmt.setTokenPos(stmt.pos)
+        if (label != None): stmt.setLabel(
+            ast.NumberNode(label.value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(label.pos)
         )
         
-    p[0] = p[2]
+    p[0] = stmt
 
+# The simple statements, and the matched structured statements (compound, conditional, repetitive and with statements)
+# are inlined here.
 def p_matchedStatementBody(p):
     """
-    matchedStatementBody : simpleStatement
-                         | matchedStructuredStatement
+    matchedStatementBody : assignmentStatement
+                         | procedureStatement
+                         | gotoStatement
+                         | empty
+                         | compoundStatement
+                         | matchedIfStatement
+                         | caseStatement
+                         | whileStatement
+                         | repeatStatement
+                         | forStatement
+                         | withStatement
     """
     p[0] = p[1]
 
 def p_unmatchedStatement(p):
     """
-    unmatchedStatement : statementLabel unmatchedStatementBody
+    unmatchedStatement : UNSIGNED_INTEGER COLON unmatchedIfStatement
+                       | unmatchedIfStatement
     """
-    if (p[2] != None): 
-        p[2].setTokenPos(p[2].pos)
-        if (p[1] != None): p[2].setLabel(
-            ast.NumberNode(p[1].value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(p[1].pos)
+    label = p.slice[1] if len(p) == 4 else None
+    stmt = p[len(p) - 1]
+    if (stmt != None): 
+        stmt.setTokenPos(stmt.pos)
+        if (label != None): stmt.setLabel(
+            ast.NumberNode(label.value, ast.NumberKind.UNSIGNED_INTEGER).setTokenPos(label.pos)
         )
         
-    p[0] = p[2]
-
-def p_unmatchedStatementBody(p):
-    """
-    unmatchedStatementBody : unmatchedConditionalStatement
-    """
-    p[0] = p[1]
-
-def p_statementLabel(p):
-    """
-    statementLabel : UNSIGNED_INTEGER COLON
-                   | empty
-    """
-    if (p[1] != None): p[0] = p.slice[1]
-    else: p[0] = p[1]
+    p[0] = stmt
 
 # def p_statementBody(p):
 #     """
@@ -1307,44 +1193,23 @@ def p_statementLabel(p):
 #     p[0] = p[1]
 
 #region -------------- Section 9.1 --------------
-def p_simpleStatement(p):
-    """
-    simpleStatement : assignmentStatement
-                    | procedureStatement
-                    | gotoStatement
-                    | empty
-    """
-    p[0] = p[1]
-
 def p_assignmentStatement(p):
     """
-    assignmentStatement : assignmentStatementHead OP_ASSIGN expression
+    assignmentStatement : variable OP_ASSIGN expression
     """
+                        # | IDENTIFIER OP_ASSIGN expression
     p[0] = ast.AssignmentStatementNode(p[1], p[3]).setStartTokenPos(p[1].pos).setEndTokenPos(p[3].pos)
 
-def p_assignmentStatementHead(p):
-    """
-    assignmentStatementHead : variable
-    """
-                            # | IDENTIFIER
-    if (isinstance(p[1], ast.Node)): p[0] = p[1]
-    else: p[0] = ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos)
-
+# NOTE: WriteParameterList ommited due to the behavior on the File Type being ommited on this implementation.
 def p_procedureStatement(p):
     """
-    procedureStatement : IDENTIFIER procedureStatementTail
+    procedureStatement : IDENTIFIER actualParameterList
+                       | IDENTIFIER
     """
-    p[0] = ast.ProcedureStatementNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos), p[2]) \
+    params = p[2] if len(p) == 3 else None
+    p[0] = ast.ProcedureStatementNode(ast.IdentifierNode(p[1]).setTokenPos(p.slice[1].pos), params) \
         .setStartTokenPos(p.slice[1].pos)
-    if (p[2] != None): p[0].setEndTokenPos(p[2].pos)
-
-# NOTE: WriteParameterList ommited due to the behavior on the File Type being ommited on this implementation.
-def p_procedureStatementTail(p):
-    """
-    procedureStatementTail : actualParameterList
-                           | empty
-    """
-    p[0] = p[1]
+    if (params != None): p[0].setEndTokenPos(params.pos)
 
 def p_gotoStatement(p):
     """
@@ -1355,44 +1220,7 @@ def p_gotoStatement(p):
 #endregion -------------- Section 9.1 --------------
 
 #region -------------- Section 9.2 --------------
-# def p_structuredStatement(p):
-#     """
-#     structuredStatement : compoundStatement
-#                         | conditionalStatement
-#                         | repetitiveStatement
-#                         | withStatement
-#     """
-#     p[0] = p[1]
-def p_matchedStructuredStatement(p):
-    """
-    matchedStructuredStatement : compoundStatement
-                               | matchedConditionalStatement
-                               | repetitiveStatement
-                               | withStatement
-    """
-    p[0] = p[1]
-
 #region ------- Section 9.2.2 -------
-# def p_conditionalStatement(p):
-#     """
-#     conditionalStatement : ifStatement
-#                          | caseStatement
-#     """
-#     p[0] = p[1]
-
-def p_matchedConditionalStatement(p):
-    """
-    matchedConditionalStatement : matchedIfStatement
-                                | caseStatement
-    """
-    p[0] = p[1]
-
-def p_unmatchedConditionalStatement(p):
-    """
-    unmatchedConditionalStatement : unmatchedIfStatement
-    """
-    p[0] = p[1]
-
 # def p_ifStatement(p):
 #     """
 #     ifStatement : KW_IF booleanExpression KW_THEN statement ifStatementTail
@@ -1411,29 +1239,31 @@ def p_unmatchedConditionalStatement(p):
 
 def p_matchedIfStatement(p):
     """
-    matchedIfStatement : KW_IF booleanExpression KW_THEN matchedStatement KW_ELSE matchedStatement
+    matchedIfStatement : KW_IF expression KW_THEN matchedStatement KW_ELSE matchedStatement
     """
-    p[0] = ast.ConditionalStatementNode(p[2], p[4], p[6]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[6].pos)
+    cond = p[2].setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN)
+    p[0] = ast.ConditionalStatementNode(cond, p[4], p[6]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[6].pos)
 
 def p_unmatchedIfStatement(p):
     """
-    unmatchedIfStatement : KW_IF booleanExpression KW_THEN statement
-                         | KW_IF booleanExpression KW_THEN matchedStatement KW_ELSE unmatchedStatement
+    unmatchedIfStatement : KW_IF expression KW_THEN statement
+                         | KW_IF expression KW_THEN matchedStatement KW_ELSE unmatchedStatement
     """
+    cond = p[2].setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN)
     if (len(p) == 5):
-        p[0] = ast.ConditionalStatementNode(p[2], p[4], None).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[4].pos)
+        p[0] = ast.ConditionalStatementNode(cond, p[4], None).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[4].pos)
     else:
-        p[0] = ast.ConditionalStatementNode(p[2], p[4], p[6]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[6].pos)
+        p[0] = ast.ConditionalStatementNode(cond, p[4], p[6]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[6].pos)
 
 def p_caseStatement(p):
     """
-    caseStatement : KW_CASE ordinalExpression KW_OF caseStatementBody caseStatementTail
+    caseStatement : KW_CASE expression KW_OF caseStatementBody caseStatementTail
     """
-    p[0] = ast.CaseStatementNode(p[2], p[4]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[5].pos)
+    p[0] = ast.CaseStatementNode(p[2].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL), p[4]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[5].pos)
 def p_caseStatement_error(p):
     """
     caseStatement : KW_CASE error KW_OF caseStatementBody caseStatementTail
-                  | KW_CASE ordinalExpression KW_OF error caseStatementTail
+                  | KW_CASE expression KW_OF error caseStatementTail
     """
     t = None
     if (p.slice[2].type == "error"): t = p[2]
@@ -1447,7 +1277,7 @@ def p_caseStatementBody(p):
     caseStatementBody : caseStatementBody SEMICOLON case
                       | case
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_case(p):
@@ -1468,7 +1298,7 @@ def p_caseHeading(p):
     caseHeading : caseHeading COMMA constElem
                 | constElem
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3]]
+    if (len(p) == 4): p[0] = appended(p[1], p[3])
     else: p[0] = [p[1]]
 
 def p_caseStatementTail(p):
@@ -1480,46 +1310,38 @@ def p_caseStatementTail(p):
 #endregion ------- Section 9.2.2 -------
 
 #region ------- Section 9.2.3 -------
-def p_repetitiveStatement(p):
-    """
-    repetitiveStatement : whileStatement
-                        | repeatStatement
-                        | forStatement
-    """
-    p[0] = p[1]
-
 def p_whileStatement(p):
     """
-    whileStatement : KW_WHILE booleanExpression KW_DO statement
+    whileStatement : KW_WHILE expression KW_DO statement
     """
-    p[0] = ast.WhileStatementNode(p[2], p[4]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[4].pos)
+    p[0] = ast.WhileStatementNode(p[2].setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN), p[4]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[4].pos)
 
 def p_repeatStatement(p):
     """
-    repeatStatement : KW_REPEAT statementSequence KW_UNTIL booleanExpression
+    repeatStatement : KW_REPEAT statementSequence KW_UNTIL expression
     """
     # In this part, a trailing semicolon IS allowed, however, the grammar will yield an empty element which will not
     # be present if the trailing semicolon is ommited. If the last element is None, pop it.
     if (p[2][-1] == None): p[2].pop()
-    p[0] = ast.RepeatStatementNode(p[4], p[2]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[4].pos)
+    p[0] = ast.RepeatStatementNode(p[4].setStaticType(ast.ExpressionStaticType.EXP_BOOLEAN), p[2]).setStartTokenPos(p.slice[1].pos).setEndTokenPos(p[4].pos)
 
 def p_forStatement(p):
     """
-    forStatement : KW_FOR IDENTIFIER OP_ASSIGN ordinalExpression forStatementTail
+    forStatement : KW_FOR IDENTIFIER OP_ASSIGN expression forStatementTail
     """
     tail = p[5]
     if (tail == None): return None
 
     p[0] = ast.ForStatementNode(
         ast.IdentifierNode(p[2]).setTokenPos(p.slice[2].pos), 
-        p[4], 
+        p[4].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL), 
         ast.ForTraversalMode.fromKeyword(tail[0].type),
         tail[1], 
         tail[2]
     ).setStartTokenPos(p.slice[1].pos).setEndTokenPos(tail[0].pos)
 def p_forStatement_error(p):
     """
-    forStatement : KW_FOR error OP_ASSIGN ordinalExpression forStatementTail
+    forStatement : KW_FOR error OP_ASSIGN expression forStatementTail
                  | KW_FOR IDENTIFIER OP_ASSIGN error forStatementTail
     """
     # t = None
@@ -1531,16 +1353,16 @@ def p_forStatement_error(p):
 
 def p_forStatementTail(p):
     """
-    forStatementTail : KW_TO ordinalExpression KW_DO statement
-                     | KW_DOWNTO ordinalExpression KW_DO statement
+    forStatementTail : KW_TO expression KW_DO statement
+                     | KW_DOWNTO expression KW_DO statement
     """
-    p[0] = (p.slice[1], p[2], p[4])
+    p[0] = (p.slice[1], p[2].setStaticType(ast.ExpressionStaticType.EXP_ORDINAL), p[4])
 def p_forStatementTail_error(p):
     """
     forStatementTail : KW_TO error KW_DO statement
                      | KW_DOWNTO error KW_DO statement
-                     | KW_TO ordinalExpression KW_DO error
-                     | KW_DOWNTO ordinalExpression KW_DO error
+                     | KW_TO expression KW_DO error
+                     | KW_DOWNTO expression KW_DO error
     """
     pass
 #endregion ------- Section 9.2.3 -------
@@ -1563,7 +1385,7 @@ def p_recordVariableList(p):
     recordVariableList : recordVariableList COMMA variable
                        | variable
     """
-    if (len(p) == 4): p[0] = p[1] + [p[3].setStaticType(ast.VariableStaticType.VARIABLE_ST_RECORD)]
+    if (len(p) == 4): p[0] = appended(p[1], p[3].setStaticType(ast.VariableStaticType.VARIABLE_ST_RECORD))
     else: p[0] = [p[1].setStaticType(ast.VariableStaticType.VARIABLE_ST_RECORD)]
 #endregion ------- Section 9.2.4 -------
 #endregion -------------- Section 9.2 --------------
@@ -1576,11 +1398,13 @@ def p_empty(p):
     pass
 
 def p_error(t):
-    print("ERR:", t)
+    sink = currentParser().sink
+    sink.trace("ERR:", t)
 
     if t == None:
         # Here, I cheat by fetching the lexer directly, in order to get the last position the lexer has processed, due 
         #   to being unable to fetch it from the token, as it is None.
+        lexer = currentParser().lexer
         diag = emitDiagnostic(
             lexer, 
             DiagnosticType.UNEXPECTED_EOF, 
@@ -1588,18 +1412,14 @@ def p_error(t):
             {},
             TokenPos(lexer, lexer.lexpos, lexer.lexpos)
         )
-        print(
-            f"\x1b[31mSYNTAX ERROR @{lexer.lexpos}:" \
-            f"\x1b[0m {diag.toString(lexer, emitMark = False, emitPos = False)}"
-        )
+        sink.diagnostic(diag, lexer, f"SYNTAX ERROR @{lexer.lexpos}")
     else:
-        print("NERR:", t.lexpos, t.pos)
+        sink.trace("NERR:", t.lexpos, t.pos)
         syn_error(t, DiagnosticType.UNEXPECTED_TOKEN, { "token": t.type })
 
 def syn_error(t, dType, dArgs):
-    caller = getframeinfo(stack()[1][0])
-
-    lex = getattr(t, "lexer", lexer)
+    p = currentParser()
+    lex = getattr(t, "lexer", None) or p.lexer
 
     diag = emitDiagnostic(
             lex, 
@@ -1608,13 +1428,13 @@ def syn_error(t, dType, dArgs):
             dArgs,
             t.pos
     )
-    print(
-        f"\x1b[31m[{caller.filename}:{caller.lineno}] SYNTAX ERROR @{t.lexpos}:\x1b[0m" \
-        f" {diag.toString(lex, emitMark = False, emitPos = False)}"
-    )
+    if (p.sink.enabled(LogLevel.ERROR)):
+        header = f"[{callerLocation()}] " if p.options["debug"] else ""
+        p.sink.diagnostic(diag, lex, f"{header}SYNTAX ERROR @{t.lexpos}")
 
 #region ------- Diagnostics -------
-# This function emits a syntatic diagnostic. Diagnostics are defined on the property "diagnostics" on the parser.
+# This function emits a syntatic diagnostic. Diagnostics are defined on the property "diagnostics" on the current 
+#   parser.
 def emitDiagnostic(
     l, 
     dtype: DiagnosticType, 
@@ -1627,20 +1447,60 @@ def emitDiagnostic(
     rcEndPos = _pos.end
 
     diag = Diagnostic(DiagnosticSource.SYNANAL, dtype, dkind, rcStartPos, rcEndPos, args)
-    parser.diagnostics.append(diag)
-    parser._diagnosticTrace.append(diag)
+    p = currentParser()
+    p.diagnostics.append(diag)
+    p._diagnosticTrace.append(diag)
+    if (dkind == DiagnosticKind.ERROR): chargeBudget(p, "maxErrors", len(p.diagnostics))
 
     return diag
 
 # This function removes the latest diagnostic from the parser list. Used on resynchronization rules for more specialized
 #   per-rule error handling.
 def popDiagnostic():
-    return parser.diagnostics.pop()
+    return currentParser().diagnostics.pop()
 #endregion ------- Diagnostics -------
 
+#region ------- Recovery Budget -------
+class _BudgetExceeded(Exception):
+    def __init__(self, budget, limit):
+        self.budget = budget
+        self.limit = limit
+
+# This function checks the spending on one of the recovery budgets of a parser (the option of the same name), aborting 
+#   the parse once it exceeds it. Budgets set to None are unlimited.
+def chargeBudget(p, budget, spent):
+    limit = p.options[budget]
+    if (limit != None and spent > limit): raise _BudgetExceeded(budget, limit)
+
+def checkDeadline(p):
+    if (p._deadline != None and time.perf_counter() > p._deadline): 
+        raise _BudgetExceeded("timeLimit", p.options["timeLimit"])
+
+# This function emits the critical diagnostic of a parse aborted by exceeding it's recovery budget, at the last position
+#   the lexer has processed.
+def budgetExceeded(e: _BudgetExceeded):
+    p = currentParser()
+    lexer = p.lexer
+    diag = emitDiagnostic(
+        lexer, 
+        DiagnosticType.RECOVERY_BUDGET_EXCEEDED, 
+        DiagnosticKind.CRITICAL, 
+        { "budget": e.budget, "limit": e.limit },
+        TokenPos(lexer, lexer.lexpos, lexer.lexpos)
+    )
+    p.sink.diagnostic(diag, lexer, f"SYNTAX ERROR @{lexer.lexpos}")
+#endregion ------- Recovery Budget -------
+
 #region ------- Parser Utils -------
+# This function appends an item to a list in place, returning the list. Used by the left-recursive list productions, 
+#   which would otherwise copy the whole list on every reduction (quadratic on the length of the list), as the list of
+#   the inner production is never used by anything else.
+def appended(l: list, item) -> list:
+    l.append(item)
+    return l
+
 def advanceUntil(cond, p = None):
-    if (p == None): p = parser
+    if (p == None): p = currentParser()
 
     tok = p.token()
     trace("Eval skip:", tok)
@@ -1649,6 +1509,8 @@ def advanceUntil(cond, p = None):
             trace("Break")
             break
         trace("Skipping.")
+        p.skippedTokens += 1
+        chargeBudget(p, "maxSkippedTokens", p.skippedTokens)
         tok = p.token()
 
     # parser.errok()
@@ -1657,14 +1519,311 @@ def advanceUntilSemicolon():
     advanceUntil(lambda t: t.type == 'SEMICOLON')
 
 def trace(*args):
-    if (parser.options["verbose"]): print(*args)
+    currentParser().sink.trace(*args)
 #endregion ------- Parser Utils -------
 
-parser = yacc.yacc()
-parser.diagnostics = []
-parser._diagnosticTrace = []
-parser.options = {
-    "verbose": True
+#region ------- Parser Build -------
+# Generating the LALR tables is by far the most expensive part of the compiler start up. The tables are cached in their
+#   pickled form (see compiler.tablecache), signed with the grammar itself: the docstrings of the production functions 
+#   (in definition order), the precedence table, the start symbol and the token list. As the pickled tables are signed, 
+#   they are loaded without PLY re-validating them against the grammar.
+#
+#   The build options are read when this module is first imported, and can be set through the environment:
+#     - PASCAL_PARSER_DEBUG=1: Writes the grammar debug file (parser.out) to the tables directory when the tables are 
+#         generated.
+#     - PASCAL_PARSER_WRITE_TABLES=0: Never caches the generated tables. They are generated on every start up.
+PARSER_BUILD_OPTIONS = {
+    "debug": os.environ.get("PASCAL_PARSER_DEBUG", "0") == "1",
+    "writeTables": os.environ.get("PASCAL_PARSER_WRITE_TABLES", "1") == "1"
+}
+
+def _grammarSignature():
+    prods = sorted(
+        (f for (name, f) in globals().items() if name.startswith("p_") and callable(f)), 
+        key = lambda f: f.__code__.co_firstlineno
+    )
+
+    return tablecache.signature(
+        start, 
+        precedence, 
+        tokens, 
+        yacc.__tabversion__, 
+        *(f"{f.__name__}:{f.__doc__}" for f in prods)
+    )
+
+def buildParser(debug = False, writeTables = True) -> yacc.LRParser:
+    """
+        Builds the parser, loading it's tables from the table cache if up-to-date tables exist, or generating them 
+        otherwise. If debug is set, the grammar debug file is written to the tables directory when the tables are 
+        generated. If writeTables is not set, or the tables cannot be cached, the generated tables are not written.
+    """
+    sig = _grammarSignature()
+    canCache = tablecache.ensureDir()
+
+    path = tablecache.tablePath("parsetab", sig, ".pickle")
+    if (canCache and os.path.isfile(path)):
+        try:
+            return yacc.yacc(debug = False, optimize = 1, picklefile = path)
+        except Exception:
+            pass # Unreadable tables (e.g. partially written). Generate them below.
+
+    outputdir = tablecache.TABLES_DIR if canCache else None
+    if (not (writeTables and canCache)): 
+        return yacc.yacc(debug = debug and canCache, write_tables = False, outputdir = outputdir)
+
+    tmpPath = os.path.join(tablecache.TABLES_DIR, f"{tablecache.tempTableName('parsetab', sig)}.pickle")
+    built = yacc.yacc(debug = debug, picklefile = tmpPath, outputdir = outputdir)
+    if (os.path.isfile(tmpPath)): tablecache.commitTable(tmpPath, "parsetab", sig, ".pickle")
+
+    return built
+
+_baseParser = buildParser(**PARSER_BUILD_OPTIONS)
+#endregion ------- Parser Build -------
+
+#region ------- Validation -------
+# A source text can be parsed only to validate it's syntax (see PascalParser#validateSource), in which case no AST is 
+#   built: the production functions are replaced by the validation functions below, which yield a placeholder value 
+#   (VALID) instead of a node, or None where the production function would. The resynchronization rules and the 
+#   backtracks are still run as they are, so that the same diagnostics are emitted.
+#   The production functions that reject a production by it's values (raising a SyntaxError), or whose values other
+#   production functions check, have a validation function of their own on VALIDATION_FUNCTIONS, which must be kept in 
+#   sync with them.
+VALID = True
+ENTIRE_VARIABLE = "ENTIRE_VARIABLE"
+
+def validateProduction(p):
+    p[0] = VALID
+
+def validateProgramHeading(p):
+    # The lexer is peeked as p_programHeading does, as it changes how the next token is lexed.
+    if (p[3] != None): p.slice[1].lexer.peek()
+    p[0] = VALID
+
+def validateProgramExternals(p):
+    p[0] = VALID if len(p) == 4 else None
+
+def validateBlock(p):
+    if (p[6] == None): raise SyntaxError()
+    p[0] = VALID
+
+def validateType(p):
+    p[0] = None if p[len(p) - 1] == None else VALID
+
+def validateRecordSection(p):
+    if (p[1] == None or p[3] == None): raise SyntaxError
+    p[0] = VALID
+
+def validateEntireVariable(p):
+    p[0] = ENTIRE_VARIABLE
+
+def validateFactorVariable(p):
+    if (len(p) == 3 and p[1] != ENTIRE_VARIABLE): raise SyntaxError()
+    p[0] = VALID
+
+VALIDATION_FUNCTIONS = {
+    "p_programHeading": validateProgramHeading,
+    "p_programExternals": validateProgramExternals,
+    "p_block": validateBlock,
+    "p_type": validateType,
+    "p_recordSection": validateRecordSection,
+    "p_entireVariable": validateEntireVariable,
+    "p_factorVariableFunctionDesignator": validateFactorVariable
 }
-parser.backtracks = {}
 
+def validationFunction(prod):
+    """
+        Gets the function a production should be reduced with when validating, which is the production function itself
+        for the resynchronization rules and the backtracks.
+    """
+    if (prod.name.startswith("bt_") or "error" in prod.str.split()[2:]): return prod.callable
+
+    return VALIDATION_FUNCTIONS.get(prod.func, validateProduction)
+#endregion ------- Validation -------
+
+#region ------- Parser Instances -------
+# The grammar rules and the utilities in this module act on the parser currently parsing on the calling thread (see 
+#   currentParser), so that each thread can hold it's own parser (and lexer), with it's own diagnostics.
+_current = threading.local()
+
+def currentParser():
+    """
+        Gets the parser currently parsing on the calling thread, or the default parser (see parser) if there is none.
+    """
+    return getattr(_current, "parser", None) or parser
+
+class PascalParser(yacc.LRParser):
+    """
+    A parser for Standard Pascal, with it's own lexer and per-parse state:
+      - diagnostics: The syntatic diagnostics of the last parse.
+      - _diagnosticTrace: Every syntatic diagnostic emitted during the last parse, including the ones removed by 
+    resynchronization rules.
+      - backtracks: The backtrack tokens captured during the last parse (see the Backtracks region).
+      - skippedTokens: The tokens skipped by the error recovery during the last parse.
+    
+    Parser instances share the parsing tables, which are only built once per process, so creating and resetting them 
+    is cheap. A parser should not be used by more than one thread at a time.
+
+    The syntax errors and the traces of the grammar rules are written to the parser's sink, which is silent unless it's
+    log level is raised (LogLevel.ERROR for the syntax errors, LogLevel.TRACE for the traces).
+
+    A source text can either be parsed into it's AST (see parseSource), or only validated (see validateSource), which 
+    is faster as no AST is built.
+
+    When a parse cache (see compiler.parsecache) is set as the parser's cache, parseSource takes the AST and the 
+    diagnostics of a source text parsed before from it, instead of lexing and parsing it again.
+
+    Options:
+      - debug: Whether syntax errors should be prefixed with the location of the rule that emitted them.
+      - countReductions: Whether the reductions of the last parse should be counted on reductions, by production. 
+    Counting slows the parser down, so it's only meant for instrumentation (see tests/bench.py reductions).
+      - maxErrors: The maximum number of syntax errors a parse may have.
+      - maxSkippedTokens: The maximum number of tokens the error recovery may skip during a parse.
+      - timeLimit: The maximum time, in seconds, a parse may take.
+    These make up the error recovery budget: a parse that exceeds any of them is aborted with a critical diagnostic, 
+    returning None, and the rest of the source text is left unlexed (see PascalLexer#abandon). Any of them can be set 
+    to None, for no limit.
+    """
+    def __init__(self, l: PascalLexer = None, base: yacc.LRParser = None, sink: DiagnosticSink = None):
+        self.__dict__.update((base or _baseParser).__dict__)
+        self.lexer = l if l != None else newLexer()
+        self.sink = sink if sink != None else DiagnosticSink()
+        self.cache = None
+        self.options = {
+            "debug": False,
+            "countReductions": False,
+            "maxErrors": 100,
+            "maxSkippedTokens": 1000,
+            "timeLimit": None
+        }
+        self._productions = self.productions
+        self._productionSets = {}
+        self.reset()
+
+    def reset(self):
+        self.diagnostics = []
+        self._diagnosticTrace = []
+        self.backtracks = {}
+        self.reductions = {}
+        self.skippedTokens = 0
+        self._deadline = None
+
+    def _productionSet(self, validate, count):
+        """
+            Gets the productions of the parsing tables to parse with: with their production functions replaced by their
+            validation functions if validate is set, and wrapped in order to count their reductions on this parser if 
+            count is set. The productions are only copied once per parser.
+        """
+        setKey = (validate, count)
+        if (setKey in self._productionSets): return self._productionSets[setKey]
+
+        def counted(func, key):
+            def countedFunc(p):
+                self.reductions[key] = self.reductions.get(key, 0) + 1
+                func(p)
+
+            return countedFunc
+
+        prods = self._productions
+        if (validate or count):
+            prods = []
+            for prod in self._productions:
+                prod = copy.copy(prod)
+                if (prod.callable != None):
+                    if (validate): prod.callable = validationFunction(prod)
+                    if (count): prod.callable = counted(prod.callable, prod.str)
+                prods.append(prod)
+
+        self._productionSets[setKey] = prods
+        return prods
+
+    def _budgetedTokenFunc(self, tokenfunc):
+        """
+            Wraps a token function in order to count the tokens skipped by the error recovery, and to check the time 
+            limit every few tokens.
+            PLY discards tokens silently while recovering, so the skipped tokens are counted when the next token is 
+            requested: the previous one was discarded if the error symbol is still on top of the stack (the token 
+            couldn't be shifted after it), or if the stack was rolled back to the start state.
+        """
+        fetched = 0
+        def budgetedToken():
+            nonlocal fetched
+            if (fetched != 0 and (self.symstack[-1].type == "error" or len(self.statestack) <= 1)):
+                self.skippedTokens += 1
+                chargeBudget(self, "maxSkippedTokens", self.skippedTokens)
+
+            fetched += 1
+            if (self._deadline != None and (fetched & 0xFF) == 0): checkDeadline(self)
+            return tokenfunc()
+
+        return budgetedToken
+
+    def parseSource(self, src, debug = False, tokenfunc = None):
+        """
+            Parses a source text, returning it's AST, or None on a critical error (including exceeding the error 
+            recovery budget). Once this returns (or raises), the 
+            lexer holds the lexical diagnostics of the whole source text, and the parser holds the syntatic diagnostics.
+            A parse aborted by the recovery budget only lexes as far as it parsed (see PascalLexer#truncated).
+
+            A custom token function can be given (e.g. for tracing), which must obtain it's tokens from 
+            lexer.getExtendedToken. The cache is only used when neither debugging nor using a custom token function, as
+            both expect the source text to be parsed.
+        """
+        if (self.cache != None and not debug and tokenfunc == None):
+            return self.cache.parse(self, src, lambda: self._parseSource(src, False, None, False))
+
+        return self._parseSource(src, debug, tokenfunc, False)
+
+    def validateSource(self, src, debug = False, tokenfunc = None) -> bool:
+        """
+            Parses a source text without building it's AST, returning whether it is a syntatically valid program: one 
+            without lexical or syntatic errors. The diagnostics are collected the same way as on parseSource.
+
+            The AST is built from the grammar rules, so the errors that only occur while building it (e.g. a crashing 
+            production function) are not detected.
+        """
+        pout = self._parseSource(src, debug, tokenfunc, True)
+
+        return pout != None and len(self.diagnostics) == 0 \
+            and not any(diag.kind in (DiagnosticKind.ERROR, DiagnosticKind.CRITICAL) for diag in self.lexer.diagnostics)
+
+    def _parseSource(self, src, debug, tokenfunc, validate):
+        self.reset()
+        self.lexer.reset()
+        self.productions = self._productionSet(validate, self.options["countReductions"])
+        if (self.options["timeLimit"] != None): self._deadline = time.perf_counter() + self.options["timeLimit"]
+        tokenfunc = self._budgetedTokenFunc(tokenfunc or self.lexer.getExtendedToken)
+
+        prev = getattr(_current, "parser", None)
+        _current.parser = self
+        aborted = False
+        try:
+            return self.parse(src, self.lexer, debug, False, tokenfunc)
+        except _BudgetExceeded as e:
+            aborted = True
+            budgetExceeded(e)
+            return None
+        finally:
+            # The rest of an aborted parse is left unlexed, as lexing it would be as unbounded as parsing it. The same 
+            #   goes for lexing past the time limit.
+            if (aborted): self.lexer.abandon()
+            else: self.lexer.drain(self._deadline)
+            _current.parser = prev
+
+FRONTENDS = ("lalr", "descent")
+
+def newParser(l: PascalLexer = None, sink: DiagnosticSink = None, frontend: str = "lalr"):
+    """
+        Creates a parser for the given frontend: "lalr" for the grammar rules on this module, or "descent" for the
+        recursive descent parser on descent.py. Both build the same AST.
+    """
+    match (frontend):
+        case "lalr":
+            return PascalParser(l, sink = sink)
+        case "descent":
+            from .descent import PascalDescentParser
+            return PascalDescentParser(l, sink = sink)
+        case _:
+            raise ValueError(f"Unknown parser frontend: {frontend}")
+
+parser = newParser(lexer)
+#endregion ------- Parser Instances -------
@@ -0,0 +1,67 @@
+import os
+import hashlib
+import threading
+
+#
+# Table Cache
+#
+#   This module manages the on-disk cache of the tables generated by PLY for the lexer and the parser, which are too
+# expensive to rebuild every time the compiler starts.
+#   Every table is named after a signature of whatever it was generated from (e.g. the rule docstrings), so a stale
+# table is never loaded. Instead, a new table is generated, and the tables with other signatures are removed once it is
+# written.
+#   Tables are always written under a temporary name and then moved in place, so that concurrent compiler processes
+# never load a partially written table.
+#
+
+TABLES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "tables")
+
+def signature(*parts) -> str:
+    """
+        Computes a signature over the given parts, which can be either bytes or anything convertible to a string.
+    """
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\0")
+
+    return h.hexdigest()[:16]
+
+def ensureDir() -> bool:
+    """
+        Creates the tables directory if needed. Returns False if it can't be created, in which case tables shouldn't be
+        cached.
+    """
+    try:
+        os.makedirs(TABLES_DIR, exist_ok = True)
+        return True
+    except OSError:
+        return False
+
+def tableName(prefix: str, sig: str) -> str:
+    return f"{prefix}_{sig}"
+
+def tablePath(prefix: str, sig: str, ext: str) -> str:
+    return os.path.join(TABLES_DIR, f"{tableName(prefix, sig)}{ext}")
+
+def tempTableName(prefix: str, sig: str) -> str:
+    """
+        Gets a name for a table being written, unique to the current process and thread.
+    """
+    return f"{tableName(prefix, sig)}_{os.getpid()}_{threading.get_ident()}"
+
+def commitTable(tmpPath: str, prefix: str, sig: str, ext: str):
+    """
+        Moves a table written to tmpPath to it's final location, and removes the tables of previous signatures.
+    """
+    try:
+        os.replace(tmpPath, tablePath(prefix, sig, ext))
+
+        # Temporary tables of other processes have an underscore after the signature and are left alone.
+        for f in os.listdir(TABLES_DIR):
+            if (not f.startswith(f"{prefix}_") or not f.endswith(ext)): continue
+
+            fsig = f[len(prefix) + 1:-len(ext)]
+            if (fsig != sig and not "_" in fsig): os.remove(os.path.join(TABLES_DIR, f))
+    except OSError:
+        pass
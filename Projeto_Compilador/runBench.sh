@@ -0,0 +1,2 @@
+#!/bin/bash
+python3 -m tests.bench $@
\ No newline at end of file
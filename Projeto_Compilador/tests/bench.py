@@ -0,0 +1,580 @@
+import os
+import time
+import gc
+import random
+import tempfile
+import tracemalloc
+import contextlib
+from compiler.lexer import newLexer, iterTokens
+from compiler.synanaler import newParser, FRONTENDS
+import compiler.semanaler as semanal
+import compiler.ast as ast
+from util.cli import CLI, CLICommand
+from tests.snippets import findSnippets
+
+#
+# Benchmarks
+#
+#   This module measures the throughput of the compiler stages over a corpus built from the test suite cases. The
+# corpus is scaled by repeating the sources, so that the fixed costs of each run become negligible.
+#   Each benchmark is run a number of times and the best run is reported, as it is the one least affected by noise.
+# The peak memory is measured on a separate run, as tracing the allocations slows it down considerably.
+#   Synthetic corpora (see makeSyntheticSource) are generated from a seed, so that the same corpus can be benchmarked 
+# between commits. The AST memory benchmark generates it's own, syntatically valid, programs (see makeASTSource).
+#
+
+def loadSources(target):
+    """
+        Loads every source file under the given test suite target (a directory under tests/cases, or a single case).
+    """
+    srcs = []
+    for f in findSnippets(target):
+        with open(f) as sf:
+            srcs.append(sf.read())
+
+    return srcs
+
+def loadCorpus(target, scale = 1):
+    """
+        Loads every source file under the given test suite target and concatenates them, repeated scale times.
+    """
+    return "\n".join(loadSources(target) * scale)
+
+def lexAll(l, src):
+    """
+        Lexes the whole source text with the given lexer, the same way the parser does, returning the token count.
+    """
+    l.reset()
+    l.input(src)
+
+    count = 0
+    while (l.getExtendedToken() != None): count += 1
+    l.finish()
+
+    return count
+
+def lexMapped(l, path):
+    """
+        Lexes a source file through the memory-mapped token stream, returning the token count.
+    """
+    count = 0
+    for _ in iterTokens(path, l, mapped = True): count += 1
+
+    return count
+
+def timeRuns(func, runs):
+    """
+        Runs func the given number of times, returning the best elapsed time and the result of the last run.
+    """
+    best = None
+    ret = None
+    for _ in range(0, runs):
+        start = time.perf_counter()
+        ret = func()
+        elapsed = time.perf_counter() - start
+        if (best == None or elapsed < best): best = elapsed
+
+    return (best, ret)
+
+def peakMemory(func):
+    """
+        Runs func once, returning the peak memory allocated while it ran (in bytes).
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def report(label, src, tokens, elapsed, runs, peak = None):
+    size = len(src.encode("utf-8"))
+
+    print(f"\x1b[36m{label}\x1b[0m ({size} bytes, {src.count(chr(10)) + 1} lines)")
+    print(f"  - Tokens:      {tokens}")
+    print(f"  - Best time:   {elapsed:.4f}s ({runs} runs)")
+    print(f"  - Throughput:  {tokens / elapsed:,.0f} tokens/s, {size / elapsed / 1e6:.3f} MB/s")
+    if (peak != None): print(f"  - Peak memory: {peak / 1e6:.3f} MB ({peak / max(tokens, 1):,.0f} bytes/token)")
+
+def benchLex(target = "proj", scale = 100, runs = 5, mapped = False):
+    src = loadCorpus(target, scale)
+    l = newLexer()
+
+    if (mapped):
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir, "corpus.pas")
+            with open(path, "w") as f:
+                f.write(src)
+
+            (elapsed, tokens) = timeRuns(lambda: lexMapped(l, path), runs)
+    else:
+        (elapsed, tokens) = timeRuns(lambda: lexAll(l, src), runs)
+
+    report(f"LEX {target} x{scale}{' (mapped)' if mapped else ''}", src, tokens, elapsed, runs)
+
+def makeCommentSource(size = 1 << 20, lineLen = 80):
+    """
+        Builds a small program with a comment of about size bytes, made of lines of lineLen characters, in the likes of 
+        a license header or a block of disabled code.
+    """
+    line = ("x := x + 1; " * (lineLen // 12 + 1))[:lineLen - 1] + "\n"
+    body = line * (size // lineLen)
+
+    return f"program Comment;\n{{\n{body}}}\n(*\n{body}*)\nbegin\nend.\n"
+
+def benchComment(size = 1 << 20, runs = 5):
+    src = makeCommentSource(size)
+    l = newLexer()
+
+    (elapsed, tokens) = timeRuns(lambda: lexAll(l, src), runs)
+    size = len(src.encode("utf-8"))
+
+    print(f"\x1b[36mCOMMENT\x1b[0m ({size} bytes, {src.count(chr(10)) + 1} lines, 2 comments)")
+    print(f"  - Tokens:     {tokens}")
+    print(f"  - Best time:  {elapsed:.4f}s ({runs} runs)")
+    print(f"  - Throughput: {size / elapsed / 1e6:.3f} MB/s")
+
+#region ------- Error Paths -------
+def compileAll(p, srcs):
+    """
+        Runs the lexical, syntatic and semantic analysis over each source text, the same way the test driver does, 
+        returning the amount of diagnostics emitted.
+    """
+    count = 0
+    for src in srcs:
+        # Some of the malformed programs still crash the grammar rules, which the test driver reports as a failure.
+        try:
+            pout = p.parseSource(src)
+        except Exception:
+            pout = None
+        count += len(p.lexer.diagnostics) + len(p.diagnostics)
+        if (pout == None or len(p.diagnostics) != 0): continue
+
+        # The semantic state isn't reset between analyses.
+        semanal.SA_STATE["diagnostics"].clear()
+        semanal.SA_STATE["scopes"].clear()
+        try:
+            semanal.analyzeSemantics(pout)
+        except Exception:
+            pass
+        count += len(semanal.getDiagnostics())
+
+    return count
+
+def benchErrors(target = "fail", scale = 20, runs = 5, debug = False):
+    srcs = loadSources(target) * scale
+    p = newParser()
+    p.options["debug"] = debug
+    semanal.SA_STATE["debug"] = debug
+
+    # The parser is silent, as it would be on a batch compilation, but the semantic analyser still prints it's
+    #   diagnostics.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        (elapsed, diags) = timeRuns(lambda: compileAll(p, srcs), runs)
+
+    print(f"\x1b[36mERRORS {target} x{scale}{' (debug)' if debug else ''}\x1b[0m ({len(srcs)} sources)")
+    print(f"  - Diagnostics: {diags}")
+    print(f"  - Best time:   {elapsed:.4f}s ({runs} runs)")
+    print(f"  - Throughput:  {len(srcs) / elapsed:,.1f} sources/s, {diags / elapsed:,.0f} diagnostics/s")
+#endregion ------- Error Paths -------
+
+#region ------- Reductions -------
+def benchReductions(target = "proj", top = 10, runs = 5):
+    srcs = loadSources(target)
+    l = newLexer()
+    tokens = sum(lexAll(l, src) for src in srcs)
+
+    # The reductions are counted on a separate run, as counting them slows the parser down.
+    p = newParser()
+    p.options["countReductions"] = True
+    reductions = {}
+    for src in srcs:
+        p.parseSource(src)
+        for (prod, count) in p.reductions.items(): reductions[prod] = reductions.get(prod, 0) + count
+    total = sum(reductions.values())
+
+    p = newParser()
+    (elapsed, _) = timeRuns(lambda: parseAll(p, srcs), runs)
+
+    print(f"\x1b[36mREDUCTIONS {target}\x1b[0m ({len(srcs)} sources)")
+    print(f"  - Tokens:      {tokens}")
+    print(f"  - Reductions:  {total} ({total / tokens:.2f} per token)")
+    print(f"  - Best time:   {elapsed:.4f}s ({runs} runs)")
+    print(f"  - Most reduced productions:")
+    for (prod, count) in sorted(reductions.items(), key = lambda e: e[1], reverse = True)[:top]:
+        print(f"    - {count:>7} {prod}")
+#endregion ------- Reductions -------
+
+#region ------- Parser Frontends -------
+def parseAll(p, srcs):
+    """
+        Parses each source text with the given parser, returning the amount of ASTs built.
+    """
+    count = 0
+    for src in srcs:
+        if (p.parseSource(src) != None): count += 1
+
+    return count
+
+def benchFrontends(target = "", scale = 20, runs = 5):
+    # Only the sources both frontends accept are compared, as the descent parser stops at the first syntax error.
+    lalr = newParser(frontend = "lalr")
+    srcs = []
+    for src in loadSources(target):
+        try:
+            if (lalr.parseSource(src) != None and len(lalr.diagnostics) == 0): srcs.append(src)
+        except Exception:
+            pass
+    srcs *= scale
+
+    size = sum(len(src.encode("utf-8")) for src in srcs)
+    print(f"\x1b[36mFRONTENDS {target or 'cases'} x{scale}\x1b[0m ({len(srcs)} sources, {size} bytes)")
+
+    # Both frontends pull the same tokens from the lexer, so it's time is measured apart, to tell the parsing time.
+    l = newLexer()
+    (lexTime, _) = timeRuns(lambda: sum(lexAll(l, src) for src in srcs), runs)
+    print(f"  - {'lexing:':<9}{lexTime:.4f}s ({runs} runs)")
+
+    times = {}
+    for frontend in FRONTENDS:
+        p = newParser(frontend = frontend)
+        (elapsed, _) = timeRuns(lambda: parseAll(p, srcs), runs)
+        times[frontend] = elapsed
+        print(f"  - {frontend + ':':<9}{elapsed:.4f}s ({runs} runs), {size / elapsed / 1e6:.3f} MB/s")
+
+    speedup = times["lalr"] / times["descent"]
+    parseSpeedup = (times["lalr"] - lexTime) / max(times["descent"] - lexTime, 1e-9)
+    print(f"  - Speedup:  {speedup:.2f}x ({parseSpeedup:.2f}x without lexing)")
+#endregion ------- Parser Frontends -------
+
+#region ------- List Productions -------
+def makeListSource(length):
+    """
+        Generates a program made of lists of the given length: a variable declaration of that many identifiers, a 
+        variable section of that many declarations, and a case statement of that many cases.
+    """
+    names = ",\n".join(", ".join(f"a{i}" for i in range(j, min(j + 10, length))) for j in range(0, length, 10))
+    decls = "\n".join(f"    v{i}: Integer;" for i in range(length))
+    cases = ";\n".join(f"        {i}: v{i} := {i}" for i in range(length))
+
+    return f"program Lists;\nvar\n{names}: Integer;\n{decls}\nbegin\n    case v0 of\n{cases}\n    end\nend.\n"
+
+def benchLists(length = 50000, runs = 3):
+    # Building a list should take linear time, so the time per element should hold as the lists grow.
+    print(f"\x1b[36mLISTS\x1b[0m (up to {length} elements)")
+    lengths = [length >> 3, length >> 2, length >> 1, length]
+    srcs = { n: makeListSource(n) for n in lengths }
+
+    for frontend in FRONTENDS:
+        p = newParser(frontend = frontend)
+        for n in lengths:
+            (elapsed, ast) = timeRuns(lambda: p.parseSource(srcs[n]), runs)
+            status = "" if ast != None and len(p.diagnostics) == 0 else " \x1b[31m(rejected)\x1b[0m"
+            print(f"  - {frontend + ':':<9}{n:>7} elements: {elapsed:.4f}s, {elapsed / n * 1e6:.2f} us/element{status}")
+#endregion ------- List Productions -------
+
+#region ------- Synthetic Corpora -------
+# Each feature of the lexer is weighted on the generated statements, according to a profile.
+SYNTHETIC_PROFILES = {
+    "mixed":       { "assign": 6, "call": 3, "string": 2, "comment": 2, "block": 1, "long": 1 },
+    "identifiers": { "assign": 8, "call": 4, "string": 0, "comment": 0, "block": 0, "long": 0 },
+    "numbers":     { "assign": 8, "call": 0, "string": 0, "comment": 0, "block": 0, "long": 1 },
+    "strings":     { "assign": 1, "call": 2, "string": 8, "comment": 0, "block": 0, "long": 0 },
+    "comments":    { "assign": 1, "call": 0, "string": 0, "comment": 8, "block": 2, "long": 0 },
+    "longlines":   { "assign": 1, "call": 0, "string": 0, "comment": 0, "block": 0, "long": 4 }
+}
+
+def _identifier(rng):
+    return rng.choice(["x", "count", "Total", "maxValue", "i", "j", "buffer", "LineLength", "sum", "aux"]) + (
+        str(rng.randrange(100)) if rng.random() < 0.3 else ""
+    )
+
+def _number(rng):
+    match (rng.randrange(4)):
+        case 0: return str(rng.randrange(10))
+        case 1: return str(rng.randrange(1 << 31))
+        case 2: return f"{rng.randrange(1000)}.{rng.randrange(1000)}"
+        case _: return f"{rng.randrange(10)}.{rng.randrange(100)}e{rng.choice(['', '+', '-'])}{rng.randrange(40)}"
+
+def _expression(rng, terms):
+    ops = ["+", "-", "*", "div", "mod", "and", "or", "<", "<=", "<>", ">=", "="]
+    parts = [_identifier(rng) if rng.random() < 0.5 else _number(rng)]
+    for _ in range(1, terms):
+        parts.extend([rng.choice(ops), _identifier(rng) if rng.random() < 0.5 else _number(rng)])
+
+    return " ".join(parts)
+
+def _string(rng):
+    words = ["Hello", "World", "value", "it''s", "done", "", "#", "*", "{", "(*", "x := 1;"]
+    return "'" + " ".join(rng.choice(words) for _ in range(1 + rng.randrange(8))) + " '"
+
+def _statement(rng, kind, indent):
+    match (kind):
+        case "assign": return f"{indent}{_identifier(rng)} := {_expression(rng, 1 + rng.randrange(5))};"
+        case "call": return f"{indent}{_identifier(rng)}({', '.join(_identifier(rng) for _ in range(rng.randrange(4)))});"
+        case "string": return f"{indent}WriteLn({_string(rng)}, {_identifier(rng)}, {_string(rng)});"
+        case "long": return f"{indent}{_identifier(rng)} := {_expression(rng, 200 + rng.randrange(400))};"
+        case "comment":
+            # Comments don't nest, but may hold the opening delimiters of other comments.
+            if (rng.random() < 0.5): return f"{indent}{{ {_expression(rng, 3)} (* {_string(rng)} }}"
+            lines = [f"{indent}   {_expression(rng, 4)}" for _ in range(1 + rng.randrange(6))]
+            return f"{indent}(* {{ disabled:\n" + "\n".join(lines) + f"\n{indent}*)"
+        case _:
+            return f"{indent}while {_expression(rng, 3)} do\n{indent}begin\n{_statement(rng, 'assign', indent + '    ')}\n{indent}end;"
+
+def makeSyntheticSource(size = 1 << 20, profile = "mixed", seed = 0):
+    """
+        Generates a lexically valid Pascal program of about size bytes, made of statements weighted according to the 
+        given profile (see SYNTHETIC_PROFILES). The same seed always generates the same program.
+    """
+    rng = random.Random(seed)
+    weights = SYNTHETIC_PROFILES[profile]
+    kinds = [k for k in weights if weights[k] != 0]
+
+    lines = ["program Synthetic;", "var", "    x, i, j, count, Total, sum, aux: Integer;", "begin"]
+    length = sum(len(line) + 1 for line in lines)
+    while (length < size):
+        line = _statement(rng, rng.choices(kinds, [weights[k] for k in kinds])[0], "    ")
+        lines.append(line)
+        length += len(line) + 1
+
+    lines.append("end.")
+    return "\n".join(lines) + "\n"
+
+def benchSynthetic(size = 1 << 20, profile = "mixed", seed = 0, runs = 5, outFile = None):
+    src = makeSyntheticSource(size, profile, seed)
+    if (outFile != None):
+        with open(outFile, "w") as f:
+            f.write(src)
+
+    l = newLexer()
+    (elapsed, tokens) = timeRuns(lambda: lexAll(l, src), runs)
+
+    # The tokens are kept alive for the memory measurement, as the parser would.
+    peak = peakMemory(lambda: list(iterTokens(src, newLexer())))
+
+    report(f"SYNTH {profile} (seed {seed})", src, tokens, elapsed, runs, peak)
+#endregion ------- Synthetic Corpora -------
+
+#region ------- AST Memory -------
+def _operand(rng):
+    return _identifier(rng) if rng.random() < 0.6 else str(rng.randrange(1000))
+
+def _arithmetic(rng, terms):
+    # Unlike _expression, relational operators aren't chained, as they don't associate.
+    parts = [_operand(rng)]
+    for _ in range(1, terms):
+        parts.extend([rng.choice(["+", "-", "*", "div", "mod"]), _operand(rng)])
+
+    return " ".join(parts)
+
+def _validStatement(rng, indent, depth = 0):
+    kind = rng.randrange(8 if depth < 2 else 4)
+    match (kind):
+        case 0 | 1: return f"{indent}{_identifier(rng)} := {_arithmetic(rng, 1 + rng.randrange(6))}"
+        case 2:
+            params = ", ".join(_arithmetic(rng, 1 + rng.randrange(3)) for _ in range(1 + rng.randrange(3)))
+            return f"{indent}{_identifier(rng)}({params})"
+        case 3: return f"{indent}WriteLn({_string(rng)}, {_identifier(rng)})"
+        case 4:
+            return (
+                f"{indent}if {_arithmetic(rng, 2)} < {_arithmetic(rng, 2)} then\n{_validStatement(rng, indent + '    ', depth + 1)}\n"
+                f"{indent}else\n{_validStatement(rng, indent + '    ', depth + 1)}"
+            )
+        case 5: return f"{indent}while {_arithmetic(rng, 3)} <> 0 do\n{_validStatement(rng, indent + '    ', depth + 1)}"
+        case 6:
+            return (
+                f"{indent}for {_identifier(rng)} := {_arithmetic(rng, 2)} to {_arithmetic(rng, 2)} do\n"
+                f"{_validStatement(rng, indent + '    ', depth + 1)}"
+            )
+        case _:
+            body = ";\n".join(_validStatement(rng, indent + "    ", depth + 1) for _ in range(1 + rng.randrange(4)))
+            return f"{indent}begin\n{body}\n{indent}end"
+
+def makeASTSource(size = 1 << 20, seed = 0):
+    """
+        Generates a syntatically valid Pascal program of about size bytes, made of assignments, calls and nested 
+        control statements. The same seed always generates the same program.
+    """
+    rng = random.Random(seed)
+
+    lines = ["program Synthetic;", "begin"]
+    length = sum(len(line) + 1 for line in lines)
+    while (length < size):
+        line = _validStatement(rng, "    ") + ";"
+        lines.append(line)
+        length += len(line) + 1
+
+    lines.append("    x := 0")
+    lines.append("end.")
+    return "\n".join(lines) + "\n"
+
+def countNodes(root) -> (int, int):
+    """
+        Counts the nodes and the positions of an AST.
+    """
+    nodes = 0
+    positions = 0
+    pending = [root]
+    while (len(pending) != 0):
+        v = pending.pop()
+        if (isinstance(v, ast.NodePos)): positions += 1
+        elif (isinstance(v, ast.Node)):
+            nodes += 1
+            pending.extend(getattr(v, attr) for attr in ast.nodeAttributes(v))
+        elif (isinstance(v, (list, tuple))): pending.extend(v)
+
+    return (nodes, positions)
+
+def benchASTMemory(size = 1 << 20, seed = 0):
+    src = makeASTSource(size, seed)
+    print(f"\x1b[36mAST MEMORY\x1b[0m ({len(src.encode('utf-8'))} bytes, seed {seed})")
+
+    for frontend in FRONTENDS:
+        p = newParser(frontend = frontend)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            pout = p.parseSource(src)
+            # Only what the AST holds on to is left once the parser state is dropped.
+            p.reset()
+            gc.collect()
+            (current, peak) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if (pout == None):
+            print(f"  - {frontend + ':':<9}\x1b[31mrejected\x1b[0m")
+            continue
+
+        (nodes, positions) = countNodes(pout)
+        retained = current - base
+        print(f"  - {frontend + ':':<9}{nodes} nodes, {positions} positions")
+        print(f"    Retained:    {retained / 1e6:.3f} MB ({retained / nodes:.1f} bytes/node)")
+        print(f"    Peak memory: {(peak - base) / 1e6:.3f} MB")
+        del pout
+#endregion ------- AST Memory -------
+
+def makeCLI():
+    lexCmd = CLICommand(name="lex", description="Measures the lexer throughput over a test suite target")
+    lexCmd.addArgument(
+        "target",
+        type=str,
+        nargs="?",
+        default="proj",
+        help="The name of a test suite target (directory or case) to build the corpus from."
+    )
+    lexCmd.addArgument("--scale", "-s", type=int, default=100, help="How many times the corpus should be repeated.")
+    lexCmd.addArgument("--runs", "-r", type=int, default=5, help="How many times the benchmark should be run.")
+    lexCmd.addArgument(
+        "--mapped",
+        "-m",
+        action="store_true",
+        help="Lex the corpus from a memory-mapped file, through the token stream."
+    )
+
+    commentCmd = CLICommand(name="comment", description="Measures the lexer throughput over large comments")
+    commentCmd.addArgument(
+        "--size",
+        "-s",
+        type=int,
+        default=1 << 20,
+        help="The size of each comment, in bytes."
+    )
+    commentCmd.addArgument("--runs", "-r", type=int, default=5, help="How many times the benchmark should be run.")
+
+    synthCmd = CLICommand(name="synth", description="Measures the lexer throughput over a synthetic program")
+    synthCmd.addArgument(
+        "profile",
+        type=str,
+        nargs="?",
+        default="mixed",
+        choices=list(SYNTHETIC_PROFILES.keys()),
+        help="Which lexer features the generated program should focus on."
+    )
+    synthCmd.addArgument("--size", "-s", type=int, default=1 << 20, help="The size of the program, in bytes.")
+    synthCmd.addArgument("--seed", type=int, default=0, help="The seed the program is generated from.")
+    synthCmd.addArgument("--runs", "-r", type=int, default=5, help="How many times the benchmark should be run.")
+    synthCmd.addArgument("--out", "-o", type=str, default=None, help="A file to write the generated program to.")
+
+    errorsCmd = CLICommand(name="errors", description="Measures the compiler throughput over sources with errors")
+    errorsCmd.addArgument(
+        "target",
+        type=str,
+        nargs="?",
+        default="fail",
+        help="The name of a test suite target (directory or case) to compile."
+    )
+    errorsCmd.addArgument("--scale", "-s", type=int, default=20, help="How many times each source should be compiled.")
+    errorsCmd.addArgument("--runs", "-r", type=int, default=5, help="How many times the benchmark should be run.")
+    errorsCmd.addArgument(
+        "--debug",
+        "-d",
+        action="store_true",
+        help="Capture the location that emitted each diagnostic, as the test driver does in debug mode."
+    )
+
+    reductionsCmd = CLICommand(name="reductions", description="Counts the parser reductions over a test suite target")
+    reductionsCmd.addArgument(
+        "target",
+        type=str,
+        nargs="?",
+        default="proj",
+        help="The name of a test suite target (directory or case) to parse."
+    )
+    reductionsCmd.addArgument("--top", "-t", type=int, default=10, help="How many of the productions to list.")
+    reductionsCmd.addArgument("--runs", "-r", type=int, default=5, help="How many times the benchmark should be run.")
+
+    frontendCmd = CLICommand(name="frontend", description="Compares the parsing throughput of the parser frontends")
+    frontendCmd.addArgument(
+        "target",
+        type=str,
+        nargs="?",
+        default="",
+        help="The name of a test suite target (directory or case) to parse. Defaults to every case."
+    )
+    frontendCmd.addArgument("--scale", "-s", type=int, default=20, help="How many times each source should be parsed.")
+    frontendCmd.addArgument("--runs", "-r", type=int, default=5, help="How many times the benchmark should be run.")
+
+    listsCmd = CLICommand(name="lists", description="Measures the parsing time of programs made of long lists")
+    listsCmd.addArgument("--length", "-l", type=int, default=50000, help="The length of the longest lists.")
+    listsCmd.addArgument("--runs", "-r", type=int, default=3, help="How many times the benchmark should be run.")
+
+    astmemCmd = CLICommand(name="astmem", description="Measures the memory held by the AST of a large synthetic program")
+    astmemCmd.addArgument("--size", "-s", type=int, default=1 << 20, help="The size of the program, in bytes.")
+    astmemCmd.addArgument("--seed", type=int, default=0, help="The seed the program is generated from.")
+
+    cli = CLI(name="Bench", description="Benchmarks for the Standard Pascal compiler.")
+    cli.addCommand(lexCmd)
+    cli.addCommand(commentCmd)
+    cli.addCommand(synthCmd)
+    cli.addCommand(errorsCmd)
+    cli.addCommand(reductionsCmd)
+    cli.addCommand(frontendCmd)
+    cli.addCommand(listsCmd)
+    cli.addCommand(astmemCmd)
+
+    return cli
+
+if __name__ == "__main__":
+    cli = makeCLI()
+    args = cli.parse()
+
+    match (args.switch()):
+        case "lex":
+            benchLex(args.target, args.scale, args.runs, args.mapped)
+        case "comment":
+            benchComment(args.size, args.runs)
+        case "synth":
+            benchSynthetic(args.size, args.profile, args.seed, args.runs, args.out)
+        case "errors":
+            benchErrors(args.target, args.scale, args.runs, args.debug)
+        case "reductions":
+            benchReductions(args.target, args.top, args.runs)
+        case "frontend":
+            benchFrontends(args.target, args.scale, args.runs)
+        case "lists":
+            benchLists(args.length, args.runs)
+        case "astmem":
+            benchASTMemory(args.size, args.seed)
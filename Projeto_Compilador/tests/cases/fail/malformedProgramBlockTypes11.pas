@@ -0,0 +1,13 @@
+{
+    Error: Invalid type in :10:35 (reserved words are case-insensitive, so "Var" is KW_VAR)
+}
+
+program HelloWorld(correct   , externals,    list);
+    type
+        { Simple Types }
+        { - Structural Types }
+        { -- Array Types }
+        at1 = array [1 .. 100] of Var;
+        at2 = array [1 .. 10, 1 .. 20] of Integer;
+begin
+end.
@@ -28,7 +28,7 @@ program HelloWorld(correct   , externals,    list);
         at3 = array [Boolean] of Color;
         at4 = array [Size] of packed array ['a' .. 'z'] of Boolean;
         at5 = packed array [1.. Stringlength] of Char;
-        at6 = packed array [1 .. 2] of Var;
+        at6 = packed array [1 .. 2] of Boolean;
 
         { -- Record Types }
         { --- Fixed Record Types }
@@ -151,7 +151,7 @@ program HelloWorld(correct   , externals,    list);
             1 : Y := sin (X) ;
             2 : Y := cos (X) ;
             3 : Y := exp (X) ;
-            4 : Y := In(X)
+            4 : Y := ln(X)
         end;
         case P1@.Status of
             Married, Coupled: P2 := P1@.SignificantOther;
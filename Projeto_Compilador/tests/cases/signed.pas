@@ -0,0 +1,14 @@
+program Signed;
+
+var
+	x, y: Integer;
+
+begin
+	x := 3;
+
+	{ Expressões com sinal }
+	y := -x + 1;
+	WriteLn('-x + 1 = ', y);
+	y := +x - 1;
+	WriteLn('+x - 1 = ', y)
+end.
@@ -0,0 +1,81 @@
+program Grammar(Input, Output);
+    { Exercises most of the grammar, in order to compare the parser frontends. }
+    label 10, 20;
+    const
+        Max = 100; Min = -5; Ratio = +2.5; Name = 'grammar';
+    type
+        Colour = (Red, Green, Blue);
+        Small = Min .. Max;
+        Matrix = array [1 .. 10, Colour] of Real;
+        Link = ^Cell;
+        Cell = record
+            Value: Integer;
+            Next: Link
+        end;
+        Shape = packed record
+            X, Y: Real;
+            case Kind: Colour of
+                Red: (Radius: Real);
+                Green, Blue: (Width, Height: Real; Filled: Boolean)
+        end;
+        Tagless = record
+            Id: Integer;
+            case Boolean of
+                True: ();
+                False: (Code: Char)
+        end;
+        Palette = set of Colour;
+    var
+        I, J: Integer;
+        M: Matrix;
+        L: Link;
+        S: Shape;
+        P: Palette;
+        Done: Boolean;
+
+    function Sum(A, B: Integer; var Total: Integer): Integer;
+    begin
+        Total := Total + A * B - (A div B) mod 2;
+        Sum := Total
+    end;
+
+    procedure Visit(C: Link; procedure Action(N: Integer); function Test(N: Integer): Boolean);
+        var
+            Cur: Link;
+    begin
+        Cur := C;
+        while Cur <> nil do
+        begin
+            if Test(Cur^.Value) then Action(Cur^.Value);
+            Cur := Cur^.Next
+        end
+    end;
+
+    procedure Later(X: Integer); forward;
+
+begin
+    I := 0; J := -1;
+    10: I := I + 1;
+    if (I < 5) and not Done then goto 10;
+    if I = 1 then if J < -1 then I := 2 else I := 3 else J := 4;
+    M[1, Red] := Ratio * I * 2.0e-1;
+    S.X := M[I, Green] - Sum(I, J, I);
+    L^.Next^.Value := Max;
+    P := [Red, Green .. Blue];
+    P := [];
+    Done := (Red in P) or (I >= J) or (I <= -J) or (I > 0);
+    case I of
+        1, 2: J := 1;
+        -3: begin J := 2; end;
+        4: I := 4;
+        5: Later(I);
+    end;
+    case J of 0: I := 0 end;
+    repeat
+        I := I - 1;
+    until I <> 0;
+    for I := Max downto Min do J := J + I;
+    for J := 1 to 10 do Later(J);
+    with S, L^ do X := Y;
+    20: WriteLn(Name, 'It''s done')
+end.
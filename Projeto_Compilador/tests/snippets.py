@@ -0,0 +1,31 @@
+import os
+
+#
+# Test Suite Snippets
+#
+#   The test suite cases are Pascal source files under tests/cases, grouped in directories (e.g. fail, warn, proj). The
+# commands of the test driver and the benchmarks take a target on them: either a directory, for every case under it, or
+# a single case, with or without it's extension.
+#   The sources under tests/frontend are only meant to be parsed: they exercise the grammar for the parser frontend 
+# differential (see tests/test.py frontdiff), without being programs the rest of the compiler can handle.
+#
+
+CASES_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "cases")
+FRONTEND_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "frontend")
+
+def findSnippets(target: str = "", root: str = CASES_ROOT) -> list[str]:
+    """
+        Finds the paths of the source files under the given test suite target, relative to root (or as given, if
+        absolute), sorted.
+    """
+    path = os.path.join(root, target)
+    if (os.path.isdir(path)):
+        return sorted(os.path.join(r, f) for (r, _, fs) in os.walk(path) for f in fs if f.endswith(".pas"))
+
+    return [path if path.endswith(".pas") else path + ".pas"]
+
+def snippetName(snippet: str, root: str = CASES_ROOT) -> str:
+    """
+        Gets the name a snippet is reported by: it's path relative to root, or it's whole path if not under root.
+    """
+    return os.path.relpath(snippet, root) if snippet.startswith(root) else snippet
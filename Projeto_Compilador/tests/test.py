@@ -1,41 +1,70 @@
 import os
 import sys
+import time
+import random
 import argparse
 import traceback
-from compiler.lexer import lexer
-from compiler.synanaler import parser
+from compiler.lexer import lexer, newLexer, iterTokens, lexParallel, findSplitPoints, TokenStream
+from compiler.synanaler import parser, newParser, FRONTENDS
+from compiler.parsecache import ParseCache
+from compiler.astbin import serializeAST, deserializeAST
 import compiler.semanaler as semanal
+from compiler.diag import DiagnosticKind, LogLevel
 import compiler.codegen as codegen
 from util.cli import CLI, CLICommand
+from tests.snippets import CASES_ROOT, FRONTEND_ROOT, findSnippets, snippetName
 
 g_debugMode = False
 
+def traceToken(tok):
+    print(f"\x1b[36mTOKEN:\x1b[0m {tok}")
+
+def tracedTokenFunc(l):
+    """
+        Wraps l.getExtendedToken in order to trace every token, separators included, as the parser requests them.
+    """
+    lastSep = None
+    def tokenfunc():
+        nonlocal lastSep
+        tok = l.getExtendedToken()
+        if (l._lastSep is not lastSep):
+            lastSep = l._lastSep
+            traceToken(lastSep)
+
+        if (tok != None): traceToken(tok)
+        return tok
+
+    return tokenfunc
+
+def printLexDiags(stat = True):
+    if (stat): print("LEXSTAT:", len(lexer.lineLens), lexer.lineLens, lexer._lastLineLexPos)
+    print("LEXDIAG:")
+    if (len(lexer.diagnostics) != 0):
+        for diag in lexer.diagnostics:
+            print("  -", diag.toString(lexer))
+    else:
+        print("  - N/A")
+
 def traceTokensSnippet(snippet, tracelex = True, tracesyn = False, tracediag = False):
     if (not snippet.endswith(".pas")): snippet += ".pas"
     with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "cases", snippet)) as sf:
         inp = sf.read()
 
-        if (tracelex):
-            lexer.options["printDiags"] = True
+        # The source text is lexed once, either by itself or while being parsed.
+        lexer.options["printDiags"] = tracelex
+        if (not tracesyn):
+            lexer.reset()
             lexer.input(inp)
             while tok := lexer.token():
-                print(f"\x1b[36mTOKEN:\x1b[0m {tok}")
+                traceToken(tok)
             
             lexer.finish()
-            print("LEXSTAT:", len(lexer.lineLens), lexer.lineLens, lexer._lastLineLexPos)
-            print("LEXDIAG:")
-            if (len(lexer.diagnostics) != 0):
-                for diag in lexer.diagnostics:
-                    print("  -", diag.toString(lexer))
-            else:
-                print("  - N/A")
+        else:
+            pout = parser.parseSource(inp, g_debugMode, tracedTokenFunc(lexer) if tracelex else None)
+
+        if (tracelex): printLexDiags()
         
         if (tracesyn):
-            lexer.options["printDiags"] = False
-            # lexer.diagnostics = []
-            lexer.reset()
-            
-            pout = parser.parse(inp, lexer, g_debugMode, False, lexer.getExtendedToken)
             print(f"\x1b[32mPARSED:\x1b[0m {pout}")
             print("SYNANALDIAG:")
             if (len(parser.diagnostics) != 0):
@@ -57,25 +86,10 @@ def dumpAST(snippet, outFile, tracelex = True, tracesyn = False, tracediag = Fal
     with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "cases", snippet)) as sf:
         inp = sf.read()
 
-        if (tracelex):
-            lexer.options["printDiags"] = True
-            lexer.input(inp)
-            while tok := lexer.token():
-                print(f"\x1b[36mTOKEN:\x1b[0m {tok}")
-            
-            lexer.finish()
-            print("LEXSTAT:", len(lexer.lineLens), lexer.lineLens, lexer._lastLineLexPos)
-            print("LEXDIAG:")
-            if (len(lexer.diagnostics) != 0):
-                for diag in lexer.diagnostics:
-                    print("  -", diag.toString(lexer))
-            else:
-                print("  - N/A")
-        
-        lexer.options["printDiags"] = False
-        lexer.reset()
-        
-        pout = parser.parse(inp, lexer, g_debugMode, False, lexer.getExtendedToken)
+        lexer.options["printDiags"] = tracelex
+        pout = parser.parseSource(inp, g_debugMode, tracedTokenFunc(lexer) if tracelex else None)
+        if (tracelex): printLexDiags()
+
         if (tracesyn):
             print(f"\x1b[32mPARSED:\x1b[0m {pout}")
             print("SYNANALDIAG:")
@@ -96,11 +110,10 @@ def dumpAST(snippet, outFile, tracelex = True, tracesyn = False, tracediag = Fal
                     print("  - N/A")
 
         if (pout != None):
-            jsonstr = pout.toJSONString()
             outFilePath = os.path.join(os.getcwd(), outFile)
             try:
                 with open(outFilePath, "w") as of:
-                    of.write(jsonstr)
+                    pout.writeJSON(of)
                 print(f"\x1b[32mSuccessfully dumped AST to:\x1b[0m", outFilePath)
             except BaseException as e:
                 print(f"\x1b[31mCould not dump AST: Unable to open output file:\x1b[0m", outFilePath)
@@ -114,30 +127,18 @@ def fullTest(snippet, traceall = False, tracediag = False, verbose = False, dump
     with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "cases", snippet)) as sf:
         inp = sf.read()
 
-        # Lexical Analysis
-        if (traceall):
-            lexer.options["printDiags"] = True
-            lexer.input(inp)
-            while tok := lexer.token():
-                print(f"\x1b[36mTOKEN:\x1b[0m {tok}")
-            
-            lexer.finish()
-            print("LEXDIAG:")
-            if (len(lexer.diagnostics) != 0):
-                for diag in lexer.diagnostics:
-                    print("  -", diag.toString(lexer))
-            else:
-                print("  - N/A")
+        # Lexical and Syntatic Analysis
+        #   Both run on a single pass over the source text, but the lexical errors take precedence. Lexical warnings
+        #   (e.g. mismatched comment delimiters) don't invalidate the program.
+        lexer.options["printDiags"] = traceall
+        if (traceall): parser.sink.level = LogLevel.TRACE
+        pout = parser.parseSource(inp, g_debugMode, tracedTokenFunc(lexer) if traceall else None)
+        if (traceall): printLexDiags(False)
 
-        if (len(lexer.diagnostics) != 0):
+        if (any(diag.kind in (DiagnosticKind.ERROR, DiagnosticKind.CRITICAL) for diag in lexer.diagnostics)):
             print(f"\x1b[31mInvalid program: Lexical analysis errored out.\x1b[0m")
             return
         
-        lexer.options["printDiags"] = False
-        lexer.reset()
-        
-        # Syntatic Analysis
-        pout = parser.parse(inp, lexer, g_debugMode, False, lexer.getExtendedToken)
         if (tracediag):
             print(f"\x1b[32mPARSED:\x1b[0m {pout}")
             print("SYNANALDIAG:")
@@ -163,11 +164,10 @@ def fullTest(snippet, traceall = False, tracediag = False, verbose = False, dump
 
         # Optional AST dump
         if (dumpAST):
-            jsonstr = pout.toJSONString()
             outFilePath = os.path.join(os.getcwd(), outFile)
             try:
                 with open(outFilePath, "w") as of:
-                    of.write(jsonstr)
+                    pout.writeJSON(of)
                 print(f"\x1b[32mSuccessfully dumped AST to:\x1b[0m", outFilePath)
             except BaseException as e:
                 print(f"\x1b[31mCould not dump AST: Unable to open output file:\x1b[0m", outFilePath)
@@ -204,6 +204,243 @@ def fullTest(snippet, traceall = False, tracediag = False, verbose = False, dump
         codegen.emitCode(pout, outFilePath)
         print(f"\x1b[32mSuccessfully wrote output to:\x1b[0m", outFilePath)
 
+def lexState(l, tokens):
+    """
+        Gets everything a lexing run produces, for comparison: the tokens with their positions, the line metadata and the
+        lexical diagnostics.
+    """
+    return {
+        "tokens": [(t.type, t.value, t.lineno, t.lexpos, t.pos.start, t.pos.end) for t in tokens],
+        "lineLens": l.lineLens,
+        "diagnostics": [(d.type, d.kind, d.startPos, d.endPos, d.args) for d in l.diagnostics],
+        "lineno": l.lineno
+    }
+
+def lexDifferential(target = "", chunkSizes = (16, 64, 256), workers = None):
+    """
+        Checks that lexing each case under the given test suite target in parallel yields exactly the same as lexing it 
+        sequentially, for each of the given chunk sizes (small enough to split every case in several chunks).
+    """
+    snippets = findSnippets(target)
+
+    failed = 0
+    for snippet in snippets:
+        with open(snippet) as sf:
+            inp = sf.read()
+
+        sl = newLexer()
+        expected = lexState(sl, list(iterTokens(inp, sl)))
+
+        name = snippetName(snippet)
+        for chunkSize in chunkSizes:
+            pl = newLexer()
+            actual = lexState(pl, lexParallel(inp, pl, workers, chunkSize))
+            mismatches = [k for k in expected if expected[k] != actual[k]]
+            if (len(mismatches) != 0):
+                failed += 1
+                print(f"\x1b[31mMISMATCH:\x1b[0m {name} (chunk size {chunkSize}): {', '.join(mismatches)}")
+            else:
+                chunks = len(findSplitPoints(inp, chunkSize)) + 1
+                print(f"\x1b[32mOK:\x1b[0m {name} (chunk size {chunkSize}, {chunks} chunks)")
+
+    if (failed != 0):
+        print(f"\x1b[31m{failed} parallel lexing runs differ from sequential lexing.\x1b[0m")
+        sys.exit(1)
+
+    print(f"\x1b[32mParallel lexing matches sequential lexing on every case.\x1b[0m")
+
+# Fragments inserted by the incremental lexing differential, along with slices of the case itself. They open and close
+#   comments and strings, split lines and join tokens, which is where re-lexing is most likely to go wrong.
+RELEX_FRAGMENTS = (
+    "'", "''", "'a'", "{", "}", "{ x }", "(*", "*)", "(* x *)", "\n", "\n\n", " ", "\t", 
+    "x", "begin", "end", ";", ":=", "..", ".", "1", "1.5", "1e3", "#", "$"
+)
+
+def randomEdit(rng, source):
+    """
+        Gets a random edit of the source text, as the arguments to TokenStream#edit.
+    """
+    offset = rng.randint(0, len(source))
+    removedLen = min(rng.choice((0, 0, 1, 2, 5, 20)), len(source) - offset)
+    if (rng.random() < 0.25 and len(source) != 0):
+        start = rng.randrange(len(source))
+        insertedText = source[start:start + rng.randint(1, 40)]
+    else:
+        insertedText = "".join(rng.choice(RELEX_FRAGMENTS) for _ in range(rng.choice((0, 1, 1, 2, 3))))
+
+    return (offset, removedLen, insertedText)
+
+def relexDifferential(target = "", edits = 200, seed = 0):
+    """
+        Checks that updating the tokens of each case under the given test suite target through random edits (see 
+        TokenStream#edit) yields exactly the same as lexing the edited source text from scratch, after every edit.
+    """
+    snippets = findSnippets(target)
+
+    failed = 0
+    for snippet in snippets:
+        with open(snippet) as sf:
+            inp = sf.read()
+
+        name = snippetName(snippet)
+        rng = random.Random(f"{seed}:{name}")
+        stream = TokenStream(inp)
+        (relexed, total) = (0, 0)
+        for i in range(edits):
+            edit = randomEdit(rng, stream.source)
+            relexed += stream.edit(*edit)
+
+            fl = newLexer()
+            expected = lexState(fl, list(iterTokens(stream.source, fl)))
+            actual = lexState(stream.lexer, stream.tokens)
+            total += len(expected["tokens"])
+            mismatches = [k for k in expected if expected[k] != actual[k]]
+            if (len(mismatches) != 0):
+                failed += 1
+                print(f"\x1b[31mMISMATCH:\x1b[0m {name} (edit {i + 1}, {edit!r}): {', '.join(mismatches)}")
+                break
+        else:
+            print(f"\x1b[32mOK:\x1b[0m {name} ({edits} edits, {relexed} of {total} tokens re-lexed)")
+
+    if (failed != 0):
+        print(f"\x1b[31m{failed} cases differ from lexing from scratch once edited.\x1b[0m")
+        sys.exit(1)
+
+    print(f"\x1b[32mIncremental lexing matches lexing from scratch on every case.\x1b[0m")
+
+def validateSnippets(target = "", verbose = False):
+    """
+        Validates the syntax of each source file under the given test suite target (or under the given path, if 
+        absolute), without building their AST, reporting which ones are valid programs.
+    """
+    snippets = findSnippets(target)
+
+    # The errors are listed after each program instead, on verbose mode.
+    level = parser.sink.level
+    if (not g_debugMode): parser.sink.level = LogLevel.SILENT
+
+    valid = 0
+    start = time.perf_counter()
+    for snippet in snippets:
+        with open(snippet) as sf:
+            inp = sf.read()
+
+        name = snippetName(snippet)
+        if (parser.validateSource(inp, g_debugMode)):
+            valid += 1
+            print(f"\x1b[32mVALID:\x1b[0m {name}")
+        else:
+            diags = [diag for diag in lexer.diagnostics if diag.kind in (DiagnosticKind.ERROR, DiagnosticKind.CRITICAL)]
+            diags += parser.diagnostics
+            truncated = " \x1b[33m(lexing cut short)\x1b[0m" if lexer.truncated else ""
+            print(f"\x1b[31mINVALID:\x1b[0m {name} ({len(diags)} errors){truncated}")
+            if (verbose):
+                for diag in diags:
+                    print("  -", diag.toString(lexer))
+    elapsed = time.perf_counter() - start
+
+    parser.sink.level = level
+    print(f"\x1b[36m{valid} of {len(snippets)} programs are valid.\x1b[0m ({elapsed:.4f}s)")
+
+def parseState(p, src):
+    """
+        Gets what parsing a source text with the given parser produces, for comparison: whether it was "accepted", 
+        "rejected" or the parser "crashed", along with the AST JSON, if accepted, or the exception raised, if crashed.
+    """
+    try:
+        pout = p.parseSource(src)
+    except Exception as e:
+        return ("crashed", f"{type(e).__name__}: {e}")
+
+    if (pout == None or len(p.diagnostics) != 0): return ("rejected", None)
+    return ("accepted", pout.toJSONString())
+
+def frontendDifferential(target = ""):
+    """
+        Checks that the recursive descent parser builds exactly the same AST as the grammar rules for each case under the
+        given test suite target, and that it rejects every case the grammar rules reject. A frontend crashing on a case
+        is a mismatch, even if both do. The whole test suite also includes the sources under tests/frontend.
+    """
+    snippets = [(CASES_ROOT, snippet) for snippet in findSnippets(target)]
+    if (target == ""):
+        # Named after their directory, so they are told apart from the cases.
+        snippets += [(os.path.dirname(FRONTEND_ROOT), snippet) for snippet in findSnippets("", FRONTEND_ROOT)]
+
+    lalr = newParser(frontend = "lalr")
+    descent = newParser(frontend = "descent")
+
+    failed = 0
+    for (root, snippet) in snippets:
+        with open(snippet) as sf:
+            inp = sf.read()
+
+        name = snippetName(snippet, root)
+        expected = parseState(lalr, inp)
+        actual = parseState(descent, inp)
+        if (expected[0] != actual[0]):
+            failed += 1
+            print(f"\x1b[31mMISMATCH:\x1b[0m {name} ({expected[0]} by lalr, {actual[0]} by descent)")
+        elif (expected[0] == "crashed"):
+            failed += 1
+            print(f"\x1b[31mMISMATCH:\x1b[0m {name} (crashed both)")
+        elif (expected != actual):
+            failed += 1
+            print(f"\x1b[31mMISMATCH:\x1b[0m {name} (the ASTs differ)")
+        else:
+            print(f"\x1b[32mOK:\x1b[0m {name} ({'same AST' if expected[0] == 'accepted' else 'rejected by both'})")
+
+        for (frontend, state) in (("lalr", expected), ("descent", actual)):
+            if (state[0] == "crashed"): print(f"  - {frontend}: {state[1]}")
+
+    if (failed != 0):
+        print(f"\x1b[31m{failed} cases are parsed differently by the parser frontends.\x1b[0m")
+        sys.exit(1)
+
+    print(f"\x1b[32mThe parser frontends agree on every case.\x1b[0m")
+
+def binaryRoundtrip(target = ""):
+    """
+        Checks that the AST of each case under the given test suite target is the same once serialized to it's binary 
+        form and deserialized back (see compiler/astbin.py), comparing their JSON forms.
+    """
+    snippets = findSnippets(target)
+
+    level = parser.sink.level
+    parser.sink.level = LogLevel.SILENT
+
+    failed = 0
+    (jsonSize, binSize) = (0, 0)
+    for snippet in snippets:
+        with open(snippet) as sf:
+            inp = sf.read()
+
+        name = snippetName(snippet)
+        try:
+            pout = parser.parseSource(inp)
+        except Exception:
+            pout = None
+        if (pout == None):
+            print(f"\x1b[33mSKIPPED:\x1b[0m {name} (no AST)")
+            continue
+
+        expected = pout.toJSONString()
+        data = serializeAST(pout)
+        actual = deserializeAST(data).toJSONString()
+        jsonSize += len(expected.encode("utf-8"))
+        binSize += len(data)
+        if (expected != actual):
+            failed += 1
+            print(f"\x1b[31mMISMATCH:\x1b[0m {name}")
+        else:
+            print(f"\x1b[32mOK:\x1b[0m {name} ({len(data)} bytes, {len(expected.encode('utf-8'))} as JSON)")
+
+    parser.sink.level = level
+    if (failed != 0):
+        print(f"\x1b[31m{failed} ASTs differ once deserialized.\x1b[0m")
+        sys.exit(1)
+
+    print(f"\x1b[32mEvery AST is the same once deserialized.\x1b[0m ({binSize} bytes, {jsonSize} as JSON)")
+
 def makeCLI():
     caseCmd = CLICommand(name="case", description="Runs a specific test suite case")
     caseCmd.addArgument("target", type=str, help="The name of a test suite target to run.")
@@ -239,6 +476,19 @@ def makeCLI():
             "internal state."
     )
 
+    caseCmd.addArgument(
+        "--frontend", "-f", 
+        choices=FRONTENDS, 
+        default="lalr", 
+        help="The parser frontend to parse with."
+    )
+    caseCmd.addArgument(
+        "--cache", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether the parse results should be cached on disk (see compiler/parsecache.py), in order to skip lexing " \
+            "and parsing the cases parsed before."
+    )
+
     traceLexCmd = CLICommand(name="tracelex", description="Traces the lexer output for specific test suite target")
     traceLexCmd.addArgument("target", type=str, help="The name of a test suite target to run.")
     traceLexCmd.addArgument(
@@ -268,6 +518,13 @@ def makeCLI():
         help="Whether additional information should be presented while running the test suite."
     )
 
+    traceSynCmd.addArgument(
+        "--frontend", "-f", 
+        choices=FRONTENDS, 
+        default="lalr", 
+        help="The parser frontend to parse with."
+    )
+
     dumpASTCmd = CLICommand(
         name="dumpast", 
         description="Dumps the resulting AST for a specific test suite target"
@@ -305,11 +562,150 @@ def makeCLI():
             "internal state."
     )
 
+    dumpASTCmd.addArgument(
+        "--frontend", "-f", 
+        choices=FRONTENDS, 
+        default="lalr", 
+        help="The parser frontend to parse with."
+    )
+
+    lexDiffCmd = CLICommand(
+        name="lexdiff", 
+        description="Checks that parallel lexing matches sequential lexing for the test suite cases"
+    )
+    lexDiffCmd.addArgument(
+        "target", 
+        type=str, 
+        nargs="?", 
+        default="", 
+        help="The name of a test suite target (directory or case) to check. Defaults to every case."
+    )
+    lexDiffCmd.addArgument(
+        "--chunks", "-c", 
+        type=int, 
+        nargs="+", 
+        default=[16, 64, 256], 
+        help="The chunk sizes to split each case with."
+    )
+    lexDiffCmd.addArgument("--workers", "-w", type=int, default=None, help="How many processes to lex with.")
+    lexDiffCmd.addArgument(
+        "--debug", "-d", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether additional information should be presented while running the test suite."
+    )
+
+    relexDiffCmd = CLICommand(
+        name="relexdiff", 
+        description="Checks that incremental lexing matches lexing from scratch for random edits of the test suite cases"
+    )
+    relexDiffCmd.addArgument(
+        "target", 
+        type=str, 
+        nargs="?", 
+        default="", 
+        help="The name of a test suite target (directory or case) to check. Defaults to every case."
+    )
+    relexDiffCmd.addArgument("--edits", "-e", type=int, default=200, help="How many random edits to apply to each case.")
+    relexDiffCmd.addArgument("--seed", "-s", type=int, default=0, help="The seed of the random edits.")
+    relexDiffCmd.addArgument(
+        "--debug", "-d", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether additional information should be presented while running the test suite."
+    )
+
+    validateCmd = CLICommand(
+        name="validate", 
+        description="Validates the syntax of the test suite cases, without building their AST"
+    )
+    validateCmd.addArgument(
+        "target", 
+        type=str, 
+        nargs="?", 
+        default="", 
+        help="The name of a test suite target (directory or case), or an absolute path, to validate. Defaults to every " \
+            "case."
+    )
+    validateCmd.addArgument(
+        "--frontend", "-f", 
+        choices=FRONTENDS, 
+        default="lalr", 
+        help="The parser frontend to parse with."
+    )
+    validateCmd.addArgument(
+        "--debug", "-d", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether additional information should be presented while running the test suite."
+    )
+    validateCmd.addArgument(
+        "--verbose", "-v", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether the errors of each invalid program should be listed."
+    )
+    validateCmd.addArgument(
+        "--max-errors", 
+        type=int, 
+        default=100, 
+        help="The maximum number of syntax errors of each program, before it's parse is aborted. 0 or less for no limit."
+    )
+    validateCmd.addArgument(
+        "--max-skipped", 
+        type=int, 
+        default=1000, 
+        help="The maximum number of tokens the error recovery may skip on each program, before it's parse is aborted. " \
+            "0 or less for no limit."
+    )
+    validateCmd.addArgument(
+        "--time-limit", 
+        type=float, 
+        default=0, 
+        help="The maximum time, in seconds, each program may take to parse, before it's parse is aborted. 0 or less for " \
+            "no limit."
+    )
+
+    frontDiffCmd = CLICommand(
+        name="frontdiff", 
+        description="Checks that the parser frontends build the same AST for the test suite cases"
+    )
+    frontDiffCmd.addArgument(
+        "target", 
+        type=str, 
+        nargs="?", 
+        default="", 
+        help="The name of a test suite target (directory or case) to check. Defaults to every case."
+    )
+    frontDiffCmd.addArgument(
+        "--debug", "-d", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether additional information should be presented while running the test suite."
+    )
+
+    astBinCmd = CLICommand(
+        name="astbin", 
+        description="Checks that the ASTs of the test suite cases survive being serialized to their binary form"
+    )
+    astBinCmd.addArgument(
+        "target", 
+        type=str, 
+        nargs="?", 
+        default="", 
+        help="The name of a test suite target (directory or case) to check. Defaults to every case."
+    )
+    astBinCmd.addArgument(
+        "--debug", "-d", 
+        action=argparse.BooleanOptionalAction, 
+        help="Whether additional information should be presented while running the test suite."
+    )
+
     cli = CLI(name="Test", description="A test suite for the Standard Pascal compiler.")
     cli.addCommand(caseCmd)
     cli.addCommand(traceLexCmd)
     cli.addCommand(traceSynCmd)
     cli.addCommand(dumpASTCmd)
+    cli.addCommand(lexDiffCmd)
+    cli.addCommand(relexDiffCmd)
+    cli.addCommand(validateCmd)
+    cli.addCommand(frontDiffCmd)
+    cli.addCommand(astBinCmd)
 
     return cli
 
@@ -320,6 +716,16 @@ if __name__ == "__main__":
     args = cli.parse()
 
     g_debugMode = args.debug
+    if (getattr(args, "frontend", "lalr") != "lalr"): parser = newParser(lexer, frontend = args.frontend)
+    parser.options["debug"] = g_debugMode
+    if (getattr(args, "cache", False)): parser.cache = ParseCache()
+    if (hasattr(args, "max_errors")):
+        # The error recovery budget, where non-positive limits are unlimited.
+        parser.options["maxErrors"] = args.max_errors if args.max_errors > 0 else None
+        parser.options["maxSkippedTokens"] = args.max_skipped if args.max_skipped > 0 else None
+        parser.options["timeLimit"] = args.time_limit if args.time_limit > 0 else None
+    # The syntax errors are always shown, and the parser internals (e.g. the error recovery) only in debug mode.
+    parser.sink.level = LogLevel.TRACE if g_debugMode else LogLevel.ERROR
     
     match (args.switch()):
         case "case":
@@ -330,3 +736,13 @@ if __name__ == "__main__":
             traceTokensSnippet(args.target, args.tracelex, True, args.tracediag)
         case "dumpast":
             dumpAST(args.target, args.out, args.tracelex, True, args.tracediag, args.verbose)
+        case "lexdiff":
+            lexDifferential(args.target, args.chunks, args.workers)
+        case "relexdiff":
+            relexDifferential(args.target, args.edits, args.seed)
+        case "validate":
+            validateSnippets(args.target, args.verbose)
+        case "frontdiff":
+            frontendDifferential(args.target)
+        case "astbin":
+            binaryRoundtrip(args.target)